@@ -0,0 +1,199 @@
+"""
+Measure the evaluation harness's own overhead, fully offline.
+
+Runs run_evaluation against fake_messages_api.py (a scripted Messages API,
+started as a subprocess) and fake_mcp_server.py (a stdio MCP server), so
+neither the model nor the tools cost anything and what remains is the
+harness: thread hops, HTTP/JSON handling, tool result serialisation,
+response parsing and report building. Both fakes run in their own
+processes, so the CPU time measured here is the harness's alone.
+
+For each --concurrency level it records wall time, harness CPU time per
+task and throughput. The highest throughput seen is the maximum sustainable
+rate; with zero model latency it is bounded by CPU per task. Report
+building and extract_xml_content are also timed separately.
+
+Usage:
+    python benchmark_evaluation.py --tasks 200 --tool-calls 2 --concurrency 1 8 32
+    python benchmark_evaluation.py --tasks 200 --model-latency 0.2 --concurrency 8 32 128 -o results.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import cProfile
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from connections import create_connection
+from evaluation import build_report, extract_xml_content, load_results, run_evaluation
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+ANSWER = "42"
+
+
+def start_fake_api(args):
+    process = subprocess.Popen(
+        [
+            sys.executable, str(SCRIPTS_DIR / "fake_messages_api.py"),
+            "--port", "0",
+            "--tool-calls", str(args.tool_calls),
+            "--latency", str(args.model_latency),
+            "--answer", ANSWER,
+        ],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    url = process.stdout.readline().rsplit(" ", 1)[-1].strip()
+    return process, url
+
+
+def write_tasks(path, count):
+    with open(path, "w") as f:
+        for i in range(count):
+            f.write(json.dumps({"question": f"Look up record {i}. What is its value?", "answer": ANSWER}) + "\n")
+
+
+async def run_level(args, eval_path, results_path, concurrency, profiler=None):
+    connection = create_connection(
+        transport="stdio",
+        command=sys.executable,
+        args=[
+            str(SCRIPTS_DIR / "fake_mcp_server.py"),
+            "--response-bytes", str(args.response_bytes),
+            "--latency", str(args.tool_latency),
+        ],
+    )
+    async with connection:
+        if profiler:
+            profiler.enable()
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            await run_evaluation(eval_path, connection, "fake-model", concurrency, results_path=results_path)
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        if profiler:
+            profiler.disable()
+
+    results = load_results(results_path)["results"]
+    correct = sum(r["score"] for r in results)
+    return {
+        "concurrency": concurrency,
+        "tasks": len(results),
+        "correct": correct,
+        "wall_seconds": wall,
+        "cpu_seconds": cpu,
+        "cpu_ms_per_task": cpu / len(results) * 1000 if results else 0,
+        "tasks_per_second": len(results) / wall if wall else 0,
+        "model_calls_per_task": args.tool_calls + 1,
+    }
+
+
+def time_report_building(results_path, repeat=5):
+    results = load_results(results_path)["results"]
+    start = time.perf_counter()
+    for _ in range(repeat):
+        build_report(results)
+    build_seconds = (time.perf_counter() - start) / repeat
+
+    text = "<summary>" + "step. " * 200 + "</summary><feedback>" + "note. " * 200 + f"</feedback><response>{ANSWER}</response>"
+    start = time.perf_counter()
+    for _ in range(1000):
+        for tag in ("response", "summary", "feedback"):
+            extract_xml_content(text, tag)
+    extract_seconds = (time.perf_counter() - start) / 1000
+
+    return {
+        "build_report_ms": build_seconds * 1000,
+        "build_report_ms_per_task": build_seconds * 1000 / len(results) if results else 0,
+        "extract_xml_content_us_per_task": extract_seconds * 1e6,
+    }
+
+
+async def run_benchmark(args, work_dir):
+    eval_path = Path(work_dir) / "tasks.jsonl"
+    results_path = Path(work_dir) / "results.json"
+    write_tasks(eval_path, args.tasks)
+
+    levels = []
+    for concurrency in args.concurrency:
+        profiler = cProfile.Profile() if args.profile and concurrency == max(args.concurrency) else None
+        level = await run_level(args, eval_path, results_path, concurrency, profiler)
+        levels.append(level)
+        print(
+            f"  concurrency {concurrency:<4} {level['wall_seconds']:7.2f}s wall  "
+            f"{level['cpu_ms_per_task']:6.2f} ms CPU/task  {level['tasks_per_second']:8.1f} tasks/s  "
+            f"({level['correct']}/{level['tasks']} correct)"
+        )
+        if level["correct"] != level["tasks"]:
+            print("  ⚠️  Some tasks did not get the scripted answer; results may include errors")
+        if profiler:
+            profiler.dump_stats(args.profile)
+            print(f"  Saved cProfile stats for concurrency {concurrency} to {args.profile}")
+
+    return levels, time_report_building(results_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark evaluation harness overhead offline")
+    parser.add_argument("--tasks", type=int, default=100, help="Tasks per run (default: 100)")
+    parser.add_argument("--tool-calls", type=int, default=2, help="Tool calls per task (default: 2)")
+    parser.add_argument("--response-bytes", type=int, default=2000, help="Size of each tool response (default: 2000)")
+    parser.add_argument("--model-latency", type=float, default=0.0, help="Fake model latency per call in seconds (default: 0)")
+    parser.add_argument("--tool-latency", type=float, default=0.0, help="Fake tool latency per call in seconds (default: 0)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16], help="Concurrency levels to run (default: 1 4 16)")
+    parser.add_argument("--profile", help="Save cProfile stats for the highest concurrency level to this file")
+    parser.add_argument("-o", "--output", default="evaluation_benchmark.json", help="Results file (default: evaluation_benchmark.json)")
+    args = parser.parse_args()
+
+    api, url = start_fake_api(args)
+    os.environ["ANTHROPIC_BASE_URL"] = url
+    os.environ.setdefault("ANTHROPIC_API_KEY", "fake")
+    print(f"Fake Messages API at {url}; {args.tasks} tasks x {args.tool_calls + 1} model calls")
+
+    try:
+        with tempfile.TemporaryDirectory() as work_dir:
+            levels, report_timing = asyncio.run(run_benchmark(args, work_dir))
+    finally:
+        api.terminate()
+        api.wait()
+
+    best = max(levels, key=lambda level: level["tasks_per_second"])
+    cpu_per_task = min(level["cpu_ms_per_task"] for level in levels)
+    summary = {
+        "max_tasks_per_second": best["tasks_per_second"],
+        "at_concurrency": best["concurrency"],
+        "min_cpu_ms_per_task": cpu_per_task,
+        "cpu_bound_tasks_per_second": 1000 / cpu_per_task if cpu_per_task else None,
+        **report_timing,
+    }
+    print(f"\nMax sustainable throughput: {best['tasks_per_second']:.1f} tasks/s at concurrency {best['concurrency']}")
+    print(f"Harness CPU per task: {cpu_per_task:.2f} ms (single-core ceiling {summary['cpu_bound_tasks_per_second'] or 0:.0f} tasks/s)")
+    print(f"build_report: {report_timing['build_report_ms_per_task']:.3f} ms/task; "
+          f"extract_xml_content: {report_timing['extract_xml_content_us_per_task']:.1f} µs/task")
+
+    output = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "config": {k: v for k, v in vars(args).items() if k not in ("output", "profile")},
+        },
+        "summary": summary,
+        "levels": levels,
+    }
+    with open(args.output, "w") as f:
+        json.dump(output, f, indent=2)
+    print(f"Saved results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,145 @@
 """Lightweight connection handling for MCP servers."""
 
+import asyncio
+import json
+import time
 from abc import ABC, abstractmethod
-from contextlib import AsyncExitStack
+from collections import OrderedDict
+from contextlib import AsyncExitStack, asynccontextmanager
 from typing import Any
 
-from mcp import ClientSession, StdioServerParameters
+import anyio
+from mcp import ClientSession, StdioServerParameters, types
 from mcp.client.sse import sse_client
 from mcp.client.stdio import stdio_client
 from mcp.client.streamable_http import streamablehttp_client
 
+from eval_trace import span
+
+
+class ToolResultCache:
+    """Opt-in memoization of MCP tool results for repeated identical calls.
+
+    Calls are keyed by tool name and canonical JSON of the arguments. A tool
+    is cached if it is in `tools` (name -> TTL in seconds, or None for the
+    default `ttl`), or, when `use_annotations` is set, if the server marks
+    it readOnlyHint or idempotentHint. Concurrent identical calls share one
+    request, error results are never stored, and at most `max_entries`
+    results are kept (least recently used evicted first).
+    """
+
+    def __init__(
+        self,
+        tools: dict[str, float | None] | None = None,
+        use_annotations: bool = True,
+        ttl: float = 300.0,
+        max_entries: int = 1024,
+    ):
+        self.tools = tools or {}
+        self.use_annotations = use_annotations
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._in_flight = {}
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "expired": 0, "evictions": 0, "uncached_calls": 0}
+
+    def ttl_for(self, tool_name: str, annotations: Any = None) -> float | None:
+        """TTL to cache `tool_name` with, or None if it must not be cached."""
+        if tool_name in self.tools:
+            return self.tools[tool_name] or self.ttl
+        if self.use_annotations and annotations is not None:
+            if getattr(annotations, "readOnlyHint", False) or getattr(annotations, "idempotentHint", False):
+                return self.ttl
+        return None
+
+    @staticmethod
+    def key(tool_name: str, arguments: dict[str, Any]) -> tuple[str, str]:
+        return tool_name, json.dumps(arguments, sort_keys=True, separators=(",", ":"), default=str)
+
+    async def get_or_call(self, tool_name: str, arguments: dict[str, Any], ttl: float, call) -> Any:
+        """Return the cached result for this call, or await `call()` and cache it.
+
+        If the caller whose request is being shared is cancelled (by a
+        timeout, say), callers waiting on it are not: they make the call
+        themselves instead.
+        """
+        key = self.key(tool_name, arguments)
+        while True:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, result = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return result
+                del self._entries[key]
+                self.stats["expired"] += 1
+
+            pending = self._in_flight.get(key)
+            if pending is None:
+                break
+            # Unlike awaiting the future, asyncio.wait() neither cancels it
+            # when this caller is cancelled nor raises if it was cancelled.
+            await asyncio.wait({pending})
+            if not pending.cancelled():
+                self.stats["coalesced"] += 1
+                return pending.result()
+
+        self.stats["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await call()
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an uncoalesced failure is not logged as unhandled.
+            future.exception()
+            raise
+        except BaseException:
+            # Cancellation belongs to this caller alone; waiters retry.
+            future.cancel()
+            raise
+        else:
+            future.set_result(result)
+            if not getattr(result, "isError", False):
+                self._entries[key] = (time.monotonic() + ttl, result)
+                if len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.stats["evictions"] += 1
+            return result
+        finally:
+            del self._in_flight[key]
+
+    def summary(self) -> dict[str, Any]:
+        stats = dict(self.stats)
+        lookups = stats["hits"] + stats["misses"] + stats["coalesced"]
+        stats["hit_rate"] = f"{(stats['hits'] + stats['coalesced']) / lookups * 100:.1f}%" if lookups else "n/a"
+        stats["entries"] = len(self._entries)
+        return stats
+
+
+def _only_stream_closed_errors(error: BaseException) -> bool:
+    """True if `error` (or every error in an exception group) is a closed or broken stream."""
+    inner = getattr(error, "exceptions", None)
+    if inner is not None:
+        return all(_only_stream_closed_errors(e) for e in inner)
+    return isinstance(error, (anyio.BrokenResourceError, anyio.ClosedResourceError))
+
 
 class MCPConnection(ABC):
-    """Base class for MCP server connections."""
+    """Base class for MCP server connections.
+
+    `abandoned_requests` counts tool calls whose caller stopped waiting (a
+    tool or task timeout, a hedge that lost). The server is told to cancel
+    them, but may still answer after the connection has stopped reading.
+    """
 
     def __init__(self):
         self.session = None
         self._stack = None
+        self.cache = None
+        self._tool_annotations = {}
+        self.abandoned_requests = 0
 
     @abstractmethod
     def _create_context(self):
@@ -47,14 +171,22 @@ class MCPConnection(ABC):
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Clean up MCP server connection resources."""
-        if self._stack:
-            await self._stack.__aexit__(exc_type, exc_val, exc_tb)
-        self.session = None
-        self._stack = None
+        try:
+            if self._stack:
+                await self._stack.__aexit__(exc_type, exc_val, exc_tb)
+        except Exception as e:
+            # A late answer to an abandoned request fails the transport's
+            # reader once the session has stopped reading; nobody wants it.
+            if not self.abandoned_requests or not _only_stream_closed_errors(e):
+                raise
+        finally:
+            self.session = None
+            self._stack = None
 
     async def list_tools(self) -> list[dict[str, Any]]:
         """Retrieve available tools from the MCP server."""
         response = await self.session.list_tools()
+        self._tool_annotations = {tool.name: getattr(tool, "annotations", None) for tool in response.tools}
         return [
             {
                 "name": tool.name,
@@ -64,9 +196,48 @@ class MCPConnection(ABC):
             for tool in response.tools
         ]
 
-    async def call_tool(self, tool_name: str, arguments: dict[str, Any]) -> Any:
-        """Call a tool on the MCP server with provided arguments."""
-        result = await self.session.call_tool(tool_name, arguments=arguments)
+    async def _send_call_tool(self, tool_name: str, arguments: dict[str, Any]) -> Any:
+        # mcp 1.x sessions number requests in `_request_id` and leave telling
+        # the server about an abandoned request to the caller; newer sessions
+        # send the cancellation themselves and have no such attribute.
+        request_id = getattr(self.session, "_request_id", None)
+        try:
+            return await self.session.call_tool(tool_name, arguments=arguments)
+        except asyncio.CancelledError:
+            self.abandoned_requests += 1
+            if request_id is not None:
+                await self._send_cancelled(request_id)
+            raise
+
+    async def _send_cancelled(self, request_id: int) -> None:
+        notification = types.ClientNotification(
+            types.CancelledNotification(
+                params=types.CancelledNotificationParams(requestId=request_id, reason="client stopped waiting")
+            )
+        )
+        try:
+            await asyncio.wait_for(self.session.send_notification(notification), timeout=1)
+        except Exception:
+            pass  # best effort: the server may already be gone
+
+    async def call_tool(self, tool_name: str, arguments: dict[str, Any], use_cache: bool = True) -> Any:
+        """Call a tool on the MCP server with provided arguments.
+
+        With `use_cache=False` the request is always sent, bypassing the
+        cache and any identical call already in flight.
+        """
+        ttl = None
+        if self.cache and use_cache:
+            ttl = self.cache.ttl_for(tool_name, self._tool_annotations.get(tool_name))
+            if ttl is None:
+                self.cache.stats["uncached_calls"] += 1
+        with span(f"tool {tool_name}", cat="tool", cached=ttl is not None):
+            if ttl is None:
+                result = await self._send_call_tool(tool_name, arguments)
+            else:
+                result = await self.cache.get_or_call(
+                    tool_name, arguments, ttl, lambda: self._send_call_tool(tool_name, arguments)
+                )
         return result.content
 
 
@@ -85,6 +256,264 @@ class MCPConnectionStdio(MCPConnection):
         )
 
 
+class _WarmServer:
+    __slots__ = ("connection", "task", "stop", "uses", "dead", "replaced")
+
+    def __init__(self, connection: MCPConnectionStdio):
+        self.connection = connection
+        self.task = None
+        self.stop = asyncio.Event()
+        self.uses = 0
+        self.dead = False
+        self.replaced = False
+
+
+class StdioServerPool:
+    """Keeps `size` stdio servers started and initialized ahead of time.
+
+    `acquire()` hands out an idle server, waiting only if none is ready.
+    `release()` returns it; after `max_uses` hand-outs, or when released as
+    broken, the server is stopped and a replacement starts in the
+    background, so start-up cost stays off the critical path. With
+    `max_uses=1` every acquirer gets a fresh server.
+
+    Each server runs in its own supervisor task because the MCP client
+    contexts must be entered and exited by the same task. A `cache` is
+    shared by every pooled connection.
+    """
+
+    def __init__(
+        self,
+        command: str,
+        args: list[str] = None,
+        env: dict[str, str] = None,
+        size: int = 2,
+        max_uses: int = 1,
+        health_check: bool = True,
+        cache: ToolResultCache = None,
+    ):
+        self.command = command
+        self.args = args or []
+        self.env = env
+        self.size = max(1, size)
+        self.max_uses = max(1, max_uses)
+        self.health_check = health_check
+        self.cache = cache
+        self._tool_annotations = {}
+        self._idle = None
+        self._servers = set()
+        self._in_use = {}
+        self._closing = False
+        self.stats = {
+            "started": 0,
+            "start_failures": 0,
+            "recycled": 0,
+            "restarted": 0,
+            "acquired": 0,
+            "acquire_wait_s": 0.0,
+            "startup_s": 0.0,
+            "hedged_calls": 0,
+            "hedge_wins": 0,
+        }
+
+    async def __aenter__(self):
+        self._idle = asyncio.Queue()
+        self._closing = False
+        for _ in range(self.size):
+            self._spawn()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self._closing = True
+        for server in list(self._servers):
+            server.stop.set()
+        await asyncio.gather(*(server.task for server in list(self._servers)), return_exceptions=True)
+
+    def _spawn(self) -> None:
+        connection = MCPConnectionStdio(self.command, self.args, self.env)
+        connection.cache = self.cache
+        server = _WarmServer(connection)
+        server.task = asyncio.create_task(self._run(server))
+        self._servers.add(server)
+
+    async def _run(self, server: _WarmServer) -> None:
+        start = time.perf_counter()
+        ready = False
+        try:
+            async with server.connection:
+                ready = True
+                self.stats["started"] += 1
+                self.stats["startup_s"] += time.perf_counter() - start
+                await self._idle.put(server)
+                await server.stop.wait()
+        except Exception as e:
+            server.dead = True
+            if not ready:
+                self.stats["start_failures"] += 1
+                # Let a waiting acquirer see why instead of waiting forever.
+                await self._idle.put(e)
+            else:
+                self._replace(server, "restarted")
+        finally:
+            self._servers.discard(server)
+
+    def _replace(self, server: _WarmServer, reason: str) -> None:
+        """Stop `server` and start one replacement, counted under `reason`.
+
+        A server can be given up on from several places (a failed health
+        check, a broken release, its own context exiting with an error);
+        only the first one replaces it.
+        """
+        server.stop.set()
+        if server.replaced or self._closing:
+            return
+        server.replaced = True
+        self.stats[reason] += 1
+        self._spawn()
+
+    async def _is_healthy(self, server: _WarmServer) -> bool:
+        if server.dead:
+            return False
+        if not self.health_check:
+            return True
+        try:
+            await asyncio.wait_for(server.connection.session.send_ping(), timeout=5)
+            return True
+        except Exception:
+            return False
+
+    async def _next_healthy(self) -> _WarmServer:
+        while True:
+            server = await self._idle.get()
+            if isinstance(server, Exception):
+                if any(not s.dead for s in self._servers):
+                    continue
+                # Nothing left that could ever become ready: fail every waiter.
+                self._idle.put_nowait(server)
+                raise server
+            if await self._is_healthy(server):
+                return server
+            self._replace(server, "restarted")
+
+    async def acquire(self) -> MCPConnection:
+        """Take a ready, initialized connection from the pool."""
+        start = time.perf_counter()
+        with span("acquire_server", cat="wait"):
+            server = await self._next_healthy()
+        self.stats["acquired"] += 1
+        self.stats["acquire_wait_s"] += time.perf_counter() - start
+        server.uses += 1
+        server.connection._tool_annotations = self._tool_annotations
+        self._in_use[id(server.connection)] = server
+        return server.connection
+
+    def try_acquire(self) -> MCPConnection | None:
+        """Take an idle connection without waiting (or health-checking), else None."""
+        while not self._idle.empty():
+            server = self._idle.get_nowait()
+            if isinstance(server, Exception):
+                self._idle.put_nowait(server)
+                return None
+            if server.dead:
+                continue
+            self.stats["acquired"] += 1
+            server.uses += 1
+            server.connection._tool_annotations = self._tool_annotations
+            self._in_use[id(server.connection)] = server
+            return server.connection
+        return None
+
+    def is_idempotent(self, tool_name: str) -> bool:
+        annotations = self._tool_annotations.get(tool_name)
+        return bool(getattr(annotations, "readOnlyHint", False) or getattr(annotations, "idempotentHint", False))
+
+    async def call_tool_hedged(
+        self,
+        connection: MCPConnection,
+        tool_name: str,
+        arguments: dict[str, Any],
+        hedge_after: float,
+    ) -> Any:
+        """Call a tool on `connection`, hedging on a second pooled server if slow.
+
+        If the call has not finished after `hedge_after` seconds and the tool
+        is annotated read-only or idempotent, the same call is sent to an idle
+        pooled server and the first successful result wins; the other call is
+        cancelled. Without an idle server the original call is simply awaited.
+
+        The backup call bypasses the tool result cache: joining the original
+        call's in-flight request would not send a second one.
+        """
+        primary = asyncio.ensure_future(connection.call_tool(tool_name, arguments))
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=hedge_after)
+            if done or not self.is_idempotent(tool_name):
+                return await primary
+            backup_connection = self.try_acquire()
+            if backup_connection is None:
+                return await primary
+
+            backup = asyncio.ensure_future(backup_connection.call_tool(tool_name, arguments, use_cache=False))
+            self.stats["hedged_calls"] += 1
+            try:
+                pending = {primary, backup}
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for call in done:
+                        if call.exception() is None:
+                            if call is backup:
+                                self.stats["hedge_wins"] += 1
+                            return call.result()
+                return await primary  # both failed; surface the original error
+            finally:
+                backup.cancel()
+                await self.release(backup_connection)
+        finally:
+            primary.cancel()
+
+    async def release(self, connection: MCPConnection, broken: bool = False) -> None:
+        """Return a connection; it is replaced if broken or used `max_uses` times.
+
+        A connection with abandoned requests counts as broken: its server may
+        still be busy with them, or answer them late.
+        """
+        server = self._in_use.pop(id(connection))
+        broken = broken or connection.abandoned_requests > 0
+        if self._closing or server.dead:
+            self._replace(server, "restarted")
+        elif broken or server.uses >= self.max_uses:
+            self._replace(server, "restarted" if broken else "recycled")
+        else:
+            await self._idle.put(server)
+
+    @asynccontextmanager
+    async def connection(self):
+        """`async with pool.connection() as conn:` acquires and releases one server."""
+        connection = await self.acquire()
+        broken = False
+        try:
+            yield connection
+        except Exception:
+            broken = True
+            raise
+        finally:
+            await self.release(connection, broken)
+
+    async def list_tools(self) -> list[dict[str, Any]]:
+        """List tools using any pooled server (they all run the same command)."""
+        async with self.connection() as connection:
+            tools = await connection.list_tools()
+            self._tool_annotations = connection._tool_annotations
+            return tools
+
+    def summary(self) -> dict[str, Any]:
+        stats = dict(self.stats)
+        stats["acquire_wait_s"] = round(stats["acquire_wait_s"], 3)
+        stats["avg_startup_s"] = round(stats["startup_s"] / stats["started"], 3) if stats["started"] else 0
+        stats["startup_s"] = round(stats["startup_s"], 3)
+        return stats
+
+
 class MCPConnectionSSE(MCPConnection):
     """MCP connection using Server-Sent Events."""
 
@@ -116,6 +545,7 @@ def create_connection(
     env: dict[str, str] = None,
     url: str = None,
     headers: dict[str, str] = None,
+    cache: ToolResultCache = None,
 ) -> MCPConnection:
     """Factory function to create the appropriate MCP connection.
 
@@ -126,6 +556,7 @@ def create_connection(
         env: Environment variables (stdio only)
         url: Server URL (sse and http only)
         headers: HTTP headers (sse and http only)
+        cache: Optional ToolResultCache for repeated tool calls
 
     Returns:
         MCPConnection instance
@@ -135,17 +566,20 @@ def create_connection(
     if transport == "stdio":
         if not command:
             raise ValueError("Command is required for stdio transport")
-        return MCPConnectionStdio(command=command, args=args, env=env)
+        connection = MCPConnectionStdio(command=command, args=args, env=env)
 
     elif transport == "sse":
         if not url:
             raise ValueError("URL is required for sse transport")
-        return MCPConnectionSSE(url=url, headers=headers)
+        connection = MCPConnectionSSE(url=url, headers=headers)
 
     elif transport in ["http", "streamable_http", "streamable-http"]:
         if not url:
             raise ValueError("URL is required for http transport")
-        return MCPConnectionHTTP(url=url, headers=headers)
+        connection = MCPConnectionHTTP(url=url, headers=headers)
 
     else:
         raise ValueError(f"Unsupported transport type: {transport}. Use 'stdio', 'sse', or 'http'")
+
+    connection.cache = cache
+    return connection
@@ -0,0 +1,122 @@
+"""
+Timeline tracing for evaluation runs, exported as Chrome trace events.
+
+Wrap work in `with span("model", cat="model"):`. Spans land on the lane
+of the task that runs them (see `lane()`), so each task gets its own row
+in chrome://tracing or https://ui.perfetto.dev, with model calls, tool
+calls and scheduler waits nested inside it. Counter tracks show how many
+model and tool calls are in flight, which makes concurrency stalls easy to
+spot. `counter()` adds other time series, such as server resource
+samples, to the same timeline.
+
+Spans cost almost nothing until `start_tracing()` is called.
+"""
+
+import contextlib
+import contextvars
+import json
+import os
+import time
+from pathlib import Path
+
+# Categories whose spans also drive an "in flight" counter track.
+COUNTED_CATEGORIES = ("model", "tool")
+
+_tracer = None
+_lane = contextvars.ContextVar("trace_lane", default=0)
+
+
+class Tracer:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.events = []
+        self.lanes = {0: "harness"}
+        self.in_flight = dict.fromkeys(COUNTED_CATEGORIES, 0)
+
+    def now_us(self):
+        return (time.perf_counter() - self.start) * 1e6
+
+    def add_span(self, name, cat, start_us, end_us, lane, args):
+        self.events.append({
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": round(start_us, 1),
+            "dur": round(end_us - start_us, 1),
+            "pid": 1,
+            "tid": lane,
+            "args": args,
+        })
+
+    def count(self, cat, delta, ts_us):
+        self.in_flight[cat] += delta
+        self.events.append({
+            "name": f"in-flight {cat} calls",
+            "ph": "C",
+            "ts": round(ts_us, 1),
+            "pid": 1,
+            "args": {cat: self.in_flight[cat]},
+        })
+
+    def to_json(self):
+        metadata = [{"name": "process_name", "ph": "M", "pid": 1, "args": {"name": "evaluation"}}]
+        for lane, name in sorted(self.lanes.items()):
+            metadata.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": lane, "args": {"name": name}})
+            metadata.append({"name": "thread_sort_index", "ph": "M", "pid": 1, "tid": lane, "args": {"sort_index": lane}})
+        return {"traceEvents": metadata + self.events, "displayTimeUnit": "ms"}
+
+    def write(self, path):
+        path = Path(path)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(self.to_json(), separators=(",", ":")))
+        os.replace(tmp_path, path)
+
+
+def start_tracing():
+    global _tracer
+    _tracer = Tracer()
+    return _tracer
+
+
+def stop_tracing():
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+@contextlib.contextmanager
+def lane(lane_id, name):
+    """Record spans in this context (and tasks it starts) on lane `lane_id`."""
+    if _tracer is not None:
+        _tracer.lanes[lane_id] = name
+    token = _lane.set(lane_id)
+    try:
+        yield
+    finally:
+        _lane.reset(token)
+
+
+@contextlib.contextmanager
+def span(name, cat="harness", **args):
+    """Time a block as one trace event. Yields `args` so callers can add to it."""
+    tracer = _tracer
+    if tracer is None:
+        yield args
+        return
+    start = tracer.now_us()
+    if cat in tracer.in_flight:
+        tracer.count(cat, 1, start)
+    try:
+        yield args
+    finally:
+        end = tracer.now_us()
+        if cat in tracer.in_flight:
+            tracer.count(cat, -1, end)
+        tracer.add_span(name, cat, start, end, _lane.get(), args)
+
+
+def counter(name, **values):
+    """Record a counter track sample (e.g. a resource reading) at the current time."""
+    tracer = _tracer
+    if tracer is not None:
+        tracer.events.append({"name": name, "ph": "C", "ts": round(tracer.now_us(), 1), "pid": 1, "args": values})
@@ -5,18 +5,28 @@ This script evaluates MCP servers by running test questions against them using C
 
 import argparse
 import asyncio
+import base64
+import hashlib
 import json
+import mimetypes
+import os
+import random
 import re
 import sys
 import time
 import traceback
 import xml.etree.ElementTree as ET
+from contextlib import AsyncExitStack
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 from anthropic import Anthropic
 
-from connections import create_connection
+from connections import StdioServerPool, ToolResultCache, create_connection
+from eval_trace import lane, span, start_tracing, stop_tracing
+from mcp_config import load_mcp_servers
+from rate_limit import RateLimitScheduler
+from resource_sampler import ProcessSampler
 
 EVALUATION_PROMPT = """You are an AI assistant with access to tools.
 
@@ -53,71 +63,401 @@ Response Requirements:
 - Your response should go last"""
 
 
-def parse_evaluation_file(file_path: Path) -> list[dict[str, Any]]:
-    """Parse XML evaluation file with qa_pair elements."""
-    try:
-        tree = ET.parse(file_path)
-        root = tree.getroot()
-        evaluations = []
+class EvaluationFileError(Exception):
+    """Raised when an evaluation file cannot be read or parsed."""
 
-        for qa_pair in root.findall(".//qa_pair"):
-            question_elem = qa_pair.find("question")
-            answer_elem = qa_pair.find("answer")
 
-            if question_elem is not None and answer_elem is not None:
-                evaluations.append({
-                    "question": (question_elem.text or "").strip(),
-                    "answer": (answer_elem.text or "").strip(),
-                })
+def _qa_pair_from_element(qa_pair: ET.Element) -> dict[str, Any] | None:
+    question_elem = qa_pair.find("question")
+    answer_elem = qa_pair.find("answer")
+    if question_elem is None or answer_elem is None:
+        return None
+    return {
+        "question": (question_elem.text or "").strip(),
+        "answer": (answer_elem.text or "").strip(),
+    }
 
-        return evaluations
-    except Exception as e:
-        print(f"Error parsing evaluation file {file_path}: {e}")
-        return []
+
+def _iter_xml_qa_pairs(file_path: Path) -> Iterator[dict[str, Any]]:
+    # Track open elements so each finished qa_pair can be detached from its
+    # parent; otherwise the partial tree keeps every pair alive until the end.
+    stack = []
+    for event, elem in ET.iterparse(file_path, events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            continue
+        stack.pop()
+        if elem.tag != "qa_pair":
+            continue
+        qa_pair = _qa_pair_from_element(elem)
+        if stack:
+            stack[-1].remove(elem)
+        elem.clear()
+        if qa_pair is not None:
+            yield qa_pair
+
+
+def _iter_jsonl_qa_pairs(file_path: Path) -> Iterator[dict[str, Any]]:
+    with open(file_path) as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"line {line_number}: {e}") from None
+            if "question" not in record or "answer" not in record:
+                print(f"Warning: Skipping line {line_number} without question and answer")
+                continue
+            yield {
+                "question": str(record["question"]).strip(),
+                "answer": str(record["answer"]).strip(),
+            }
+
+
+def iter_evaluation_file(file_path: Path) -> Iterator[dict[str, Any]]:
+    """Yield QA pairs one at a time from an XML or JSONL evaluation file.
+
+    XML files are read incrementally with iterparse and each qa_pair element
+    is discarded once yielded. Files ending in .jsonl hold one
+    {"question": ..., "answer": ...} object per line.
+
+    Raises EvaluationFileError if the file cannot be read or parsed, even
+    partway through, so a broken file never yields a partial run.
+    """
+    file_path = Path(file_path)
+    try:
+        if file_path.suffix.lower() == ".jsonl":
+            yield from _iter_jsonl_qa_pairs(file_path)
+        else:
+            yield from _iter_xml_qa_pairs(file_path)
+    except (OSError, ValueError, ET.ParseError) as e:
+        raise EvaluationFileError(f"Error parsing evaluation file {file_path}: {e}") from e
+
+
+def parse_evaluation_file(file_path: Path) -> list[dict[str, Any]]:
+    """Parse XML evaluation file with qa_pair elements."""
+    return list(iter_evaluation_file(file_path))
 
 
 def extract_xml_content(text: str, tag: str) -> str | None:
     """Extract content from XML tags."""
     pattern = rf"<{tag}>(.*?)</{tag}>"
-    matches = re.findall(pattern, text, re.DOTALL)
+    matches = re.findall(pattern, text or "", re.DOTALL)
     return matches[-1].strip() if matches else None
 
 
+def _json_default(obj: Any) -> Any:
+    return obj.model_dump() if hasattr(obj, "model_dump") else str(obj)
+
+
+def message_size(message: dict[str, Any]) -> int:
+    """Serialized size of one conversation message in bytes."""
+    return len(json.dumps(message, default=_json_default).encode())
+
+
+def spill_to_dir(spill_dir: Path, data: bytes, suffix: str) -> Path:
+    """Save `data` under `spill_dir`, named by content hash, and return the path."""
+    path = spill_dir / f"{hashlib.sha256(data).hexdigest()[:16]}{suffix}"
+    if not path.exists():
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    return path
+
+
+class ToolResponseLimiter:
+    """Caps the size of tool responses added to the conversation.
+
+    The cap covers a whole response: the text of all its text blocks plus
+    the base64 data of its image blocks. Text is kept first; images are
+    kept in order while they still fit and the rest are replaced by a short
+    note. Oversized text keeps its head and tail, across block boundaries,
+    with a marker in between. With `spill_dir`, the full text and any
+    dropped images are saved there (named by content hash) and the marker
+    or note points to the file.
+    """
+
+    def __init__(self, max_bytes: int | None = None, spill_dir: Path | None = None):
+        self.max_bytes = max_bytes
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        if self.spill_dir:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+
+    def _drop_image(self, block: dict[str, Any]) -> dict[str, Any]:
+        source = block["source"]
+        note = f"image: {source['media_type']}, {len(source['data'])} bytes, left out to stay within the tool response limit"
+        if self.spill_dir:
+            raw = base64.b64decode(source["data"])
+            suffix = mimetypes.guess_extension(source["media_type"]) or ".bin"
+            note += f"; saved to {spill_to_dir(self.spill_dir, raw, suffix)}"
+        return {"type": "text", "text": f"[{note}]"}
+
+    def _truncate_text(self, blocks: list[dict[str, Any]], budget: int) -> tuple[list[dict[str, Any]], int]:
+        """Keep the first and last `budget` / 2 bytes of the text blocks' combined text."""
+        texts = [block["text"].encode() for block in blocks if block["type"] == "text"]
+        total = sum(len(data) for data in texts)
+        if total <= budget:
+            return blocks, 0
+
+        removed = total - budget
+        note = f"{removed} bytes truncated"
+        if self.spill_dir:
+            path = spill_to_dir(self.spill_dir, b"\n".join(texts), ".txt")
+            note += f"; full response saved to {path}"
+        head_end = budget // 2
+        tail_start = total - (budget - head_end)
+
+        result = []
+        start = 0
+        marked = False
+        for block in blocks:
+            if block["type"] != "text":
+                result.append(block)
+                continue
+            data = block["text"].encode()
+            end = start + len(data)
+            text = data[:max(0, min(end, head_end) - start)].decode(errors="ignore")
+            if not marked and end > head_end:
+                text += f"\n\n[... {note} ...]\n\n"
+                marked = True
+            if end > tail_start:
+                text += data[max(start, tail_start) - start:].decode(errors="ignore")
+            if text:
+                result.append({"type": "text", "text": text})
+            start = end
+        return result, removed
+
+    def apply(self, blocks: list[dict[str, Any]]) -> tuple[list[dict[str, Any]], int]:
+        """Return the (possibly truncated) content blocks and the number of bytes removed."""
+        if not self.max_bytes or content_size(blocks) <= self.max_bytes:
+            return blocks, 0
+
+        text_bytes = sum(len(block["text"].encode()) for block in blocks if block["type"] == "text")
+        image_budget = max(0, self.max_bytes - text_bytes)
+        kept = []
+        removed = 0
+        for block in blocks:
+            if block["type"] == "image":
+                size = len(block["source"]["data"])
+                if size > image_budget:
+                    kept.append(self._drop_image(block))
+                    removed += size
+                    continue
+                image_budget -= size
+            kept.append(block)
+
+        text_budget = self.max_bytes - sum(len(block["source"]["data"]) for block in kept if block["type"] == "image")
+        blocks, truncated = self._truncate_text(kept, text_budget)
+        return blocks, removed + truncated
+
+
+class TurnLimitExceeded(Exception):
+    """Raised when a task reaches its model-call cap while still calling tools."""
+
+
+class TaskLimits:
+    """Bounds on how long one task may run.
+
+    - `task_timeout`: wall-clock seconds for a whole task
+    - `tool_timeout`: seconds for one tool call; the model gets an error
+      result and may carry on
+    - `max_turns`: model calls per task
+    - `hedge_after`: with a StdioServerPool, re-send a read-only or
+      idempotent tool call still running after this many seconds to a spare
+      server and use whichever result arrives first
+    """
+
+    def __init__(
+        self,
+        task_timeout: float | None = None,
+        tool_timeout: float | None = None,
+        max_turns: int | None = None,
+        hedge_after: float | None = None,
+    ):
+        self.task_timeout = task_timeout
+        self.tool_timeout = tool_timeout
+        self.max_turns = max_turns
+        self.hedge_after = hedge_after
+        self.pool = None
+        self.stats = {"timed_out_tasks": 0, "max_turns_tasks": 0, "failed_tasks": 0, "tool_timeouts": 0}
+
+    async def call_tool(self, connection: Any, tool_name: str, arguments: dict[str, Any]) -> Any:
+        if self.pool is not None and self.hedge_after is not None:
+            call = self.pool.call_tool_hedged(connection, tool_name, arguments, self.hedge_after)
+        else:
+            call = connection.call_tool(tool_name, arguments)
+        if not self.tool_timeout:
+            return await call
+        try:
+            return await asyncio.wait_for(call, self.tool_timeout)
+        except asyncio.TimeoutError:
+            self.stats["tool_timeouts"] += 1
+            raise TimeoutError(f"tool call timed out after {self.tool_timeout:g}s") from None
+
+    def summary(self) -> dict[str, Any]:
+        """Stats for the evaluation report; hedge counts live in the Server Pool section."""
+        stats = {
+            "task_timeout_s": self.task_timeout,
+            "tool_timeout_s": self.tool_timeout,
+            "max_turns": self.max_turns,
+            **self.stats,
+        }
+        if self.pool is not None and self.hedge_after is not None:
+            stats["hedge_after_s"] = self.hedge_after
+        return stats
+
+
+# Image types and size (base64 bytes) the Messages API accepts in image blocks.
+IMAGE_MEDIA_TYPES = {"image/jpeg", "image/png", "image/gif", "image/webp"}
+MAX_IMAGE_BYTES = 5 * 1024 * 1024
+
+
+class ToolContentConverter:
+    """Turns MCP tool result content into Messages API content blocks.
+
+    Text and images are passed through as text and image blocks instead of
+    being stringified. Embedded text resources are inlined as text. Other
+    binary content (audio, binary resources, images the API cannot take) is
+    passed by reference: a short text block describes it and, with
+    `spill_dir`, names the file it was saved to. A blob this conversation
+    has already seen is replaced by a pointer to the earlier turn.
+
+    Use one converter per conversation.
+    """
+
+    def __init__(self, spill_dir: Path | None = None):
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self.seen = {}
+
+    def _blob_block(self, data: str, mime_type: str | None, label: str, turn: int) -> tuple[dict[str, Any], int]:
+        """Return the block for base64 `data` and the bytes it kept out of the conversation."""
+        digest = hashlib.sha256(data.encode()).hexdigest()
+        if digest in self.seen:
+            return {"type": "text", "text": f"[{label}: same content as the tool result in turn {self.seen[digest]}]"}, len(data)
+        self.seen[digest] = turn
+        if mime_type in IMAGE_MEDIA_TYPES and len(data) <= MAX_IMAGE_BYTES:
+            return {"type": "image", "source": {"type": "base64", "media_type": mime_type, "data": data}}, 0
+
+        raw = base64.b64decode(data)
+        note = f"{label}: {mime_type or 'binary'} content, {len(raw)} bytes, not shown"
+        if self.spill_dir:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            suffix = mimetypes.guess_extension(mime_type or "") or ".bin"
+            note += f"; saved to {spill_to_dir(self.spill_dir, raw, suffix)}"
+        return {"type": "text", "text": f"[{note}]"}, len(data)
+
+    def convert(self, content: Any, turn: int) -> tuple[list[dict[str, Any]], int]:
+        """Return API content blocks for a tool result and the blob bytes not sent."""
+        if isinstance(content, str):
+            return [{"type": "text", "text": content}], 0
+        if not isinstance(content, list) or not all(hasattr(item, "type") for item in content):
+            return [{"type": "text", "text": json.dumps(content, default=_json_default)}], 0
+
+        blocks = []
+        saved = 0
+        for item in content:
+            block = None
+            if item.type == "text":
+                block = {"type": "text", "text": item.text}
+            elif item.type in ("image", "audio"):
+                block, skipped = self._blob_block(item.data, item.mimeType, item.type, turn)
+                saved += skipped
+            elif item.type == "resource":
+                resource = item.resource
+                if getattr(resource, "text", None) is not None:
+                    block = {"type": "text", "text": f"[resource {resource.uri}]\n{resource.text}"}
+                else:
+                    block, skipped = self._blob_block(resource.blob, resource.mimeType, f"resource {resource.uri}", turn)
+                    saved += skipped
+            elif item.type == "resource_link":
+                block = {"type": "text", "text": f"[resource link {item.uri}]"}
+            if block is None:
+                block = {"type": "text", "text": json.dumps(item, default=_json_default)}
+            blocks.append(block)
+        return blocks or [{"type": "text", "text": ""}], saved
+
+
+def content_size(blocks: list[dict[str, Any]]) -> int:
+    """Bytes of text and base64 data in content blocks."""
+    return sum(
+        len(block["text"].encode()) if block["type"] == "text" else len(block["source"]["data"])
+        for block in blocks
+    )
+
+
 async def agent_loop(
     client: Anthropic,
     model: str,
     question: str,
     tools: list[dict[str, Any]],
     connection: Any,
+    scheduler: RateLimitScheduler | None = None,
+    limiter: ToolResponseLimiter | None = None,
+    history: list[dict[str, Any]] | None = None,
+    limits: TaskLimits | None = None,
+    tool_metrics: dict[str, Any] | None = None,
 ) -> tuple[str, dict[str, Any]]:
-    """Run the agent loop with MCP tools."""
-    messages = [{"role": "user", "content": question}]
+    """Run the agent loop with MCP tools.
 
-    response = await asyncio.to_thread(
-        client.messages.create,
-        model=model,
-        max_tokens=4096,
-        system=EVALUATION_PROMPT,
-        messages=messages,
-        tools=tools,
-    )
+    If `history` is given, one entry per model call is appended to it with
+    the conversation size sent, the model latency, the size of the tool
+    response that followed and the blob bytes kept out of it (see
+    ToolContentConverter). Tool timings are recorded into `tool_metrics`
+    as they happen, so a caller that cancels the loop keeps them.
+
+    Raises TurnLimitExceeded once `limits.max_turns` model calls have been
+    made and the model still wants a tool.
+    """
+    messages = [{"role": "user", "content": question}]
+    history_bytes = message_size(messages[0])
+
+    async def create_message():
+        request = dict(model=model, max_tokens=4096, system=EVALUATION_PROMPT, messages=messages, tools=tools)
+        start = time.perf_counter()
+        with span("model_turn", cat="turn", model=model, history_bytes=history_bytes):
+            if scheduler:
+                response = await scheduler.call(client.messages.create, **request)
+            else:
+                with span("messages.create", cat="model"):
+                    response = await asyncio.to_thread(client.messages.create, **request)
+        if history is not None:
+            history.append({
+                "turn": len(history) + 1,
+                "history_bytes": history_bytes,
+                "input_tokens": getattr(getattr(response, "usage", None), "input_tokens", None),
+                "model_seconds": round(time.perf_counter() - start, 4),
+            })
+        return response
+
+    response = await create_message()
+    turns = 1
 
     messages.append({"role": "assistant", "content": response.content})
+    history_bytes += message_size(messages[-1])
 
-    tool_metrics = {}
+    if tool_metrics is None:
+        tool_metrics = {}
+    converter = ToolContentConverter(limiter.spill_dir if limiter else None)
 
     while response.stop_reason == "tool_use":
+        if limits and limits.max_turns and turns >= limits.max_turns:
+            raise TurnLimitExceeded(f"stopped after {turns} model turns")
         tool_use = next(block for block in response.content if block.type == "tool_use")
         tool_name = tool_use.name
         tool_input = tool_use.input
 
         tool_start_ts = time.time()
         try:
-            tool_result = await connection.call_tool(tool_name, tool_input)
-            tool_response = json.dumps(tool_result) if isinstance(tool_result, (dict, list)) else str(tool_result)
+            if limits:
+                tool_result = await limits.call_tool(connection, tool_name, tool_input)
+            else:
+                tool_result = await connection.call_tool(tool_name, tool_input)
+            tool_response, saved_bytes = converter.convert(tool_result, turns)
         except Exception as e:
-            tool_response = f"Error executing tool {tool_name}: {str(e)}\n"
-            tool_response += traceback.format_exc()
+            error_text = f"Error executing tool {tool_name}: {str(e)}\n"
+            error_text += traceback.format_exc()
+            tool_response, saved_bytes = [{"type": "text", "text": error_text}], 0
         tool_duration = time.time() - tool_start_ts
 
         if tool_name not in tool_metrics:
@@ -125,6 +465,15 @@ async def agent_loop(
         tool_metrics[tool_name]["count"] += 1
         tool_metrics[tool_name]["durations"].append(tool_duration)
 
+        response_bytes = content_size(tool_response)
+        truncated_bytes = 0
+        if limiter:
+            tool_response, truncated_bytes = limiter.apply(tool_response)
+        if history is not None:
+            history[-1]["tool_response_bytes"] = response_bytes
+            history[-1]["truncated_bytes"] = truncated_bytes
+            history[-1]["blob_bytes_saved"] = saved_bytes
+
         messages.append({
             "role": "user",
             "content": [{
@@ -133,16 +482,12 @@ async def agent_loop(
                 "content": tool_response,
             }]
         })
+        history_bytes += message_size(messages[-1])
 
-        response = await asyncio.to_thread(
-            client.messages.create,
-            model=model,
-            max_tokens=4096,
-            system=EVALUATION_PROMPT,
-            messages=messages,
-            tools=tools,
-        )
+        response = await create_message()
+        turns += 1
         messages.append({"role": "assistant", "content": response.content})
+        history_bytes += message_size(messages[-1])
 
     response_text = next(
         (block.text for block in response.content if hasattr(block, "text")),
@@ -158,12 +503,49 @@ async def evaluate_single_task(
     tools: list[dict[str, Any]],
     connection: Any,
     task_index: int,
+    scheduler: RateLimitScheduler | None = None,
+    limiter: ToolResponseLimiter | None = None,
+    limits: TaskLimits | None = None,
 ) -> dict[str, Any]:
-    """Evaluate a single QA pair with the given tools."""
+    """Evaluate a single QA pair with the given tools.
+
+    A task that hits `limits` (or whose model call fails) is scored as
+    incorrect and its `status` says why; the other tasks carry on.
+    """
     start_time = time.time()
 
     print(f"Task {task_index + 1}: Running task with question: {qa_pair['question']}")
-    response, tool_metrics = await agent_loop(client, model, qa_pair["question"], tools, connection)
+    history = []
+    tool_metrics = {}
+    response = None
+    status = "completed"
+    with lane(task_index + 1, f"Task {task_index + 1}"), span("task", cat="task", question=qa_pair["question"][:200]) as task_args:
+        try:
+            with span("agent_loop"):
+                response, tool_metrics = await asyncio.wait_for(
+                    agent_loop(
+                        client, model, qa_pair["question"], tools, connection, scheduler, limiter, history,
+                        limits, tool_metrics,
+                    ),
+                    limits.task_timeout if limits else None,
+                )
+        except TurnLimitExceeded as e:
+            status = str(e)
+            if limits is not None:
+                limits.stats["max_turns_tasks"] += 1
+        except Exception as e:
+            # asyncio.TimeoutError is the builtin TimeoutError on 3.11+, so
+            # only count it as the task deadline when one was set.
+            if isinstance(e, asyncio.TimeoutError) and limits is not None and limits.task_timeout:
+                status = f"timed out after {limits.task_timeout:g}s"
+                limits.stats["timed_out_tasks"] += 1
+            else:
+                status = f"failed: {str(e) or type(e).__name__}"
+                if limits is not None:
+                    limits.stats["failed_tasks"] += 1
+        task_args["status"] = status
+    if status != "completed":
+        print(f"Task {task_index + 1}: {status}")
 
     response_value = extract_xml_content(response, "response")
     summary = extract_xml_content(response, "summary")
@@ -172,6 +554,7 @@ async def evaluate_single_task(
     duration_seconds = time.time() - start_time
 
     return {
+        "task_index": task_index,
         "question": qa_pair["question"],
         "expected": qa_pair["answer"],
         "actual": response_value,
@@ -181,6 +564,8 @@ async def evaluate_single_task(
         "num_tool_calls": sum(len(metrics["durations"]) for metrics in tool_metrics.values()),
         "summary": summary,
         "feedback": feedback,
+        "history": history,
+        "status": status,
     }
 
 
@@ -204,8 +589,10 @@ TASK_TEMPLATE = """
 **Ground Truth Answer**: `{expected_answer}`
 **Actual Answer**: `{actual_answer}`
 **Correct**: {correct_indicator}
+**Status**: {status}
 **Duration**: {total_duration:.2f}s
 **Tool Calls**: {tool_calls}
+**Context Growth**: {context_growth}
 
 **Summary**
 {summary}
@@ -217,28 +604,65 @@ TASK_TEMPLATE = """
 """
 
 
-async def run_evaluation(
-    eval_path: Path,
-    connection: Any,
-    model: str = "claude-3-7-sonnet-20250219",
-) -> str:
-    """Run evaluation with MCP server tools."""
-    print("🚀 Starting Evaluation")
+RESULTS_VERSION = 1
 
-    client = Anthropic()
 
-    tools = await connection.list_tools()
-    print(f"📋 Loaded {len(tools)} tools from MCP server")
+def _format_kb(num_bytes: int) -> str:
+    return f"{num_bytes / 1024:.1f} KB"
 
-    qa_pairs = parse_evaluation_file(eval_path)
-    print(f"📋 Loaded {len(qa_pairs)} evaluation tasks")
 
-    results = []
-    for i, qa_pair in enumerate(qa_pairs):
-        print(f"Processing task {i + 1}/{len(qa_pairs)}")
-        result = await evaluate_single_task(client, model, qa_pair, tools, connection, i)
-        results.append(result)
+def format_history(history: list[dict[str, Any]] | None) -> str:
+    """One line per model call: conversation size sent and model latency."""
+    if not history:
+        return "N/A"
+    lines = []
+    for turn in history:
+        line = f"turn {turn['turn']}: {_format_kb(turn['history_bytes'])} sent, {turn['model_seconds']:.2f}s"
+        if turn.get("tool_response_bytes") is not None:
+            line += f", tool response {_format_kb(turn['tool_response_bytes'])}"
+            if turn.get("truncated_bytes"):
+                line += f" ({_format_kb(turn['truncated_bytes'])} truncated)"
+            if turn.get("blob_bytes_saved"):
+                line += f" ({_format_kb(turn['blob_bytes_saved'])} of repeated/binary content by reference)"
+        lines.append(f"- {line}")
+    return "\n" + "\n".join(lines)
+
+
+def tool_response_stats(results: list[dict[str, Any]]) -> dict[str, Any]:
+    """Aggregate tool response sizes and truncation across tasks."""
+    turns = [turn for r in results for turn in r.get("history") or []]
+    responses = [turn for turn in turns if turn.get("tool_response_bytes") is not None]
+    return {
+        "tool_responses": len(responses),
+        "truncated_responses": sum(1 for turn in responses if turn.get("truncated_bytes")),
+        "truncated_bytes": sum(turn.get("truncated_bytes", 0) for turn in responses),
+        "blob_bytes_saved": sum(turn.get("blob_bytes_saved", 0) for turn in responses),
+        "largest_tool_response_bytes": max((turn["tool_response_bytes"] for turn in responses), default=0),
+        "largest_history_bytes": max((turn["history_bytes"] for turn in turns), default=0),
+    }
+
 
+def parse_shard(value: str) -> tuple[int, int]:
+    """Parse a shard spec "i/N" (1-based) into (i, N)."""
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid shard '{value}', expected i/N (e.g. 1/4)")
+    if count < 1 or not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"Invalid shard '{value}', i must be between 1 and N")
+    return index, count
+
+
+def format_stats_section(title: str, stats: dict[str, Any]) -> str:
+    lines = "\n".join(f"- **{key}**: {value}" for key, value in stats.items())
+    return f"\n## {title}\n\n{lines}\n\n---\n"
+
+
+def build_report(results: list[dict[str, Any]], stats: dict[str, dict[str, Any]] | None = None) -> str:
+    """Format evaluation results as the Markdown report.
+
+    `stats` maps a section title to harness metrics shown after the summary.
+    """
     correct = sum(r["score"] for r in results)
     accuracy = (correct / len(results)) * 100 if results else 0
     average_duration_s = sum(r["total_duration"] for r in results) / len(results) if results else 0
@@ -253,25 +677,316 @@ async def run_evaluation(
         average_tool_calls=average_tool_calls,
         total_tool_calls=total_tool_calls,
     )
+    report += "".join(format_stats_section(title, section) for title, section in (stats or {}).items())
 
     report += "".join([
         TASK_TEMPLATE.format(
-            task_num=i + 1,
-            question=qa_pair["question"],
-            expected_answer=qa_pair["answer"],
+            task_num=result.get("task_index", i) + 1,
+            question=result["question"],
+            expected_answer=result["expected"],
             actual_answer=result["actual"] or "N/A",
             correct_indicator="✅" if result["score"] else "❌",
+            status=result.get("status", "completed"),
             total_duration=result["total_duration"],
             tool_calls=json.dumps(result["tool_calls"], indent=2),
+            context_growth=format_history(result.get("history")),
             summary=result["summary"] or "N/A",
             feedback=result["feedback"] or "N/A",
         )
-        for i, (qa_pair, result) in enumerate(zip(qa_pairs, results))
+        for i, result in enumerate(results)
     ])
 
     return report
 
 
+def save_results(results_path: Path, results: list[dict[str, Any]], **meta: Any) -> None:
+    """Write raw task results as JSON so runs can be merged or compared later."""
+    results_path = Path(results_path)
+    tmp_path = results_path.with_name(f"{results_path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps({"version": RESULTS_VERSION, **meta, "results": results}, indent=2))
+    os.replace(tmp_path, results_path)
+
+
+def load_results(results_path: Path) -> dict[str, Any]:
+    """Load a results file written by save_results."""
+    data = json.loads(Path(results_path).read_text())
+    if data.get("version") != RESULTS_VERSION:
+        raise ValueError(f"{results_path}: unsupported results version {data.get('version')}")
+    return data
+
+
+def merge_results(results_paths: list[Path]) -> list[dict[str, Any]]:
+    """Combine shard results files into one result list in task order.
+
+    Raises ValueError if the files come from different evaluation files or
+    shard counts, or if any shard is missing or duplicated.
+    """
+    shards = {}
+    eval_files = set()
+    counts = set()
+    for path in results_paths:
+        data = load_results(path)
+        eval_files.add(data.get("eval_file"))
+        index, count = data.get("shard") or (1, 1)
+        counts.add(count)
+        if index in shards:
+            raise ValueError(f"Shard {index}/{count} given more than once ({shards[index][0]} and {path})")
+        shards[index] = (path, data["results"])
+
+    if len(eval_files) > 1:
+        raise ValueError(f"Results come from different evaluation files: {', '.join(sorted(map(str, eval_files)))}")
+    if len(counts) > 1:
+        raise ValueError(f"Results use different shard counts: {', '.join(map(str, sorted(counts)))}")
+    count = counts.pop() if counts else 0
+    missing = sorted(set(range(1, count + 1)) - set(shards))
+    if missing:
+        raise ValueError(f"Missing shard(s) {', '.join(f'{i}/{count}' for i in missing)}")
+
+    results = [result for _, shard_results in shards.values() for result in shard_results]
+    return sorted(results, key=lambda r: r["task_index"])
+
+
+async def evaluate_tasks(
+    client: Anthropic,
+    eval_path: Path,
+    connection: Any,
+    tools: list[dict[str, Any]],
+    model: str,
+    concurrency: int = 1,
+    shard: tuple[int, int] | None = None,
+    scheduler: RateLimitScheduler | None = None,
+    limiter: ToolResponseLimiter | None = None,
+    limits: TaskLimits | None = None,
+) -> list[dict[str, Any]]:
+    """Stream QA pairs from `eval_path` and evaluate them, returning results in task order.
+
+    If `connection` is a StdioServerPool, each task gets a server of its own
+    from the pool instead of sharing one session.
+    """
+    qa_pairs = enumerate(iter_evaluation_file(eval_path))
+    if shard:
+        shard_index, shard_count = shard
+        qa_pairs = ((i, qa_pair) for i, qa_pair in qa_pairs if i % shard_count == shard_index - 1)
+    results = {}
+
+    async def worker():
+        # Workers share one iterator, so the file is only read as fast as
+        # tasks are picked up.
+        for i, qa_pair in qa_pairs:
+            print(f"Processing task {i + 1}")
+            if isinstance(connection, StdioServerPool):
+                with lane(i + 1, f"Task {i + 1}"):
+                    async with connection.connection() as task_connection:
+                        results[i] = await evaluate_single_task(
+                            client, model, qa_pair, tools, task_connection, i, scheduler, limiter, limits
+                        )
+                continue
+            results[i] = await evaluate_single_task(
+                client, model, qa_pair, tools, connection, i, scheduler, limiter, limits
+            )
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(max(1, concurrency))]
+    try:
+        await asyncio.gather(*workers)
+    except BaseException:
+        # e.g. the evaluation file turned out to be broken: stop the other workers too.
+        for task in workers:
+            task.cancel()
+        raise
+    return [results[i] for i in sorted(results)]
+
+
+async def run_evaluation(
+    eval_path: Path,
+    connection: Any,
+    model: str = "claude-3-7-sonnet-20250219",
+    concurrency: int = 1,
+    shard: tuple[int, int] | None = None,
+    results_path: Path | None = None,
+    scheduler: RateLimitScheduler | None = None,
+    limiter: ToolResponseLimiter | None = None,
+    limits: TaskLimits | None = None,
+    sampler: ProcessSampler | None = None,
+) -> str:
+    """Run evaluation with MCP server tools.
+
+    QA pairs are streamed from the evaluation file, so the first task starts
+    as soon as it is parsed. Up to `concurrency` tasks run at once. With
+    `shard=(i, N)` only every N-th task starting at the i-th is run, so N
+    workers cover the file exactly once. Raw results are written to
+    `results_path` when given.
+
+    Model calls go through `scheduler` (by default one allowing
+    `concurrency` calls at once), which retries rate-limit and overload
+    errors itself, so the client's built-in retries are turned off.
+    Tool responses are capped by `limiter` and tasks bounded by `limits`
+    when given. With `sampler`, the server processes' resource use is
+    sampled while tasks run and summarised in the report.
+    """
+    print("🚀 Starting Evaluation")
+
+    if scheduler is None:
+        scheduler = RateLimitScheduler(max_concurrency=concurrency)
+    client = Anthropic(max_retries=0)
+
+    tools = await connection.list_tools()
+    print(f"📋 Loaded {len(tools)} tools from MCP server")
+
+    if limits and isinstance(connection, StdioServerPool):
+        limits.pool = connection
+
+    if shard:
+        print(f"📋 Running shard {shard[0]}/{shard[1]}")
+    if sampler:
+        sampler.start()
+    try:
+        results = await evaluate_tasks(
+            client, eval_path, connection, tools, model, concurrency, shard, scheduler, limiter, limits
+        )
+    finally:
+        if sampler:
+            await sampler.stop()
+    print(f"📋 Evaluated {len(results)} evaluation tasks")
+
+    stats = {"Rate Limiting": scheduler.summary(), "Tool Responses": tool_response_stats(results)}
+    if limits:
+        stats["Limits"] = limits.summary()
+    if isinstance(connection, StdioServerPool):
+        stats["Server Pool"] = connection.summary()
+    if getattr(connection, "cache", None):
+        stats["Tool Cache"] = connection.cache.summary()
+    extra = {}
+    if sampler:
+        stats["Server Resources"] = sampler.summary(sum(r["num_tool_calls"] for r in results))
+        extra["resource_samples"] = sampler.time_series()
+    if results_path:
+        save_results(
+            results_path, results, eval_file=Path(eval_path).name, model=model, shard=shard, stats=stats, **extra
+        )
+        print(f"💾 Results saved to {results_path}")
+
+    return build_report(results, stats)
+
+
+MATRIX_HEADER = """
+# Evaluation Matrix Report
+
+| Server | Model | Accuracy | Avg Duration | p50 / p95 Duration | Avg Tool Calls | Avg Tool Latency |
+|---|---|---|---|---|---|---|
+"""
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+def build_matrix_report(runs: list[dict[str, Any]], stats: dict[str, dict[str, Any]] | None = None) -> str:
+    """Format one row of accuracy and latency per (server, model) run."""
+    rows = []
+    for run in runs:
+        if run.get("error"):
+            rows.append(f"| {run['server']} | {run['model']} | ⚠️ {run['error']} | | | | |")
+            continue
+        results = run["results"]
+        total = len(results)
+        correct = sum(r["score"] for r in results)
+        durations = [r["total_duration"] for r in results]
+        tool_durations = [d for r in results for m in r["tool_calls"].values() for d in m["durations"]]
+        rows.append(
+            f"| {run['server']} | {run['model']} "
+            f"| {correct}/{total} ({correct / total * 100 if total else 0:.1f}%) "
+            f"| {sum(durations) / total if total else 0:.2f}s "
+            f"| {_percentile(durations, 0.5):.2f}s / {_percentile(durations, 0.95):.2f}s "
+            f"| {sum(r['num_tool_calls'] for r in results) / total if total else 0:.2f} "
+            f"| {sum(tool_durations) / len(tool_durations) * 1000 if tool_durations else 0:.0f}ms |"
+        )
+    report = MATRIX_HEADER + "\n".join(rows) + "\n\n---\n"
+    report += "".join(format_stats_section(title, section) for title, section in (stats or {}).items())
+    return report
+
+
+async def run_matrix(
+    eval_path: Path,
+    servers: dict[str, dict[str, Any]],
+    models: list[str],
+    concurrency: int = 1,
+    shard: tuple[int, int] | None = None,
+    results_dir: Path | None = None,
+    scheduler: RateLimitScheduler | None = None,
+    limiter: ToolResponseLimiter | None = None,
+    cache_options: dict[str, Any] | None = None,
+    limits: TaskLimits | None = None,
+    sampler: ProcessSampler | None = None,
+) -> str:
+    """Evaluate every (server, model) pair concurrently in this process.
+
+    `servers` maps names to create_connection keyword arguments (see
+    mcp_config.load_mcp_servers). Each server is connected once and shared
+    by all models; one client and one scheduler serve every run. Servers
+    that fail to start are reported instead of aborting the others. With
+    `cache_options`, each server gets its own ToolResultCache built from them.
+    `sampler` covers the processes of all stdio servers together.
+    """
+    print(f"🚀 Starting Evaluation Matrix: {len(servers)} server(s) x {len(models)} model(s)")
+
+    if scheduler is None:
+        scheduler = RateLimitScheduler(max_concurrency=concurrency * len(servers) * len(models))
+    client = Anthropic(max_retries=0)
+
+    async def run_one(server, model, connection, tools):
+        results = await evaluate_tasks(
+            client, eval_path, connection, tools, model, concurrency, shard, scheduler, limiter, limits
+        )
+        if results_dir:
+            save_results(
+                Path(results_dir) / f"{server}__{model.replace('/', '_')}.json",
+                results,
+                eval_file=Path(eval_path).name,
+                server=server,
+                model=model,
+                shard=shard,
+            )
+        print(f"📋 {server} / {model}: evaluated {len(results)} tasks")
+        return {"server": server, "model": model, "results": results}
+
+    async with AsyncExitStack() as stack:
+        runs = []
+        pending = []
+        caches = {}
+        for name, kwargs in servers.items():
+            if cache_options is not None:
+                caches[name] = ToolResultCache(**cache_options)
+            try:
+                connection = await stack.enter_async_context(create_connection(**kwargs, cache=caches.get(name)))
+                tools = await connection.list_tools()
+            except Exception as e:
+                print(f"⚠️  {name}: could not connect: {e}")
+                runs.extend({"server": name, "model": model, "error": f"connection failed: {e}"} for model in models)
+                continue
+            print(f"✅ {name}: connected, {len(tools)} tools")
+            pending.extend(run_one(name, model, connection, tools) for model in models)
+        if results_dir:
+            Path(results_dir).mkdir(parents=True, exist_ok=True)
+        if sampler:
+            sampler.start()
+        try:
+            runs.extend(await asyncio.gather(*pending))
+        finally:
+            if sampler:
+                await sampler.stop()
+
+    runs.sort(key=lambda run: (list(servers).index(run["server"]), models.index(run["model"])))
+    results = [r for run in runs for r in run.get("results", [])]
+    stats = {"Rate Limiting": scheduler.summary(), "Tool Responses": tool_response_stats(results)}
+    if limits:
+        stats["Limits"] = limits.summary()
+    if sampler:
+        stats["Server Resources"] = sampler.summary(sum(r["num_tool_calls"] for r in results))
+    stats.update((f"Tool Cache: {name}", cache.summary()) for name, cache in caches.items())
+    return build_matrix_report(runs, stats)
+
+
 def parse_headers(header_list: list[str]) -> dict[str, str]:
     """Parse header strings in format 'Key: Value' into a dictionary."""
     headers = {}
@@ -287,6 +1002,18 @@ def parse_headers(header_list: list[str]) -> dict[str, str]:
     return headers
 
 
+def parse_cache_tools(tool_list: list[str] | None) -> dict[str, float | None]:
+    """Parse 'TOOL' or 'TOOL=TTL' entries into {tool: ttl or None}."""
+    tools = {}
+    for entry in tool_list or []:
+        name, _, ttl = entry.partition("=")
+        try:
+            tools[name.strip()] = float(ttl) if ttl else None
+        except ValueError:
+            raise ValueError(f"Invalid cache TTL in '{entry}', expected TOOL=SECONDS")
+    return tools
+
+
 def parse_env_vars(env_list: list[str]) -> dict[str, str]:
     """Parse environment variable strings in format 'KEY=VALUE' into a dictionary."""
     env = {}
@@ -316,10 +1043,17 @@ Examples:
 
   # Evaluate an HTTP MCP server with custom model
   python evaluation.py -t http -u https://example.com/mcp -m claude-3-5-sonnet-20241022 eval.xml
+
+  # Split a large suite across 4 workers, then merge the shard results
+  python evaluation.py -c python -a my_server.py --shard 1/4 eval.jsonl   # ... through 4/4
+  python evaluation.py merge eval.shard-*-of-4.json -o report.md
+
+  # Compare every MCP server in an agent config across two models
+  python evaluation.py --config ../../../opencode.jsonc --servers time context7 --models claude-sonnet-4-5 claude-haiku-4-5 eval.xml
         """,
     )
 
-    parser.add_argument("eval_file", type=Path, help="Path to evaluation XML file")
+    parser.add_argument("eval_file", type=Path, help="Path to evaluation XML or JSONL file")
     parser.add_argument("-t", "--transport", choices=["stdio", "sse", "http"], default="stdio", help="Transport type (default: stdio)")
     parser.add_argument("-m", "--model", default="claude-3-7-sonnet-20250219", help="Claude model to use (default: claude-3-7-sonnet-20250219)")
 
@@ -327,11 +1061,45 @@ Examples:
     stdio_group.add_argument("-c", "--command", help="Command to run MCP server (stdio only)")
     stdio_group.add_argument("-a", "--args", nargs="+", help="Arguments for the command (stdio only)")
     stdio_group.add_argument("-e", "--env", nargs="+", help="Environment variables in KEY=VALUE format (stdio only)")
+    stdio_group.add_argument("--warm-spares", type=int, help="Give each task its own server from a pool of this many pre-started servers (stdio only)")
+    stdio_group.add_argument("--recycle-after", type=int, default=1, help="Restart a pooled server after this many tasks (default: 1, a fresh server per task)")
 
     remote_group = parser.add_argument_group("sse/http options")
     remote_group.add_argument("-u", "--url", help="MCP server URL (sse/http only)")
     remote_group.add_argument("-H", "--header", nargs="+", dest="headers", help="HTTP headers in 'Key: Value' format (sse/http only)")
 
+    matrix_group = parser.add_argument_group("server matrix")
+    matrix_group.add_argument("--config", type=Path, help="Agent config listing MCP servers (zcode config.json or opencode.jsonc); evaluates each server instead of -t/-c/-u")
+    matrix_group.add_argument("--servers", nargs="+", help="Servers from --config to evaluate (default: all enabled)")
+    matrix_group.add_argument("--models", nargs="+", help="Models to evaluate against every server (default: --model)")
+
+    parser.add_argument("-j", "--concurrency", type=int, default=1, help="Number of tasks to run at once (default: 1; per server and model with --config)")
+    rate_group = parser.add_argument_group("rate limiting")
+    rate_group.add_argument("--rpm", type=float, help="Maximum model requests per minute (default: unlimited)")
+    rate_group.add_argument("--input-tpm", type=float, help="Maximum estimated input tokens per minute (default: unlimited)")
+    rate_group.add_argument("--max-retries", type=int, default=6, help="Retries per model call on 429/overloaded/5xx errors (default: 6)")
+
+    response_group = parser.add_argument_group("tool responses")
+    response_group.add_argument("--max-tool-response-bytes", type=int, help="Truncate longer tool responses, keeping head and tail")
+    response_group.add_argument("--max-tool-response-tokens", type=int, help="Same as --max-tool-response-bytes, estimated at 4 bytes per token")
+    response_group.add_argument("--spill-dir", type=Path, help="Save the full text of truncated tool responses (and images left out) here")
+
+    cache_group = parser.add_argument_group("tool result cache")
+    cache_group.add_argument("--cache", action="store_true", help="Reuse results of repeated identical calls to tools the server marks read-only or idempotent")
+    cache_group.add_argument("--cache-tools", nargs="+", metavar="TOOL[=TTL]", help="Also cache these tools, optionally with their own TTL in seconds")
+    cache_group.add_argument("--cache-ttl", type=float, default=300.0, help="Seconds a cached result stays valid (default: 300)")
+    cache_group.add_argument("--cache-size", type=int, default=1024, help="Maximum cached results (default: 1024)")
+
+    limits_group = parser.add_argument_group("task limits")
+    limits_group.add_argument("--task-timeout", type=float, help="Give up on a task after this many seconds and mark it timed out")
+    limits_group.add_argument("--tool-timeout", type=float, help="Fail a single tool call after this many seconds; the model sees an error")
+    limits_group.add_argument("--max-turns", type=int, help="Stop a task after this many model calls")
+    limits_group.add_argument("--hedge-after", type=float, help="Re-send read-only/idempotent tool calls slower than this to a spare pooled server (needs --warm-spares 2+)")
+
+    parser.add_argument("--sample-resources", type=float, nargs="?", const=1.0, metavar="INTERVAL", help="Sample CPU, memory, threads and open files of stdio server processes every INTERVAL seconds (default: 1; Linux only)")
+    parser.add_argument("--trace", type=Path, help="Write a Chrome trace / Perfetto timeline of the run to this JSON file")
+    parser.add_argument("--shard", type=parse_shard, help="Run only shard i of N (e.g. 1/4); results go to --results")
+    parser.add_argument("-r", "--results", type=Path, help="Save raw task results as JSON (default with --shard: <eval>.shard-<i>-of-<N>.json; a directory with --config)")
     parser.add_argument("-o", "--output", type=Path, help="Output file for evaluation report (default: stdout)")
 
     args = parser.parse_args()
@@ -340,18 +1108,139 @@ Examples:
         print(f"Error: Evaluation file not found: {args.eval_file}")
         sys.exit(1)
 
+    if args.shard and not args.results:
+        suffix = "" if args.config else ".json"
+        args.results = Path(f"{args.eval_file.stem}.shard-{args.shard[0]}-of-{args.shard[1]}{suffix}")
+
+    servers = None
+    models = args.models or [args.model]
+    if args.config:
+        try:
+            servers = load_mcp_servers(args.config)
+        except (OSError, ValueError) as e:
+            print(f"Error: Could not read MCP servers from {args.config}: {e}")
+            sys.exit(1)
+        if args.servers:
+            unknown = [name for name in args.servers if name not in servers]
+            if unknown:
+                print(f"Error: Unknown or disabled server(s) in {args.config}: {', '.join(unknown)}")
+                sys.exit(1)
+            servers = {name: servers[name] for name in args.servers}
+
+    scheduler = RateLimitScheduler(
+        max_concurrency=args.concurrency * (len(servers) * len(models) if servers else 1),
+        requests_per_minute=args.rpm,
+        input_tokens_per_minute=args.input_tpm,
+        max_retries=args.max_retries,
+    )
+
+    caps = [args.max_tool_response_bytes, args.max_tool_response_tokens and args.max_tool_response_tokens * 4]
+    caps = [cap for cap in caps if cap]
+    limiter = ToolResponseLimiter(max_bytes=min(caps), spill_dir=args.spill_dir) if caps else None
+
+    cache_options = None
+    if args.cache or args.cache_tools:
+        try:
+            cache_options = {
+                "tools": parse_cache_tools(args.cache_tools),
+                "use_annotations": args.cache,
+                "ttl": args.cache_ttl,
+                "max_entries": args.cache_size,
+            }
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+    if args.hedge_after is not None and not args.warm_spares:
+        print("Error: --hedge-after needs a server pool (--warm-spares)")
+        sys.exit(1)
+    limits = None
+    if any(value is not None for value in (args.task_timeout, args.tool_timeout, args.max_turns, args.hedge_after)):
+        limits = TaskLimits(args.task_timeout, args.tool_timeout, args.max_turns, args.hedge_after)
+
+    sampler = None
+    if args.sample_resources:
+        if ProcessSampler.available():
+            sampler = ProcessSampler(args.sample_resources)
+        else:
+            print("⚠️  --sample-resources needs /proc (Linux); not sampling")
+
+    if args.trace:
+        start_tracing()
+    try:
+        await _run_main(args, servers, models, scheduler, limiter, cache_options, limits, sampler)
+    except Exception as e:
+        error = _find_exception(e, EvaluationFileError)
+        if error is None:
+            raise
+        print(f"Error: {error}")
+        sys.exit(1)
+    finally:
+        tracer = stop_tracing()
+        if tracer:
+            tracer.write(args.trace)
+            print(f"🧭 Trace saved to {args.trace} (open in https://ui.perfetto.dev or chrome://tracing)")
+
+
+def _find_exception(error: BaseException, error_type: type) -> BaseException | None:
+    """Find an `error_type` in `error`, looking inside exception groups (which
+    the MCP client's task groups wrap errors raised in their scope in)."""
+    if isinstance(error, error_type):
+        return error
+    for inner in getattr(error, "exceptions", ()):
+        found = _find_exception(inner, error_type)
+        if found is not None:
+            return found
+    return None
+
+
+async def _run_main(args, servers, models, scheduler, limiter, cache_options, limits, sampler) -> None:
+    if servers is not None:
+        report = await run_matrix(
+            args.eval_file,
+            servers,
+            models,
+            args.concurrency,
+            shard=args.shard,
+            results_dir=args.results,
+            scheduler=scheduler,
+            limiter=limiter,
+            cache_options=cache_options,
+            limits=limits,
+            sampler=sampler,
+        )
+        if args.output:
+            args.output.write_text(report)
+            print(f"\n✅ Report saved to {args.output}")
+        else:
+            print("\n" + report)
+        return
+
     headers = parse_headers(args.headers) if args.headers else None
     env_vars = parse_env_vars(args.env) if args.env else None
 
     try:
-        connection = create_connection(
-            transport=args.transport,
-            command=args.command,
-            args=args.args,
-            env=env_vars,
-            url=args.url,
-            headers=headers,
-        )
+        if args.warm_spares and args.transport == "stdio":
+            if not args.command:
+                raise ValueError("Command is required for stdio transport")
+            connection = StdioServerPool(
+                args.command,
+                args.args,
+                env_vars,
+                size=args.warm_spares,
+                max_uses=args.recycle_after,
+                cache=ToolResultCache(**cache_options) if cache_options else None,
+            )
+        else:
+            connection = create_connection(
+                transport=args.transport,
+                command=args.command,
+                args=args.args,
+                env=env_vars,
+                url=args.url,
+                headers=headers,
+                cache=ToolResultCache(**cache_options) if cache_options else None,
+            )
     except ValueError as e:
         print(f"Error: {e}")
         sys.exit(1)
@@ -360,7 +1249,18 @@ Examples:
 
     async with connection:
         print("✅ Connected successfully")
-        report = await run_evaluation(args.eval_file, connection, args.model)
+        report = await run_evaluation(
+            args.eval_file,
+            connection,
+            args.model,
+            args.concurrency,
+            shard=args.shard,
+            results_path=args.results,
+            scheduler=scheduler,
+            limiter=limiter,
+            limits=limits,
+            sampler=sampler,
+        )
 
         if args.output:
             args.output.write_text(report)
@@ -369,5 +1269,303 @@ Examples:
             print("\n" + report)
 
 
+def merge_main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="evaluation.py merge",
+        description="Merge shard results files into one evaluation report",
+    )
+    parser.add_argument("results_files", type=Path, nargs="+", help="Results files written with --shard/--results")
+    parser.add_argument("-r", "--results", type=Path, help="Also save the merged raw results as JSON")
+    parser.add_argument("-o", "--output", type=Path, help="Output file for evaluation report (default: stdout)")
+    args = parser.parse_args(argv)
+
+    try:
+        results = merge_results(args.results_files)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(f"📋 Merged {len(results)} tasks from {len(args.results_files)} results file(s)")
+
+    if args.results:
+        eval_file = load_results(args.results_files[0]).get("eval_file")
+        save_results(args.results, results, eval_file=eval_file, shard=None)
+        print(f"💾 Results saved to {args.results}")
+
+    report = build_report(results, {"Tool Responses": tool_response_stats(results)})
+    if args.output:
+        args.output.write_text(report)
+        print(f"\n✅ Report saved to {args.output}")
+    else:
+        print("\n" + report)
+
+
+COMPARISON_HEADER = """
+# Evaluation Comparison
+
+- **Baseline**: {baseline} ({baseline_tasks} tasks, accuracy {baseline_accuracy:.1f}%)
+- **Candidate**: {candidate} ({candidate_tasks} tasks, accuracy {candidate_accuracy:.1f}%)
+- **Regression threshold**: +{threshold:g}% with {confidence:g}% confidence ({resamples} bootstrap resamples)
+- **Verdict**: {verdict}
+
+---
+"""
+
+
+def _mean(values: list[float]) -> float:
+    return sum(values) / len(values)
+
+
+def _percent_change(baseline: float, candidate: float) -> float:
+    return (candidate / baseline - 1) * 100 if baseline else 0.0
+
+
+def bootstrap_change_ci(
+    baseline: list[float],
+    candidate: list[float],
+    paired: bool = False,
+    resamples: int = 2000,
+    confidence: float = 0.95,
+    rng: random.Random | None = None,
+) -> tuple[float, float]:
+    """Percentile bootstrap CI of the % change in mean from `baseline` to `candidate`.
+
+    With `paired`, the i-th values belong together (the same task in both
+    runs) and are resampled together; otherwise each side is resampled on
+    its own.
+    """
+    rng = rng or random.Random(0)
+    changes = []
+    if paired:
+        indices = range(len(baseline))
+        for _ in range(resamples):
+            sample = rng.choices(indices, k=len(baseline))
+            changes.append(_percent_change(sum(baseline[i] for i in sample), sum(candidate[i] for i in sample)))
+    else:
+        for _ in range(resamples):
+            changes.append(_percent_change(
+                _mean(rng.choices(baseline, k=len(baseline))),
+                _mean(rng.choices(candidate, k=len(candidate))),
+            ))
+    changes.sort()
+    tail = (1 - confidence) / 2
+    return changes[int(tail * (resamples - 1))], changes[int((1 - tail) * (resamples - 1))]
+
+
+def _latency_delta(
+    baseline: list[float],
+    candidate: list[float],
+    paired: bool,
+    threshold: float,
+    resamples: int,
+    confidence: float,
+    rng: random.Random,
+) -> dict[str, Any]:
+    low, high = bootstrap_change_ci(baseline, candidate, paired, resamples, confidence, rng)
+    change = _percent_change(_mean(baseline), _mean(candidate))
+    if low > 0 and change > threshold:
+        verdict = "regression"
+    elif low > 0:
+        verdict = "slower"
+    elif high < 0:
+        verdict = "faster"
+    else:
+        verdict = "no change"
+    return {
+        "baseline_mean_s": _mean(baseline),
+        "candidate_mean_s": _mean(candidate),
+        "change_percent": change,
+        "ci_low_percent": low,
+        "ci_high_percent": high,
+        "verdict": verdict,
+    }
+
+
+def compare_results(
+    baseline: list[dict[str, Any]],
+    candidate: list[dict[str, Any]],
+    threshold: float = 10.0,
+    confidence: float = 0.95,
+    resamples: int = 2000,
+    min_samples: int = 5,
+    seed: int = 0,
+) -> dict[str, Any]:
+    """Compare the latency of two result sets for the same evaluation file.
+
+    Tasks are paired by task index (and must ask the same question).
+    Overall task duration uses a paired bootstrap; each tool's call
+    durations are compared with an unpaired one. A change is a regression
+    when the candidate is slower with the given confidence and by more than
+    `threshold` percent. Tools with fewer than `min_samples` calls in either
+    run are listed but never flagged.
+    """
+    rng = random.Random(seed)
+    baseline_tasks = {r["task_index"]: r for r in baseline}
+    candidate_tasks = {r["task_index"]: r for r in candidate}
+    common = sorted(
+        i for i in baseline_tasks.keys() & candidate_tasks.keys()
+        if baseline_tasks[i]["question"] == candidate_tasks[i]["question"]
+    )
+
+    tasks = [
+        {
+            "task_index": i,
+            "baseline_s": baseline_tasks[i]["total_duration"],
+            "candidate_s": candidate_tasks[i]["total_duration"],
+            "change_percent": _percent_change(baseline_tasks[i]["total_duration"], candidate_tasks[i]["total_duration"]),
+            "baseline_tool_calls": baseline_tasks[i]["num_tool_calls"],
+            "candidate_tool_calls": candidate_tasks[i]["num_tool_calls"],
+        }
+        for i in common
+    ]
+    overall = None
+    if len(common) >= 2:
+        overall = _latency_delta(
+            [t["baseline_s"] for t in tasks], [t["candidate_s"] for t in tasks],
+            True, threshold, resamples, confidence, rng,
+        )
+
+    def tool_durations(results):
+        durations = {}
+        for r in results:
+            for name, metrics in r["tool_calls"].items():
+                durations.setdefault(name, []).extend(metrics["durations"])
+        return durations
+
+    baseline_tools = tool_durations(baseline_tasks[i] for i in common)
+    candidate_tools = tool_durations(candidate_tasks[i] for i in common)
+    tools = {}
+    for name in sorted(baseline_tools.keys() | candidate_tools.keys()):
+        b, c = baseline_tools.get(name, []), candidate_tools.get(name, [])
+        if len(b) >= min_samples and len(c) >= min_samples:
+            tools[name] = _latency_delta(b, c, False, threshold, resamples, confidence, rng)
+        else:
+            tools[name] = {"verdict": "too few calls"}
+        tools[name].update(baseline_calls=len(b), candidate_calls=len(c))
+
+    regressions = [name for name, delta in tools.items() if delta["verdict"] == "regression"]
+    if overall and overall["verdict"] == "regression":
+        regressions.insert(0, "task duration")
+    return {
+        "matched_tasks": len(common),
+        "unmatched_tasks": len(baseline_tasks.keys() | candidate_tasks.keys()) - len(common),
+        "overall": overall,
+        "tools": tools,
+        "tasks": tasks,
+        "regressions": regressions,
+    }
+
+
+def _format_delta_row(label: str, delta: dict[str, Any], calls: str = "") -> str:
+    if "change_percent" not in delta:
+        return f"| {label} | {calls} | - | - | - | - | {delta['verdict']} |"
+    marker = {"regression": "🔺 ", "faster": "✅ "}.get(delta["verdict"], "")
+    return (
+        f"| {label} | {calls} | {delta['baseline_mean_s']:.3f}s | {delta['candidate_mean_s']:.3f}s "
+        f"| {delta['change_percent']:+.1f}% | [{delta['ci_low_percent']:+.1f}%, {delta['ci_high_percent']:+.1f}%] "
+        f"| {marker}{delta['verdict']} |"
+    )
+
+
+def build_comparison_report(
+    comparison: dict[str, Any],
+    baseline: list[dict[str, Any]],
+    candidate: list[dict[str, Any]],
+    names: tuple[str, str],
+    threshold: float,
+    confidence: float,
+    resamples: int,
+    top: int = 10,
+) -> str:
+    """Format compare_results output as a Markdown report."""
+    def accuracy(results):
+        return sum(r["score"] for r in results) / len(results) * 100 if results else 0
+
+    regressions = comparison["regressions"]
+    report = COMPARISON_HEADER.format(
+        baseline=names[0],
+        baseline_tasks=len(baseline),
+        baseline_accuracy=accuracy(baseline),
+        candidate=names[1],
+        candidate_tasks=len(candidate),
+        candidate_accuracy=accuracy(candidate),
+        threshold=threshold,
+        confidence=confidence * 100,
+        resamples=resamples,
+        verdict=f"❌ regression in {', '.join(regressions)}" if regressions else "✅ no significant regression",
+    )
+
+    table_header = "| {} | Calls | Baseline mean | Candidate mean | Change | {:g}% CI | Verdict |\n|---|---|---|---|---|---|---|\n"
+    report += f"\n## Task Duration\n\n{comparison['matched_tasks']} matched tasks"
+    if comparison["unmatched_tasks"]:
+        report += f" ({comparison['unmatched_tasks']} only in one run, ignored)"
+    report += "\n\n"
+    if comparison["overall"]:
+        report += table_header.format("", confidence * 100)
+        report += _format_delta_row("All tasks", comparison["overall"]) + "\n"
+
+    if comparison["tools"]:
+        report += "\n## Tools\n\n" + table_header.format("Tool", confidence * 100)
+        report += "\n".join(
+            _format_delta_row(name, delta, f"{delta['baseline_calls']} → {delta['candidate_calls']}")
+            for name, delta in comparison["tools"].items()
+        ) + "\n"
+
+    changed = sorted(comparison["tasks"], key=lambda t: abs(t["candidate_s"] - t["baseline_s"]), reverse=True)[:top]
+    if changed:
+        report += f"\n## Largest Task Changes\n\n| Task | Baseline | Candidate | Change | Tool calls |\n|---|---|---|---|---|\n"
+        report += "\n".join(
+            f"| {t['task_index'] + 1} | {t['baseline_s']:.2f}s | {t['candidate_s']:.2f}s | {t['change_percent']:+.1f}% "
+            f"| {t['baseline_tool_calls']} → {t['candidate_tool_calls']} |"
+            for t in changed
+        ) + "\n"
+    return report
+
+
+def compare_main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="evaluation.py compare",
+        description="Compare the latency of two evaluation results files; exits 1 on a significant regression",
+    )
+    parser.add_argument("baseline", type=Path, help="Results file from the reference run")
+    parser.add_argument("candidate", type=Path, help="Results file from the run to check")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Slowdown in percent that counts as a regression (default: 10)")
+    parser.add_argument("--confidence", type=float, default=0.95, help="Confidence level for the bootstrap intervals (default: 0.95)")
+    parser.add_argument("--resamples", type=int, default=2000, help="Bootstrap resamples (default: 2000)")
+    parser.add_argument("--min-samples", type=int, default=5, help="Calls a tool needs in each run to be judged (default: 5)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for resampling (default: 0)")
+    parser.add_argument("-o", "--output", type=Path, help="Output file for the comparison report (default: stdout)")
+    args = parser.parse_args(argv)
+
+    try:
+        baseline_data, candidate_data = load_results(args.baseline), load_results(args.candidate)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(2)
+    if baseline_data.get("eval_file") != candidate_data.get("eval_file"):
+        print(f"Error: Results come from different evaluation files: "
+              f"{baseline_data.get('eval_file')} and {candidate_data.get('eval_file')}")
+        sys.exit(2)
+
+    baseline, candidate = baseline_data["results"], candidate_data["results"]
+    comparison = compare_results(
+        baseline, candidate, args.threshold, args.confidence, args.resamples, args.min_samples, args.seed
+    )
+    report = build_comparison_report(
+        comparison, baseline, candidate, (args.baseline.name, args.candidate.name),
+        args.threshold, args.confidence, args.resamples,
+    )
+    if args.output:
+        args.output.write_text(report)
+        print(f"✅ Report saved to {args.output}")
+    else:
+        print(report)
+    sys.exit(1 if comparison["regressions"] else 0)
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    if sys.argv[1:2] == ["merge"]:
+        merge_main(sys.argv[2:])
+    elif sys.argv[1:2] == ["compare"]:
+        compare_main(sys.argv[2:])
+    else:
+        asyncio.run(main())
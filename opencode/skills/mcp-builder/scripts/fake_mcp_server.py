@@ -0,0 +1,160 @@
+"""Minimal stdio MCP server with synthetic tools, for offline harness tests.
+
+Speaks just enough JSON-RPC (initialize, ping, tools/list, tools/call) that
+MCPConnectionStdio can connect to it, without depending on the MCP server
+SDK, so its own start-up and per-call cost stay negligible.
+
+Like the SDK servers, it honours notifications/cancelled: a cancelled
+request is skipped, or left unanswered if it was already running.
+--ignore-cancellation turns that off, to test clients against servers
+that answer requests nobody is waiting for any more.
+
+Tools:
+    lookup(query)  Returns --response-bytes of text about the query
+    echo(text)     Returns its input
+    snapshot(name) Returns a caption and a --image-bytes PNG that depends only on name
+
+Usage:
+    python fake_mcp_server.py [--response-bytes 200] [--image-bytes 20000] [--latency 0] [--startup-delay 0]
+                              [--ignore-cancellation]
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import queue
+import sys
+import threading
+import time
+
+TOOLS = [
+    {
+        "name": "lookup",
+        "description": "Look up a record by query and return its details.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {"query": {"type": "string", "description": "What to look up"}},
+            "required": ["query"],
+        },
+        "annotations": {"readOnlyHint": True, "idempotentHint": True},
+    },
+    {
+        "name": "echo",
+        "description": "Return the given text unchanged.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {"text": {"type": "string"}},
+            "required": ["text"],
+        },
+        "annotations": {"readOnlyHint": True, "idempotentHint": True},
+    },
+    {
+        "name": "snapshot",
+        "description": "Return a screenshot of the named page.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {"name": {"type": "string", "description": "Page to capture"}},
+            "required": ["name"],
+        },
+        "annotations": {"readOnlyHint": True, "idempotentHint": True},
+    },
+]
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+class MethodNotFound(Exception):
+    """The request names a JSON-RPC method this server does not implement."""
+
+
+def snapshot_content(name, image_bytes):
+    seed = hashlib.sha256(name.encode()).digest()
+    data = PNG_SIGNATURE + (seed * (image_bytes // len(seed) + 1))[:max(image_bytes - len(PNG_SIGNATURE), 0)]
+    return [
+        {"type": "text", "text": f"Screenshot of {name}"},
+        {"type": "image", "data": base64.b64encode(data).decode(), "mimeType": "image/png"},
+    ]
+
+
+def call_tool(name, arguments, response_bytes):
+    if name == "echo":
+        return str(arguments.get("text", ""))
+    if name == "lookup":
+        line = f"record for {arguments.get('query', '')}: "
+        return (line * (response_bytes // max(len(line), 1) + 1))[:response_bytes]
+    raise KeyError(name)
+
+
+def handle(message, args):
+    method = message.get("method")
+    params = message.get("params") or {}
+    if method == "initialize":
+        return {
+            "protocolVersion": params.get("protocolVersion", "2024-11-05"),
+            "capabilities": {"tools": {}},
+            "serverInfo": {"name": "fake-mcp-server", "version": "1.0.0"},
+        }
+    if method == "ping":
+        return {}
+    if method == "tools/list":
+        return {"tools": TOOLS}
+    if method == "tools/call":
+        if args.latency:
+            time.sleep(args.latency)
+        if params.get("name") == "snapshot":
+            content = snapshot_content(str((params.get("arguments") or {}).get("name", "")), args.image_bytes)
+            return {"content": content, "isError": False}
+        try:
+            text = call_tool(params.get("name"), params.get("arguments") or {}, args.response_bytes)
+        except KeyError:
+            return {"content": [{"type": "text", "text": f"Unknown tool: {params.get('name')}"}], "isError": True}
+        return {"content": [{"type": "text", "text": text}], "isError": False}
+    raise MethodNotFound(method)
+
+
+def read_messages(messages, cancelled):
+    """Read stdin on a thread, so cancellations arrive while a call runs."""
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        message = json.loads(line)
+        if message.get("method") == "notifications/cancelled":
+            cancelled.add((message.get("params") or {}).get("requestId"))
+            continue
+        messages.put(message)
+    messages.put(None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve synthetic MCP tools over stdio")
+    parser.add_argument("--response-bytes", type=int, default=200, help="Size of each lookup result (default: 200)")
+    parser.add_argument("--image-bytes", type=int, default=20000, help="Size of each snapshot image (default: 20000)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait in each tool call (default: 0)")
+    parser.add_argument("--startup-delay", type=float, default=0.0, help="Seconds to wait before serving, like a cold npx/uvx start (default: 0)")
+    parser.add_argument("--ignore-cancellation", action="store_true", help="Answer requests even after the client cancelled them")
+    args = parser.parse_args()
+
+    if args.startup_delay:
+        time.sleep(args.startup_delay)
+
+    messages = queue.Queue()
+    cancelled = set()
+    threading.Thread(target=read_messages, args=(messages, cancelled), daemon=True).start()
+    while (message := messages.get()) is not None:
+        if "id" not in message:
+            continue  # notifications need no reply
+        if message["id"] in cancelled and not args.ignore_cancellation:
+            continue
+        try:
+            reply = {"jsonrpc": "2.0", "id": message["id"], "result": handle(message, args)}
+        except MethodNotFound as e:
+            reply = {"jsonrpc": "2.0", "id": message["id"], "error": {"code": -32601, "message": f"Method not found: {e}"}}
+        if message["id"] in cancelled and not args.ignore_cancellation:
+            continue  # cancelled while running: no reply
+        sys.stdout.write(json.dumps(reply) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""Local stand-in for the Anthropic Messages API.
+
+Answers POST /v1/messages from a script so the evaluation harness can run
+offline: by default --tool-calls tool_use turns followed by a final
+<response>, or the steps of a --script JSON file, e.g.
+
+    [{"tool": "lookup", "input": {"query": "users"}}, {"text": "<response>42</response>"}]
+
+The step is chosen by how many assistant turns the conversation already
+has. It can also inject 429 rate-limit errors (randomly, and whenever more
+than --max-concurrent requests are in flight) to exercise retries and
+adaptive concurrency.
+
+Usage:
+    python fake_messages_api.py --port 8765 --tool-calls 2 --latency 0.2
+    python fake_messages_api.py --port 8765 --throttle-rate 0.1 --max-concurrent 4
+
+    ANTHROPIC_BASE_URL=http://127.0.0.1:8765 ANTHROPIC_API_KEY=fake \\
+        python evaluation.py -c python -a my_server.py -j 16 eval.xml
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_ANSWER = "NOT_FOUND"
+
+
+class FakeMessagesAPI(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address,
+        throttle_rate=0.0,
+        max_concurrent=None,
+        retry_after=1.0,
+        latency=0.0,
+        answer=DEFAULT_ANSWER,
+        seed=None,
+        tool_calls=0,
+        tool_name="lookup",
+        script=None,
+    ):
+        super().__init__(address, FakeMessagesHandler)
+        self.throttle_rate = throttle_rate
+        self.max_concurrent = max_concurrent
+        self.retry_after = retry_after
+        self.latency = latency
+        self.script = script or [
+            {"tool": tool_name, "input": {"query": f"step {i + 1}"}} for i in range(tool_calls)
+        ] + [{"text": f"<summary>Answered by the fake API.</summary>"
+                      f"<feedback>None.</feedback><response>{answer}</response>"}]
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.stats = {"requests": 0, "throttled": 0, "max_in_flight": 0}
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def message(self, request):
+        turn = sum(1 for m in request.get("messages", []) if m.get("role") == "assistant")
+        step = self.script[min(turn, len(self.script) - 1)]
+        if "tool" in step:
+            content = [{
+                "type": "tool_use",
+                "id": f"toolu_fake_{self.stats['requests']}",
+                "name": step["tool"],
+                "input": step.get("input", {}),
+            }]
+            stop_reason = "tool_use"
+        else:
+            content = [{"type": "text", "text": step.get("text", "")}]
+            stop_reason = "end_turn"
+        return {
+            "id": f"msg_fake_{self.stats['requests']}",
+            "type": "message",
+            "role": "assistant",
+            "model": request.get("model", "fake"),
+            "content": content,
+            "stop_reason": stop_reason,
+            "stop_sequence": None,
+            "usage": {"input_tokens": len(json.dumps(request)) // 4, "output_tokens": 20},
+        }
+
+
+class FakeMessagesHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, body, headers=None):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        server = self.server
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if not self.path.startswith("/v1/messages"):
+            self._send_json(404, {"type": "error", "error": {"type": "not_found_error", "message": self.path}})
+            return
+
+        with server.lock:
+            server.stats["requests"] += 1
+            server.in_flight += 1
+            server.stats["max_in_flight"] = max(server.stats["max_in_flight"], server.in_flight)
+            throttle = server.random.random() < server.throttle_rate or (
+                server.max_concurrent is not None and server.in_flight > server.max_concurrent
+            )
+            if throttle:
+                server.stats["throttled"] += 1
+        try:
+            if throttle:
+                self._send_json(
+                    429,
+                    {"type": "error", "error": {"type": "rate_limit_error", "message": "Injected rate limit"}},
+                    {"retry-after": f"{server.retry_after:g}"},
+                )
+                return
+            if server.latency:
+                time.sleep(server.latency)
+            self._send_json(200, server.message(request))
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+
+def start_fake_api(host="127.0.0.1", port=0, **options):
+    """Start a FakeMessagesAPI on a background thread and return it."""
+    server = FakeMessagesAPI((host, port), **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a scripted fake Messages API for offline evaluation runs")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests answered with 429 (default: 0)")
+    parser.add_argument("--max-concurrent", type=int, help="Answer 429 whenever more requests than this are in flight")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="retry-after seconds sent with 429s (default: 1)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before each successful response")
+    parser.add_argument("--answer", default=DEFAULT_ANSWER, help="Text returned inside <response> tags")
+    parser.add_argument("--seed", type=int, help="Random seed for throttling")
+    parser.add_argument("--tool-calls", type=int, default=0, help="tool_use turns before the final answer (default: 0)")
+    parser.add_argument("--tool-name", default="lookup", help="Tool called in tool_use turns (default: lookup)")
+    parser.add_argument("--script", type=argparse.FileType(), help="JSON list of steps to play instead of --tool-calls")
+    args = parser.parse_args()
+
+    server = FakeMessagesAPI(
+        (args.host, args.port),
+        throttle_rate=args.throttle_rate,
+        max_concurrent=args.max_concurrent,
+        retry_after=args.retry_after,
+        latency=args.latency,
+        answer=args.answer,
+        seed=args.seed,
+        tool_calls=args.tool_calls,
+        tool_name=args.tool_name,
+        script=json.load(args.script) if args.script else None,
+    )
+    print(f"Fake Messages API listening on {server.url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps(server.stats))
+
+
+if __name__ == "__main__":
+    main()
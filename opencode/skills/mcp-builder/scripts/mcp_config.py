@@ -0,0 +1,107 @@
+"""Read MCP server definitions from agent config files.
+
+Supports the two layouts used in this repo:
+
+- zcode (`zcode/cli/config.json`): `mcp.servers.<name>` with `type`
+  stdio/sse/http, `command`, `args`, `env`, `url`, `headers`
+- opencode (`opencode/opencode.jsonc`): `mcp.<name>` with `type`
+  local/remote, `command` as a list, `environment`, `url`, `headers`
+
+`{env:NAME}` placeholders are filled from the environment and servers with
+`"enabled": false` are skipped. Each server becomes keyword arguments for
+`connections.create_connection`.
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any
+
+ENV_PLACEHOLDER = re.compile(r"\{env:([^}]+)\}")
+
+
+def _strip_jsonc(text: str) -> str:
+    """Remove // and /* */ comments and trailing commas outside strings."""
+    out = []
+    i = 0
+    in_string = False
+    while i < len(text):
+        char = text[i]
+        if in_string:
+            out.append(char)
+            if char == "\\":
+                out.append(text[i + 1:i + 2])
+                i += 1
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+            out.append(char)
+        elif text.startswith("//", i):
+            end = text.find("\n", i)
+            i = len(text) if end == -1 else end
+            continue
+        elif text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            i = len(text) if end == -1 else end + 2
+            continue
+        elif char == ",":
+            rest = text[i + 1:].lstrip()
+            # Comments were already dropped up to here, but one may still
+            # sit between this comma and the closing bracket.
+            while rest.startswith(("//", "/*")):
+                end = rest.find("\n") if rest.startswith("//") else rest.find("*/") + 1
+                rest = rest[end + 1:].lstrip() if end > 0 else ""
+            if not rest.startswith(("}", "]")):
+                out.append(char)
+        else:
+            out.append(char)
+        i += 1
+    return "".join(out)
+
+
+def _expand_env(value: Any) -> Any:
+    if isinstance(value, str):
+        return ENV_PLACEHOLDER.sub(lambda m: os.environ.get(m.group(1), ""), value)
+    if isinstance(value, list):
+        return [_expand_env(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _expand_env(v) for k, v in value.items()}
+    return value
+
+
+def _zcode_server(spec: dict[str, Any]) -> dict[str, Any]:
+    transport = spec.get("type", "stdio")
+    if transport == "stdio":
+        return {"transport": "stdio", "command": spec.get("command"), "args": spec.get("args"), "env": spec.get("env")}
+    return {"transport": transport, "url": spec.get("url"), "headers": spec.get("headers")}
+
+
+def _opencode_server(spec: dict[str, Any]) -> dict[str, Any]:
+    if spec.get("type", "local") == "local":
+        command = spec.get("command") or []
+        return {
+            "transport": "stdio",
+            "command": command[0] if command else None,
+            "args": command[1:],
+            "env": spec.get("environment"),
+        }
+    return {"transport": "http", "url": spec.get("url"), "headers": spec.get("headers")}
+
+
+def load_mcp_servers(config_path: Path) -> dict[str, dict[str, Any]]:
+    """Return {server name: create_connection kwargs} for enabled servers."""
+    config = json.loads(_strip_jsonc(Path(config_path).read_text()))
+    mcp = config.get("mcp") or {}
+    if isinstance(mcp.get("servers"), dict):
+        specs, convert = mcp["servers"], _zcode_server
+    else:
+        specs, convert = mcp, _opencode_server
+
+    servers = {}
+    for name, spec in specs.items():
+        if not isinstance(spec, dict) or spec.get("enabled") is False:
+            continue
+        servers[name] = _expand_env(convert(spec))
+    return servers
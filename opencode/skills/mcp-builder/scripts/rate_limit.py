@@ -0,0 +1,218 @@
+"""Rate-limit-aware scheduling for model calls made by the evaluation harness."""
+
+import asyncio
+import json
+import random
+import time
+from typing import Any, Callable
+
+from anthropic import APIConnectionError, APIStatusError
+
+from eval_trace import span
+
+# 429 is the API rate limit and 529 is "overloaded"; both mean "slow down"
+# rather than "this request is wrong".
+THROTTLE_STATUS_CODES = {429, 529}
+RETRYABLE_STATUS_CODES = THROTTLE_STATUS_CODES | {500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Async token bucket refilled continuously at `rate` tokens per second."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1) -> float:
+        """Take `amount` tokens, waiting until they are available. Returns seconds waited."""
+        # A request larger than the whole bucket could never be admitted;
+        # let it through once the bucket is full instead.
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        async with self._lock:
+            self._refill()
+            while self.tokens < amount:
+                delay = (amount - self.tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+                self._refill()
+            self.tokens -= amount
+        return waited
+
+    def drain(self) -> None:
+        """Empty the bucket after the server reported we are over the limit."""
+        self._refill()
+        self.tokens = 0.0
+
+
+def estimate_input_tokens(**request: Any) -> int:
+    """Roughly estimate a request's input tokens (about 4 characters per token)."""
+    def default(obj):
+        return obj.model_dump() if hasattr(obj, "model_dump") else str(obj)
+
+    size = sum(
+        len(json.dumps(request.get(key), default=default))
+        for key in ("system", "messages", "tools")
+        if request.get(key)
+    )
+    return size // 4 + 1
+
+
+def retry_after_seconds(error: APIStatusError) -> float | None:
+    """Read the server's requested delay from a throttling response, if any."""
+    headers = getattr(error.response, "headers", None) or {}
+    try:
+        if "retry-after-ms" in headers:
+            return float(headers["retry-after-ms"]) / 1000
+        if "retry-after" in headers:
+            return float(headers["retry-after"])
+    except ValueError:
+        pass
+    return None
+
+
+class RateLimitScheduler:
+    """Admission control and retries around blocking model API calls.
+
+    Every call first takes a concurrency slot, one request token and its
+    estimated input tokens. The concurrency limit adapts AIMD-style: it
+    grows by 1/limit per success and halves on throttling (at most once per
+    backoff window of `base_delay` or the server's retry-after, whichever is
+    longer, so a burst of 429s only counts once). Throttled and
+    transient failures are retried with full-jitter exponential backoff that
+    honours retry-after.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        min_concurrency: int = 1,
+        requests_per_minute: float | None = None,
+        input_tokens_per_minute: float | None = None,
+        max_retries: int = 6,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.limit = float(self.max_concurrency)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.request_bucket = (
+            TokenBucket(requests_per_minute / 60, requests_per_minute) if requests_per_minute else None
+        )
+        self.token_bucket = (
+            TokenBucket(input_tokens_per_minute / 60, input_tokens_per_minute) if input_tokens_per_minute else None
+        )
+        self._in_flight = 0
+        self._slots = asyncio.Condition()
+        self._last_decrease = float("-inf")
+        self.stats = {
+            "requests": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "retries": 0,
+            "throttled": 0,
+            "estimated_input_tokens": 0,
+            "rate_limit_wait_s": 0.0,
+            "concurrency_wait_s": 0.0,
+            "backoff_s": 0.0,
+            "min_concurrency_limit": self.max_concurrency,
+            "max_in_flight": 0,
+        }
+
+    async def _acquire_slot(self) -> None:
+        start = time.monotonic()
+        async with self._slots:
+            await self._slots.wait_for(lambda: self._in_flight < int(self.limit))
+            self._in_flight += 1
+            self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self._in_flight)
+        self.stats["concurrency_wait_s"] += time.monotonic() - start
+
+    async def _release_slot(self) -> None:
+        async with self._slots:
+            self._in_flight -= 1
+            self._slots.notify_all()
+
+    async def _on_success(self) -> None:
+        async with self._slots:
+            self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+            self._slots.notify_all()
+
+    def _on_throttle(self, retry_after: float | None) -> None:
+        now = time.monotonic()
+        self.stats["throttled"] += 1
+        # A fixed window rather than the jittered sleep, which can be ~0 and
+        # would let every 429 of a burst halve the limit again.
+        window = max(self.base_delay, retry_after or 0.0)
+        if now - self._last_decrease >= window:
+            self.limit = max(self.min_concurrency, self.limit / 2)
+            self._last_decrease = now
+            self.stats["min_concurrency_limit"] = min(self.stats["min_concurrency_limit"], int(self.limit))
+        for bucket in (self.request_bucket, self.token_bucket):
+            if bucket:
+                bucket.drain()
+
+    def _backoff(self, attempt: int, retry_after: float | None) -> float:
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    async def call(self, func: Callable[..., Any], **kwargs: Any) -> Any:
+        """Run blocking `func(**kwargs)` in a thread under the scheduler's limits."""
+        self.stats["requests"] += 1
+        input_tokens = estimate_input_tokens(**kwargs)
+        self.stats["estimated_input_tokens"] += input_tokens
+
+        for attempt in range(self.max_retries + 1):
+            with span("scheduler_wait", cat="wait", attempt=attempt):
+                if self.request_bucket:
+                    self.stats["rate_limit_wait_s"] += await self.request_bucket.acquire(1)
+                if self.token_bucket:
+                    self.stats["rate_limit_wait_s"] += await self.token_bucket.acquire(input_tokens)
+                await self._acquire_slot()
+            try:
+                with span("messages.create", cat="model", attempt=attempt):
+                    result = await asyncio.to_thread(func, **kwargs)
+            except APIStatusError as e:
+                if e.status_code not in RETRYABLE_STATUS_CODES or attempt == self.max_retries:
+                    self.stats["failed"] += 1
+                    raise
+                retry_after = retry_after_seconds(e)
+                delay = self._backoff(attempt, retry_after)
+                if e.status_code in THROTTLE_STATUS_CODES:
+                    self._on_throttle(retry_after)
+            except APIConnectionError:
+                if attempt == self.max_retries:
+                    self.stats["failed"] += 1
+                    raise
+                delay = self._backoff(attempt, None)
+            else:
+                self.stats["succeeded"] += 1
+                await self._on_success()
+                return result
+            finally:
+                await self._release_slot()
+
+            self.stats["retries"] += 1
+            self.stats["backoff_s"] += delay
+            with span("backoff", cat="wait", attempt=attempt, delay_s=round(delay, 3)):
+                await asyncio.sleep(delay)
+
+    def summary(self) -> dict[str, Any]:
+        """Stats for the evaluation report."""
+        stats = dict(self.stats)
+        stats["final_concurrency_limit"] = int(self.limit)
+        for key in ("rate_limit_wait_s", "concurrency_wait_s", "backoff_s"):
+            stats[key] = round(stats[key], 3)
+        return stats
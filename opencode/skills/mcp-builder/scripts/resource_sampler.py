@@ -0,0 +1,165 @@
+"""
+Sample the CPU, memory, threads and open files of MCP server processes.
+
+Stdio MCP servers are child processes of the harness, so the sampler reads
+/proc (Linux only) for every descendant of this process at a fixed
+interval. That covers the whole server process tree, including servers a
+pool starts and recycles during the run, and helpers they spawn (npx, uvx,
+node, ...).
+
+Each sample is also written to the trace as counter tracks (see
+eval_trace.counter), so resource use lines up with the task and tool spans
+around it in https://ui.perfetto.dev.
+"""
+
+import asyncio
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+from eval_trace import counter
+
+PROC = Path("/proc")
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _read_stat(pid: int) -> tuple[int, float, int, int] | None:
+    """Return (ppid, cpu seconds, threads, rss bytes) for a process, or None if it is gone."""
+    try:
+        stat = (PROC / str(pid) / "stat").read_text()
+    except OSError:
+        return None
+    # The command name may contain spaces and parentheses; fields resume after the last ")".
+    fields = stat[stat.rfind(")") + 2:].split()
+    ppid = int(fields[1])
+    cpu_seconds = (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+    return ppid, cpu_seconds, int(fields[17]), int(fields[21]) * PAGE_SIZE
+
+
+def _count_fds(pid: int) -> int:
+    try:
+        return len(os.listdir(PROC / str(pid) / "fd"))
+    except OSError:
+        return 0
+
+
+def descendant_stats(root_pid: int) -> dict[int, tuple[float, int, int, int]]:
+    """Return {pid: (cpu seconds, threads, rss bytes, open fds)} for every descendant of `root_pid`."""
+    processes = {}
+    for entry in PROC.iterdir():
+        if entry.name.isdigit():
+            stat = _read_stat(int(entry.name))
+            if stat:
+                processes[int(entry.name)] = stat
+
+    children = {}
+    for pid, (ppid, *_) in processes.items():
+        children.setdefault(ppid, []).append(pid)
+
+    found = {}
+    stack = list(children.get(root_pid, []))
+    while stack:
+        pid = stack.pop()
+        _, cpu_seconds, threads, rss = processes[pid]
+        found[pid] = (cpu_seconds, threads, rss, _count_fds(pid))
+        stack.extend(children.get(pid, []))
+    return found
+
+
+class ProcessSampler:
+    """Periodically samples every descendant process of `root_pid` (default: this process).
+
+    Call `start()` inside a running event loop and `await stop()` when done.
+    CPU time of processes that exit between samples is kept, counted up to
+    their last sample.
+    """
+
+    def __init__(self, interval: float = 1.0, root_pid: int | None = None):
+        self.interval = interval
+        self.root_pid = root_pid or os.getpid()
+        self.samples = []
+        self._baseline = {}
+        self._last_cpu = {}
+        self._start = None
+        self._task = None
+
+    @staticmethod
+    def available() -> bool:
+        return (PROC / "self" / "stat").exists()
+
+    def sample(self) -> dict[str, Any]:
+        """Take one sample now and record it."""
+        now = time.monotonic()
+        processes = descendant_stats(self.root_pid)
+        previous_total = sum(self._last_cpu.values())
+        for pid, (cpu_seconds, *_) in processes.items():
+            self._last_cpu[pid] = cpu_seconds
+        total = sum(self._last_cpu.values())
+
+        elapsed = now - self.samples[-1]["_monotonic"] if self.samples else None
+        cpu_percent = (total - previous_total) / elapsed * 100 if elapsed else 0.0
+        sample = {
+            "_monotonic": now,
+            "t": round(now - self._start, 3),
+            "processes": len(processes),
+            "cpu_percent": round(cpu_percent, 1),
+            "rss_bytes": sum(rss for _, _, rss, _ in processes.values()),
+            "threads": sum(threads for _, threads, _, _ in processes.values()),
+            "open_fds": sum(fds for *_, fds in processes.values()),
+        }
+        self.samples.append(sample)
+        counter("server CPU %", cpu=sample["cpu_percent"])
+        counter("server RSS MB", rss=round(sample["rss_bytes"] / 2**20, 1))
+        counter("server threads and FDs", threads=sample["threads"], fds=sample["open_fds"])
+        return sample
+
+    async def _run(self) -> None:
+        while True:
+            self.sample()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        self._start = time.monotonic()
+        # CPU already used before the run (e.g. server start-up) is not counted.
+        self._baseline = {pid: stats[0] for pid, stats in descendant_stats(self.root_pid).items()}
+        self._last_cpu = dict(self._baseline)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self.sample()
+
+    @property
+    def cpu_seconds(self) -> float:
+        return sum(self._last_cpu.values()) - sum(self._baseline.values())
+
+    def time_series(self) -> list[dict[str, Any]]:
+        """Samples without internal fields, for saving with the results."""
+        return [{k: v for k, v in sample.items() if not k.startswith("_")} for sample in self.samples]
+
+    def summary(self, tool_calls: int = 0) -> dict[str, Any]:
+        """Stats for the evaluation report."""
+        samples = self.samples
+        cpu = [s["cpu_percent"] for s in samples[1:]]
+        return {
+            "interval_s": self.interval,
+            "samples": len(samples),
+            "peak_processes": max((s["processes"] for s in samples), default=0),
+            "peak_rss_mb": round(max((s["rss_bytes"] for s in samples), default=0) / 2**20, 1),
+            "final_rss_mb": round(samples[-1]["rss_bytes"] / 2**20, 1) if samples else 0,
+            "peak_threads": max((s["threads"] for s in samples), default=0),
+            "peak_open_fds": max((s["open_fds"] for s in samples), default=0),
+            "mean_cpu_percent": round(sum(cpu) / len(cpu), 1) if cpu else 0.0,
+            "peak_cpu_percent": max(cpu, default=0.0),
+            "cpu_seconds": round(self.cpu_seconds, 3),
+            "cpu_seconds_per_tool_call": round(self.cpu_seconds / tool_calls, 4) if tool_calls else None,
+        }
@@ -0,0 +1,77 @@
+"""Tests for the tool result cache in connections.py.
+
+Run with: python -m unittest test_connections  (from this directory)
+"""
+
+import asyncio
+import unittest
+
+from connections import ToolResultCache
+
+
+class ToolResultCacheTest(unittest.IsolatedAsyncioTestCase):
+    async def test_cancelled_originator_does_not_cancel_waiter(self):
+        cache = ToolResultCache(tools={"lookup": None})
+        calls = []
+        first_call_started = asyncio.Event()
+
+        async def call():
+            calls.append(len(calls) + 1)
+            if len(calls) == 1:
+                first_call_started.set()
+                await asyncio.sleep(10)
+            return f"result {len(calls)}"
+
+        originator = asyncio.create_task(cache.get_or_call("lookup", {"id": 1}, 60, call))
+        await first_call_started.wait()
+        waiter = asyncio.create_task(cache.get_or_call("lookup", {"id": 1}, 60, call))
+        await asyncio.sleep(0)
+
+        originator.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await originator
+        # The waiter makes its own request instead of inheriting the cancellation.
+        self.assertEqual(await asyncio.wait_for(waiter, 1), "result 2")
+        self.assertEqual(calls, [1, 2])
+        self.assertEqual(await cache.get_or_call("lookup", {"id": 1}, 60, call), "result 2")
+        self.assertEqual(cache.stats["hits"], 1)
+
+    async def test_cancelled_waiter_does_not_cancel_originator(self):
+        cache = ToolResultCache(tools={"lookup": None})
+        release = asyncio.Event()
+
+        async def call():
+            await release.wait()
+            return "result"
+
+        originator = asyncio.create_task(cache.get_or_call("lookup", {}, 60, call))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.get_or_call("lookup", {}, 60, call))
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+        release.set()
+        self.assertEqual(await originator, "result")
+
+    async def test_waiters_share_one_call_and_its_error(self):
+        cache = ToolResultCache(tools={"lookup": None})
+        calls = 0
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            raise RuntimeError("server error")
+
+        results = await asyncio.gather(
+            *(cache.get_or_call("lookup", {}, 60, call) for _ in range(3)), return_exceptions=True
+        )
+        self.assertEqual(calls, 1)
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+        self.assertEqual(cache.stats["coalesced"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
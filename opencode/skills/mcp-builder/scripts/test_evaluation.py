@@ -0,0 +1,94 @@
+"""End-to-end tests that run evaluation.py against the offline fakes.
+
+Run with: python -m unittest test_evaluation  (from this directory)
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from fake_messages_api import start_fake_api
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+TASKS = 4
+TOOL_CALLS = 2
+
+
+class EvaluationRunTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.api = start_fake_api(tool_calls=TOOL_CALLS, answer="42")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.api.shutdown()
+        cls.api.server_close()
+
+    def setUp(self):
+        self.work_dir = Path(tempfile.mkdtemp())
+        self.eval_path = self.work_dir / "eval.jsonl"
+        self.eval_path.write_text("".join(
+            json.dumps({"question": f"question {i}", "answer": "42"}) + "\n" for i in range(TASKS)
+        ))
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def run_evaluation(self, server_args, *options):
+        # -a cannot take dashed arguments, so the server's flags go through a wrapper script.
+        wrapper = self.work_dir / "server.py"
+        wrapper.write_text(
+            "import runpy, sys\n"
+            f"sys.argv = {[str(SCRIPTS_DIR / 'fake_mcp_server.py'), *server_args]!r}\n"
+            "runpy.run_path(sys.argv[0], run_name='__main__')\n"
+        )
+        report_path = self.work_dir / "report.md"
+        env = dict(os.environ, ANTHROPIC_BASE_URL=self.api.url, ANTHROPIC_API_KEY="fake")
+        process = subprocess.run(
+            [
+                sys.executable, str(SCRIPTS_DIR / "evaluation.py"),
+                "-c", sys.executable, "-a", str(wrapper),
+                "-j", str(TASKS), "-o", str(report_path),
+                *options, str(self.eval_path),
+            ],
+            env=env,
+            capture_output=True,
+            text=True,
+            timeout=120,
+        )
+        report = report_path.read_text() if report_path.exists() else ""
+        return process, report
+
+    def assert_timeouts_do_not_fail_run(self, options, expected_line):
+        # The server is still busy with abandoned calls when the run shuts
+        # down; with --ignore-cancellation it answers them late as well.
+        for server_args in (["--latency", "1"], ["--latency", "1", "--ignore-cancellation"]):
+            with self.subTest(server=server_args):
+                process, report = self.run_evaluation(server_args, *options)
+                self.assertEqual(process.returncode, 0, process.stdout[-2000:] + process.stderr[-4000:])
+                self.assertNotIn("Traceback", process.stderr)
+                self.assertIn(expected_line, report)
+
+    def test_tool_timeouts_do_not_fail_run(self):
+        self.assert_timeouts_do_not_fail_run(
+            ["--tool-timeout", "0.3"], f"- **tool_timeouts**: {TASKS * TOOL_CALLS}"
+        )
+
+    def test_cached_tool_timeouts_do_not_fail_run(self):
+        # Every task sends the same lookups, so concurrent calls coalesce in
+        # the cache and share the originator's timeout.
+        self.assert_timeouts_do_not_fail_run(
+            ["--cache", "--tool-timeout", "0.3"], f"- **tool_timeouts**: {TASKS * TOOL_CALLS}"
+        )
+
+    def test_task_timeouts_do_not_fail_run(self):
+        self.assert_timeouts_do_not_fail_run(["--task-timeout", "0.5"], f"- **timed_out_tasks**: {TASKS}")
+
+
+if __name__ == "__main__":
+    unittest.main()
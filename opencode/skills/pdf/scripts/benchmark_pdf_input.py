@@ -0,0 +1,82 @@
+"""
+Compare peak memory of opening a PDF by path versus through pdf_io's mmap
+layer.
+
+Each mode runs in a fresh interpreter so the peak RSS reported by the OS
+belongs to that mode alone. The workload is what the form scripts do on
+every input: read the fields and walk every page's annotations and
+mediabox.
+
+Usage: python benchmark_pdf_input.py <input.pdf> [repeat]
+"""
+
+import json
+import resource
+import subprocess
+import sys
+import time
+
+from pypdf import PdfReader
+
+from pdf_io import open_pdf
+
+
+MODES = ["path", "mmap"]
+
+
+def run_workload(mode, pdf_path):
+    source = pdf_path if mode == "path" else open_pdf(pdf_path)
+    reader = PdfReader(source)
+    reader.get_fields()
+    annotations = 0
+    for page in reader.pages:
+        annotations += len(page.get('/Annots', []))
+        page.mediabox
+    return annotations
+
+
+def measure(mode, pdf_path):
+    start = time.perf_counter()
+    run_workload(mode, pdf_path)
+    elapsed = time.perf_counter() - start
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        max_rss //= 1024
+    return {"mode": mode, "seconds": elapsed, "peak_rss_kb": max_rss}
+
+
+def run_mode(mode, pdf_path):
+    output = subprocess.check_output(
+        [sys.executable, __file__, "--measure", mode, pdf_path]
+    )
+    return json.loads(output)
+
+
+def main():
+    if len(sys.argv) == 4 and sys.argv[1] == "--measure":
+        print(json.dumps(measure(sys.argv[2], sys.argv[3])))
+        return
+    if len(sys.argv) not in (2, 3):
+        print("Usage: benchmark_pdf_input.py <input.pdf> [repeat]")
+        sys.exit(1)
+
+    pdf_path = sys.argv[1]
+    repeat = int(sys.argv[2]) if len(sys.argv) == 3 else 3
+
+    print(f"Benchmarking {pdf_path} ({repeat} runs per mode)...")
+    best = {}
+    for mode in MODES:
+        runs = [run_mode(mode, pdf_path) for _ in range(repeat)]
+        best[mode] = {
+            "seconds": min(r["seconds"] for r in runs),
+            "peak_rss_kb": min(r["peak_rss_kb"] for r in runs),
+        }
+        print(f"  {mode:>5}: {best[mode]['seconds']:.3f}s, peak RSS {best[mode]['peak_rss_kb'] / 1024:.1f} MB")
+
+    saved = best["path"]["peak_rss_kb"] - best["mmap"]["peak_rss_kb"]
+    print(f"mmap saves {saved / 1024:.1f} MB of peak RSS")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+Benchmark the core function of every form script on synthetic PDFs.
+
+For each page count, this generates a fillable and a non-fillable PDF with
+synthetic_pdfs.py, then runs get_field_info, get_bounding_box_messages,
+extract_form_structure, fill_pdf_fields and fill_pdf_form over them, and
+loads the extracted form structure from JSON and from the columnar format
+(form_columns.py), whose file sizes are reported alongside. Each
+case records wall time (best and median of --repeat runs), peak Python
+memory (from a separate tracemalloc run), a per-phase breakdown and the
+pdf_trace spans recorded inside the scripts.
+
+Results are written as JSON. Pass --compare with a previous results file
+to print the change per case, e.g. between two commits.
+
+Usage:
+    python benchmark_pdf_scripts.py --pages 1 10 50 --output results.json
+    python benchmark_pdf_scripts.py --pages 1 10 50 --compare baseline.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import pypdf
+from pypdf import PdfReader
+
+from check_bounding_boxes import get_bounding_box_messages
+from extract_form_field_info import get_field_info
+from extract_form_structure import extract_form_structure
+from fill_fillable_fields import fill_pdf_fields
+from fill_pdf_form_with_annotations import fill_pdf_form
+from form_columns import load_columns, write_columns
+from pdf_trace import get_spans, reset_spans
+from synthetic_pdfs import make_field_values, make_fillable_pdf, make_non_fillable_pdf
+
+
+class Phases:
+    def __init__(self):
+        self.seconds = {}
+
+    @contextlib.contextmanager
+    def __call__(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - start
+
+
+def case_get_field_info(inputs, phase):
+    with phase("parse"):
+        reader = PdfReader(inputs["fillable_pdf"])
+    with phase("extract"):
+        get_field_info(reader)
+
+
+def case_get_bounding_box_messages(inputs, phase):
+    with phase("read"):
+        with open(inputs["annotation_fields_json"]) as f:
+            stream = io.StringIO(f.read())
+    with phase("check"):
+        get_bounding_box_messages(stream)
+
+
+def case_extract_form_structure(inputs, phase):
+    with phase("extract"):
+        structure = extract_form_structure(inputs["non_fillable_pdf"])
+    with phase("serialize"):
+        json.dumps(structure, indent=2)
+
+
+def case_load_form_structure_json(inputs, phase):
+    with phase("load"):
+        with open(inputs["structure_json"]) as f:
+            structure = json.load(f)
+    with phase("scan"):
+        max(label["x1"] for label in structure["labels"]) if structure["labels"] else None
+
+
+def case_load_form_structure_columns(inputs, phase):
+    with phase("load"):
+        columns = load_columns(inputs["structure_columns"])
+    with phase("scan"):
+        max(columns.column("labels", "x1")) if columns.rows("labels") else None
+
+
+def case_fill_pdf_fields(inputs, phase):
+    with phase("fill"):
+        fill_pdf_fields(inputs["fillable_pdf"], inputs["field_values_json"], inputs["output_pdf"])
+
+
+def case_fill_pdf_form(inputs, phase):
+    with phase("fill"):
+        fill_pdf_form(inputs["non_fillable_pdf"], inputs["annotation_fields_json"], inputs["output_pdf"])
+
+
+def case_fill_pdf_fields_flatten(inputs, phase):
+    with phase("fill"):
+        fill_pdf_fields(inputs["fillable_pdf"], inputs["field_values_json"], inputs["output_pdf"], flatten=True)
+    with phase("reopen"):
+        PdfReader(inputs["output_pdf"]).pages[-1].extract_text()
+
+
+def case_fill_pdf_form_flatten(inputs, phase):
+    with phase("fill"):
+        fill_pdf_form(inputs["non_fillable_pdf"], inputs["annotation_fields_json"], inputs["output_pdf"], flatten=True)
+    with phase("reopen"):
+        PdfReader(inputs["output_pdf"]).pages[-1].extract_text()
+
+
+CASES = {
+    "get_field_info": case_get_field_info,
+    "get_bounding_box_messages": case_get_bounding_box_messages,
+    "extract_form_structure": case_extract_form_structure,
+    "load_form_structure_json": case_load_form_structure_json,
+    "load_form_structure_columns": case_load_form_structure_columns,
+    "fill_pdf_fields": case_fill_pdf_fields,
+    "fill_pdf_form": case_fill_pdf_form,
+    "fill_pdf_fields_flatten": case_fill_pdf_fields_flatten,
+    "fill_pdf_form_flatten": case_fill_pdf_form_flatten,
+}
+
+
+def generate_inputs(work_dir, pages, args):
+    inputs = {
+        "fillable_pdf": os.path.join(work_dir, f"fillable_{pages}.pdf"),
+        "non_fillable_pdf": os.path.join(work_dir, f"non_fillable_{pages}.pdf"),
+        "field_values_json": os.path.join(work_dir, f"field_values_{pages}.json"),
+        "annotation_fields_json": os.path.join(work_dir, f"fields_{pages}.json"),
+        "output_pdf": os.path.join(work_dir, f"output_{pages}.pdf"),
+        "structure_json": os.path.join(work_dir, f"structure_{pages}.json"),
+        "structure_columns": os.path.join(work_dir, f"structure_{pages}.fcol"),
+    }
+    make_fillable_pdf(
+        inputs["fillable_pdf"],
+        pages=pages,
+        fields_per_page=args.fields_per_page,
+        nesting_depth=args.nesting_depth,
+        radio_groups_per_page=args.radio_groups,
+        checkboxes_per_page=args.checkboxes,
+        radio_options=args.radio_options,
+    )
+    field_info = get_field_info(PdfReader(inputs["fillable_pdf"]))
+    with open(inputs["field_values_json"], "w") as f:
+        json.dump(make_field_values(field_info), f)
+
+    annotation_fields = make_non_fillable_pdf(
+        inputs["non_fillable_pdf"],
+        pages=pages,
+        rows_per_page=args.fields_per_page,
+        checkboxes_per_page=args.checkboxes,
+    )
+    with open(inputs["annotation_fields_json"], "w") as f:
+        json.dump(annotation_fields, f)
+
+    structure = extract_form_structure(inputs["non_fillable_pdf"])
+    with open(inputs["structure_json"], "w") as f:
+        json.dump(structure, f, indent=2)
+    write_columns(structure, inputs["structure_columns"])
+    return inputs
+
+
+def run_case(case, inputs, repeat):
+    walls = []
+    phase_runs = []
+    span_runs = []
+    for _ in range(repeat):
+        phase = Phases()
+        reset_spans()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            case(inputs, phase)
+        walls.append(time.perf_counter() - start)
+        phase_runs.append(phase.seconds)
+        span_runs.append(get_spans())
+
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            case(inputs, Phases())
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "wall_seconds": {"min": min(walls), "median": statistics.median(walls)},
+        "peak_memory_bytes": peak,
+        "phases": {
+            name: statistics.median(run[name] for run in phase_runs)
+            for name in phase_runs[0]
+        },
+        "spans": {
+            path: {
+                "seconds": statistics.median(run[path]["seconds"] for run in span_runs),
+                "items": span_runs[0][path]["items"],
+            }
+            for path in span_runs[0]
+        },
+    }
+
+
+def compare(results, baseline):
+    previous = {(r["case"], r["pages"]): r for r in baseline["results"]}
+    print(f"\nCompared with {baseline['meta'].get('created_at', 'baseline')}:")
+    for r in results["results"]:
+        old = previous.get((r["case"], r["pages"]))
+        if not old:
+            continue
+        old_time = old["wall_seconds"]["median"]
+        new_time = r["wall_seconds"]["median"]
+        time_change = (new_time - old_time) / old_time * 100 if old_time else 0
+        old_mem = old["peak_memory_bytes"]
+        mem_change = (r["peak_memory_bytes"] - old_mem) / old_mem * 100 if old_mem else 0
+        print(f"  {r['case']:<26} pages={r['pages']:<5} time {time_change:+6.1f}%  memory {mem_change:+6.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the pdf form scripts on synthetic PDFs")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10], help="Page counts to benchmark (default: 1 10)")
+    parser.add_argument("--fields-per-page", type=int, default=20, help="Text fields (fillable) or label rows (non-fillable) per page (default: 20)")
+    parser.add_argument("--nesting-depth", type=int, default=1, help="Parent fields above each page's fields (default: 1)")
+    parser.add_argument("--radio-groups", type=int, default=2, help="Radio groups per page (default: 2)")
+    parser.add_argument("--radio-options", type=int, default=3, help="Buttons per radio group (default: 3)")
+    parser.add_argument("--checkboxes", type=int, default=5, help="Checkboxes per page (default: 5)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case (default: 3)")
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES), help="Cases to run (default: all)")
+    parser.add_argument("-o", "--output", default="benchmark_results.json", help="Results file (default: benchmark_results.json)")
+    parser.add_argument("--compare", help="Previous results file to compare against")
+    args = parser.parse_args()
+
+    results = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "pypdf": pypdf.__version__,
+            "config": {k: v for k, v in vars(args).items() if k not in ("output", "compare")},
+        },
+        "results": [],
+        "form_structure_bytes": [],
+    }
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        for pages in args.pages:
+            start = time.perf_counter()
+            inputs = generate_inputs(work_dir, pages, args)
+            print(f"Generated {pages}-page inputs in {time.perf_counter() - start:.2f}s")
+            sizes = {key: os.path.getsize(inputs[key]) for key in ("structure_json", "structure_columns")}
+            results["form_structure_bytes"].append({"pages": pages, "json": sizes["structure_json"], "columns": sizes["structure_columns"]})
+            print(f"  form structure: JSON {sizes['structure_json'] / 1024:.1f} KB, "
+                  f"columnar {sizes['structure_columns'] / 1024:.1f} KB")
+            for name in args.cases:
+                result = run_case(CASES[name], inputs, args.repeat)
+                result = {"case": name, "pages": pages, **result}
+                results["results"].append(result)
+                phases = ", ".join(f"{k} {v:.3f}s" for k, v in result["phases"].items())
+                print(f"  {name:<26} {result['wall_seconds']['median']:.3f}s  peak {result['peak_memory_bytes'] / 1024 / 1024:.1f} MB  ({phases})")
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Saved results to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
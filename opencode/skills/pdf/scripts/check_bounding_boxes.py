@@ -1,52 +1,58 @@
-from dataclasses import dataclass
-import json
 import sys
 
+from form_fields import load_form_fields
 
 
-
-@dataclass
 class RectAndField:
-    rect: list[float]
-    rect_type: str
-    field: dict
+    __slots__ = ("rect", "rect_type", "field")
+
+    def __init__(self, rect, rect_type, field):
+        self.rect = rect
+        self.rect_type = rect_type
+        self.field = field
 
 
 def get_bounding_box_messages(fields_json_stream) -> list[str]:
     messages = []
-    fields = json.load(fields_json_stream)
-    messages.append(f"Read {len(fields['form_fields'])} fields")
+    fields = load_form_fields(fields_json_stream)
+    messages.append(f"Read {len(fields)} fields")
 
     def rects_intersect(r1, r2):
         disjoint_horizontal = r1[0] >= r2[2] or r1[2] <= r2[0]
         disjoint_vertical = r1[1] >= r2[3] or r1[3] <= r2[1]
         return not (disjoint_horizontal or disjoint_vertical)
 
+    # Boxes can only overlap boxes on the same page, so each box is checked
+    # against the later boxes of its own page, in file order.
     rects_and_fields = []
-    for f in fields["form_fields"]:
-        rects_and_fields.append(RectAndField(f["label_bounding_box"], "label", f))
-        rects_and_fields.append(RectAndField(f["entry_bounding_box"], "entry", f))
+    page_rects = {}
+    for f in fields.fields:
+        same_page = page_rects.setdefault(f.page_number, [])
+        for rect, rect_type in ((f.label_bounding_box, "label"), (f.entry_bounding_box, "entry")):
+            rf = RectAndField(rect, rect_type, f)
+            rects_and_fields.append((rf, same_page, len(same_page)))
+            same_page.append(rf)
 
     has_error = False
-    for i, ri in enumerate(rects_and_fields):
-        for j in range(i + 1, len(rects_and_fields)):
-            rj = rects_and_fields[j]
-            if ri.field["page_number"] == rj.field["page_number"] and rects_intersect(ri.rect, rj.rect):
+    for ri, same_page, position in rects_and_fields:
+        for j in range(position + 1, len(same_page)):
+            rj = same_page[j]
+            if rects_intersect(ri.rect, rj.rect):
                 has_error = True
                 if ri.field is rj.field:
-                    messages.append(f"FAILURE: intersection between label and entry bounding boxes for `{ri.field['description']}` ({ri.rect}, {rj.rect})")
+                    messages.append(f"FAILURE: intersection between label and entry bounding boxes for `{ri.field.description}` ({ri.rect}, {rj.rect})")
                 else:
-                    messages.append(f"FAILURE: intersection between {ri.rect_type} bounding box for `{ri.field['description']}` ({ri.rect}) and {rj.rect_type} bounding box for `{rj.field['description']}` ({rj.rect})")
+                    messages.append(f"FAILURE: intersection between {ri.rect_type} bounding box for `{ri.field.description}` ({ri.rect}) and {rj.rect_type} bounding box for `{rj.field.description}` ({rj.rect})")
                 if len(messages) >= 20:
                     messages.append("Aborting further checks; fix bounding boxes and try again")
                     return messages
         if ri.rect_type == "entry":
-            if "entry_text" in ri.field:
-                font_size = ri.field["entry_text"].get("font_size", 14)
+            if ri.field.entry_text is not None:
+                font_size = ri.field.entry_text.get("font_size", 14)
                 entry_height = ri.rect[3] - ri.rect[1]
                 if entry_height < font_size:
                     has_error = True
-                    messages.append(f"FAILURE: entry bounding box height ({entry_height}) for `{ri.field['description']}` is too short for the text content (font size: {font_size}). Increase the box height or decrease the font size.")
+                    messages.append(f"FAILURE: entry bounding box height ({entry_height}) for `{ri.field.description}` is too short for the text content (font size: {font_size}). Increase the box height or decrease the font size.")
                     if len(messages) >= 20:
                         messages.append("Aborting further checks; fix bounding boxes and try again")
                         return messages
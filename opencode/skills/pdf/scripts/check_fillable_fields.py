@@ -1,10 +1,12 @@
 import sys
 from pypdf import PdfReader
 
+from pdf_io import open_pdf
 
 
 
-reader = PdfReader(sys.argv[1])
+
+reader = PdfReader(open_pdf(sys.argv[1]))
 if (reader.get_fields()):
     print("This PDF has fillable form fields")
 else:
@@ -3,31 +3,78 @@ import sys
 
 from pdf2image import convert_from_path
 
+from render_cache import discard_manifest, page_hashes, save_manifest, stale_pages
 
 
+DPI = 200
 
-def convert(pdf_path, output_dir, max_dim=1000):
-    images = convert_from_path(pdf_path, dpi=200)
 
-    for i, image in enumerate(images):
-        width, height = image.size
-        if width > max_dim or height > max_dim:
-            scale_factor = min(max_dim / width, max_dim / height)
-            new_width = int(width * scale_factor)
-            new_height = int(height * scale_factor)
-            image = image.resize((new_width, new_height))
-        
-        image_path = os.path.join(output_dir, f"page_{i+1}.png")
-        image.save(image_path)
-        print(f"Saved page {i+1} as {image_path} (size: {image.size})")
+def _page_ranges(page_numbers):
+    """Group sorted page numbers into (first, last) runs so each run is one render call."""
+    ranges = []
+    for n in page_numbers:
+        if ranges and ranges[-1][1] == n - 1:
+            ranges[-1][1] = n
+        else:
+            ranges.append([n, n])
+    return ranges
 
-    print(f"Converted {len(images)} pages to PNG images")
+
+def _save_page(image, image_path, page_number, max_dim):
+    width, height = image.size
+    if width > max_dim or height > max_dim:
+        scale_factor = min(max_dim / width, max_dim / height)
+        new_width = int(width * scale_factor)
+        new_height = int(height * scale_factor)
+        image = image.resize((new_width, new_height))
+
+    image.save(image_path)
+    print(f"Saved page {page_number} as {image_path} (size: {image.size})")
+
+
+def convert(pdf_path, output_dir, max_dim=1000, incremental=False):
+    """
+    Render every page of the PDF to output_dir/page_N.png. With
+    `incremental`, pages whose content hash matches the previous run into
+    the same directory keep their existing image and only changed pages are
+    rendered. A plain run discards the incremental manifest.
+    """
+    def image_path(page_number):
+        return os.path.join(output_dir, f"page_{page_number}.png")
+
+    if not incremental:
+        # The images are about to change, so a later --incremental run must not trust old hashes.
+        discard_manifest(output_dir)
+        images = convert_from_path(pdf_path, dpi=DPI)
+        for i, image in enumerate(images):
+            _save_page(image, image_path(i + 1), i + 1, max_dim)
+        print(f"Converted {len(images)} pages to PNG images")
+        return
+
+    settings = {"dpi": DPI, "max_dim": max_dim}
+    hashes = page_hashes(pdf_path)
+    stale = stale_pages(output_dir, settings, hashes, image_path)
+    for first, last in _page_ranges(stale):
+        images = convert_from_path(pdf_path, dpi=DPI, first_page=first, last_page=last)
+        for page_number, image in enumerate(images, first):
+            _save_page(image, image_path(page_number), page_number, max_dim)
+    save_manifest(output_dir, settings, hashes)
+
+    # Drop images of pages the document no longer has.
+    page_number = len(hashes) + 1
+    while os.path.exists(image_path(page_number)):
+        os.unlink(image_path(page_number))
+        page_number += 1
+
+    print(f"Rendered {len(stale)} changed pages, reused {len(hashes) - len(stale)} unchanged page images")
 
 
 if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print("Usage: convert_pdf_to_images.py [input pdf] [output directory]")
+    incremental = "--incremental" in sys.argv
+    argv = [arg for arg in sys.argv if arg != "--incremental"]
+    if len(argv) != 3:
+        print("Usage: convert_pdf_to_images.py [input pdf] [output directory] [--incremental]")
         sys.exit(1)
-    pdf_path = sys.argv[1]
-    output_directory = sys.argv[2]
-    convert(pdf_path, output_directory)
+    pdf_path = argv[1]
+    output_directory = argv[2]
+    convert(pdf_path, output_directory, incremental=incremental)
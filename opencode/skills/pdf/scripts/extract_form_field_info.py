@@ -3,6 +3,9 @@ import sys
 
 from pypdf import PdfReader
 
+from pdf_io import open_pdf
+from pdf_trace import pop_profile_arg, profiling, span
+
 
 
 
@@ -45,46 +48,49 @@ def make_field_dict(field, field_id):
 
 
 def get_field_info(reader: PdfReader):
-    fields = reader.get_fields()
+    with span("get_fields"):
+        fields = reader.get_fields()
 
     field_info_by_id = {}
     possible_radio_names = set()
 
-    for field_id, field in fields.items():
-        if field.get("/Kids"):
-            if field.get("/FT") == "/Btn":
-                possible_radio_names.add(field_id)
-            continue
-        field_info_by_id[field_id] = make_field_dict(field, field_id)
+    with span("make_fields", items=len(fields)):
+        for field_id, field in fields.items():
+            if field.get("/Kids"):
+                if field.get("/FT") == "/Btn":
+                    possible_radio_names.add(field_id)
+                continue
+            field_info_by_id[field_id] = make_field_dict(field, field_id)
 
 
     radio_fields_by_id = {}
 
-    for page_index, page in enumerate(reader.pages):
-        annotations = page.get('/Annots', [])
-        for ann in annotations:
-            field_id = get_full_annotation_field_id(ann)
-            if field_id in field_info_by_id:
-                field_info_by_id[field_id]["page"] = page_index + 1
-                field_info_by_id[field_id]["rect"] = ann.get('/Rect')
-            elif field_id in possible_radio_names:
-                try:
-                    on_values = [v for v in ann["/AP"]["/N"] if v != "/Off"]
-                except KeyError:
-                    continue
-                if len(on_values) == 1:
-                    rect = ann.get("/Rect")
-                    if field_id not in radio_fields_by_id:
-                        radio_fields_by_id[field_id] = {
-                            "field_id": field_id,
-                            "type": "radio_group",
-                            "page": page_index + 1,
-                            "radio_options": [],
-                        }
-                    radio_fields_by_id[field_id]["radio_options"].append({
-                        "value": on_values[0],
-                        "rect": rect,
-                    })
+    with span("walk_annotations", items=len(reader.pages)):
+        for page_index, page in enumerate(reader.pages):
+            annotations = page.get('/Annots', [])
+            for ann in annotations:
+                field_id = get_full_annotation_field_id(ann)
+                if field_id in field_info_by_id:
+                    field_info_by_id[field_id]["page"] = page_index + 1
+                    field_info_by_id[field_id]["rect"] = ann.get('/Rect')
+                elif field_id in possible_radio_names:
+                    try:
+                        on_values = [v for v in ann["/AP"]["/N"] if v != "/Off"]
+                    except KeyError:
+                        continue
+                    if len(on_values) == 1:
+                        rect = ann.get("/Rect")
+                        if field_id not in radio_fields_by_id:
+                            radio_fields_by_id[field_id] = {
+                                "field_id": field_id,
+                                "type": "radio_group",
+                                "page": page_index + 1,
+                                "radio_options": [],
+                            }
+                        radio_fields_by_id[field_id]["radio_options"].append({
+                            "value": on_values[0],
+                            "rect": rect,
+                        })
 
     fields_with_location = []
     for field_info in field_info_by_id.values():
@@ -101,22 +107,28 @@ def get_field_info(reader: PdfReader):
         adjusted_position = [-rect[1], rect[0]]
         return [f.get("page"), adjusted_position]
     
-    sorted_fields = fields_with_location + list(radio_fields_by_id.values())
-    sorted_fields.sort(key=sort_key)
+    with span("sort"):
+        sorted_fields = fields_with_location + list(radio_fields_by_id.values())
+        sorted_fields.sort(key=sort_key)
 
     return sorted_fields
 
 
 def write_field_info(pdf_path: str, json_output_path: str):
-    reader = PdfReader(pdf_path)
-    field_info = get_field_info(reader)
-    with open(json_output_path, "w") as f:
-        json.dump(field_info, f, indent=2)
+    with span("parse"):
+        reader = PdfReader(open_pdf(pdf_path))
+    with span("index"):
+        field_info = get_field_info(reader)
+    with span("write", items=len(field_info)):
+        with open(json_output_path, "w") as f:
+            json.dump(field_info, f, indent=2)
     print(f"Wrote {len(field_info)} fields to {json_output_path}")
 
 
 if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print("Usage: extract_form_field_info.py [input pdf] [output json]")
+    argv, profile = pop_profile_arg(sys.argv)
+    if len(argv) != 3:
+        print("Usage: extract_form_field_info.py [input pdf] [output json] [--profile[=out.pstats]]")
         sys.exit(1)
-    write_field_info(sys.argv[1], sys.argv[2])
+    with profiling(profile):
+        write_field_info(argv[1], argv[2])
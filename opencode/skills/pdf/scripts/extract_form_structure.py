@@ -7,15 +7,21 @@ This script analyzes the PDF to find:
 - Checkboxes (small rectangles)
 
 Output: A JSON file with the form structure that can be used to generate
-accurate field coordinates for filling.
+accurate field coordinates for filling. If the output name ends in .fcol,
+the structure is written in the compact columnar format of form_columns.py
+instead, which is much smaller and faster to load for dense forms.
 
-Usage: python extract_form_structure.py <input.pdf> <output.json>
+Usage: python extract_form_structure.py <input.pdf> <output.json|output.fcol> [--profile[=out.pstats]]
 """
 
 import json
 import sys
 import pdfplumber
 
+from form_columns import is_columns_path, write_columns
+from pdf_io import open_pdf
+from pdf_trace import pop_profile_arg, profiling, span
+
 
 def extract_form_structure(pdf_path):
     structure = {
@@ -26,7 +32,9 @@ def extract_form_structure(pdf_path):
         "row_boundaries": []
     }
 
-    with pdfplumber.open(pdf_path) as pdf:
+    with span("parse"):
+        pdf = pdfplumber.open(open_pdf(pdf_path))
+    with pdf:
         for page_num, page in enumerate(pdf.pages, 1):
             structure["pages"].append({
                 "page_number": page_num,
@@ -34,73 +42,85 @@ def extract_form_structure(pdf_path):
                 "height": float(page.height)
             })
 
-            words = page.extract_words()
-            for word in words:
-                structure["labels"].append({
-                    "page": page_num,
-                    "text": word["text"],
-                    "x0": round(float(word["x0"]), 1),
-                    "top": round(float(word["top"]), 1),
-                    "x1": round(float(word["x1"]), 1),
-                    "bottom": round(float(word["bottom"]), 1)
-                })
-
-            for line in page.lines:
-                if abs(float(line["x1"]) - float(line["x0"])) > page.width * 0.5:
-                    structure["lines"].append({
-                        "page": page_num,
-                        "y": round(float(line["top"]), 1),
-                        "x0": round(float(line["x0"]), 1),
-                        "x1": round(float(line["x1"]), 1)
-                    })
-
-            for rect in page.rects:
-                width = float(rect["x1"]) - float(rect["x0"])
-                height = float(rect["bottom"]) - float(rect["top"])
-                if 5 <= width <= 15 and 5 <= height <= 15 and abs(width - height) < 2:
-                    structure["checkboxes"].append({
+            with span("words") as words_span:
+                words = page.extract_words()
+                words_span.items += len(words)
+                for word in words:
+                    structure["labels"].append({
                         "page": page_num,
-                        "x0": round(float(rect["x0"]), 1),
-                        "top": round(float(rect["top"]), 1),
-                        "x1": round(float(rect["x1"]), 1),
-                        "bottom": round(float(rect["bottom"]), 1),
-                        "center_x": round((float(rect["x0"]) + float(rect["x1"])) / 2, 1),
-                        "center_y": round((float(rect["top"]) + float(rect["bottom"])) / 2, 1)
+                        "text": word["text"],
+                        "x0": round(float(word["x0"]), 1),
+                        "top": round(float(word["top"]), 1),
+                        "x1": round(float(word["x1"]), 1),
+                        "bottom": round(float(word["bottom"]), 1)
                     })
 
-    lines_by_page = {}
-    for line in structure["lines"]:
-        page = line["page"]
-        if page not in lines_by_page:
-            lines_by_page[page] = []
-        lines_by_page[page].append(line["y"])
-
-    for page, y_coords in lines_by_page.items():
-        y_coords = sorted(set(y_coords))
-        for i in range(len(y_coords) - 1):
-            structure["row_boundaries"].append({
-                "page": page,
-                "row_top": y_coords[i],
-                "row_bottom": y_coords[i + 1],
-                "row_height": round(y_coords[i + 1] - y_coords[i], 1)
-            })
+            with span("lines"):
+                for line in page.lines:
+                    if abs(float(line["x1"]) - float(line["x0"])) > page.width * 0.5:
+                        structure["lines"].append({
+                            "page": page_num,
+                            "y": round(float(line["top"]), 1),
+                            "x0": round(float(line["x0"]), 1),
+                            "x1": round(float(line["x1"]), 1)
+                        })
+
+            with span("rects"):
+                for rect in page.rects:
+                    width = float(rect["x1"]) - float(rect["x0"])
+                    height = float(rect["bottom"]) - float(rect["top"])
+                    if 5 <= width <= 15 and 5 <= height <= 15 and abs(width - height) < 2:
+                        structure["checkboxes"].append({
+                            "page": page_num,
+                            "x0": round(float(rect["x0"]), 1),
+                            "top": round(float(rect["top"]), 1),
+                            "x1": round(float(rect["x1"]), 1),
+                            "bottom": round(float(rect["bottom"]), 1),
+                            "center_x": round((float(rect["x0"]) + float(rect["x1"])) / 2, 1),
+                            "center_y": round((float(rect["top"]) + float(rect["bottom"])) / 2, 1)
+                        })
+
+    with span("row_boundaries"):
+        lines_by_page = {}
+        for line in structure["lines"]:
+            page = line["page"]
+            if page not in lines_by_page:
+                lines_by_page[page] = []
+            lines_by_page[page].append(line["y"])
+
+        for page, y_coords in lines_by_page.items():
+            y_coords = sorted(set(y_coords))
+            for i in range(len(y_coords) - 1):
+                structure["row_boundaries"].append({
+                    "page": page,
+                    "row_top": y_coords[i],
+                    "row_bottom": y_coords[i + 1],
+                    "row_height": round(y_coords[i + 1] - y_coords[i], 1)
+                })
 
     return structure
 
 
 def main():
-    if len(sys.argv) != 3:
-        print("Usage: extract_form_structure.py <input.pdf> <output.json>")
+    argv, profile = pop_profile_arg(sys.argv)
+    if len(argv) != 3:
+        print("Usage: extract_form_structure.py <input.pdf> <output.json|output.fcol> [--profile[=out.pstats]]")
         sys.exit(1)
 
-    pdf_path = sys.argv[1]
-    output_path = sys.argv[2]
+    pdf_path = argv[1]
+    output_path = argv[2]
 
-    print(f"Extracting structure from {pdf_path}...")
-    structure = extract_form_structure(pdf_path)
+    with profiling(profile):
+        print(f"Extracting structure from {pdf_path}...")
+        with span("extract"):
+            structure = extract_form_structure(pdf_path)
 
-    with open(output_path, "w") as f:
-        json.dump(structure, f, indent=2)
+        with span("write"):
+            if is_columns_path(output_path):
+                write_columns(structure, output_path)
+            else:
+                with open(output_path, "w") as f:
+                    json.dump(structure, f, indent=2)
 
     print(f"Found:")
     print(f"  - {len(structure['pages'])} pages")
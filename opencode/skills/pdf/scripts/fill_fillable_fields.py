@@ -1,55 +1,82 @@
 import json
+import os
 import sys
+import time
 
 from pypdf import PdfReader, PdfWriter
 
 from extract_form_field_info import get_field_info
+from pdf_flatten import compact, flatten_annotations
+from pdf_io import open_pdf, write_pdf
+from pdf_trace import pop_profile_arg, profiling, span
 
 
 
 
-def fill_pdf_fields(input_pdf_path: str, fields_json_path: str, output_pdf_path: str):
-    with open(fields_json_path) as f:
-        fields = json.load(f)
-    fields_by_page = {}
-    for field in fields:
-        if "value" in field:
-            field_id = field["field_id"]
-            page = field["page"]
-            if page not in fields_by_page:
-                fields_by_page[page] = {}
-            fields_by_page[page][field_id] = field["value"]
+def fill_pdf_fields(input_pdf_path: str, fields_json_path: str, output_pdf_path: str, flatten: bool = False):
+    """
+    Fill the form fields and write the result. With `flatten`, the filled
+    fields are drawn into the page content, the form is removed and the
+    output is compacted, so viewers have no appearances to regenerate.
+    """
+    start = time.perf_counter()
+    with span("load_values"):
+        with open(fields_json_path) as f:
+            fields = json.load(f)
+        fields_by_page = {}
+        for field in fields:
+            if "value" in field:
+                field_id = field["field_id"]
+                page = field["page"]
+                if page not in fields_by_page:
+                    fields_by_page[page] = {}
+                fields_by_page[page][field_id] = field["value"]
     
-    reader = PdfReader(input_pdf_path)
+    with span("parse"):
+        reader = PdfReader(open_pdf(input_pdf_path))
 
     has_error = False
-    field_info = get_field_info(reader)
-    fields_by_ids = {f["field_id"]: f for f in field_info}
-    for field in fields:
-        existing_field = fields_by_ids.get(field["field_id"])
-        if not existing_field:
-            has_error = True
-            print(f"ERROR: `{field['field_id']}` is not a valid field ID")
-        elif field["page"] != existing_field["page"]:
-            has_error = True
-            print(f"ERROR: Incorrect page number for `{field['field_id']}` (got {field['page']}, expected {existing_field['page']})")
-        else:
-            if "value" in field:
-                err = validation_error_for_field_value(existing_field, field["value"])
-                if err:
-                    print(err)
-                    has_error = True
+    with span("index"):
+        field_info = get_field_info(reader)
+        fields_by_ids = {f["field_id"]: f for f in field_info}
+    with span("validate", items=len(fields)):
+        for field in fields:
+            existing_field = fields_by_ids.get(field["field_id"])
+            if not existing_field:
+                has_error = True
+                print(f"ERROR: `{field['field_id']}` is not a valid field ID")
+            elif field["page"] != existing_field["page"]:
+                has_error = True
+                print(f"ERROR: Incorrect page number for `{field['field_id']}` (got {field['page']}, expected {existing_field['page']})")
+            else:
+                if "value" in field:
+                    err = validation_error_for_field_value(existing_field, field["value"])
+                    if err:
+                        print(err)
+                        has_error = True
     if has_error:
         sys.exit(1)
 
-    writer = PdfWriter(clone_from=reader)
-    for page, field_values in fields_by_page.items():
-        writer.update_page_form_field_values(writer.pages[page - 1], field_values, auto_regenerate=False)
-
-    writer.set_need_appearances_writer(True)
+    with span("clone"):
+        writer = PdfWriter(clone_from=reader)
+    with span("fill", items=len(fields_by_page)):
+        for page, field_values in fields_by_page.items():
+            writer.update_page_form_field_values(writer.pages[page - 1], field_values, auto_regenerate=False)
+
+    if flatten:
+        with span("flatten") as flatten_span:
+            flatten_span.items += flatten_annotations(writer)
+        with span("compact"):
+            compact(writer)
+    else:
+        writer.set_need_appearances_writer(True)
     
-    with open(output_pdf_path, "wb") as f:
-        writer.write(f)
+    with span("write"):
+        write_pdf(writer, output_pdf_path)
+
+    if flatten:
+        print(f"Flattened output: {os.path.getsize(output_pdf_path) / 1024:.1f} KB "
+              f"(input {os.path.getsize(input_pdf_path) / 1024:.1f} KB) in {time.perf_counter() - start:.2f}s")
 
 
 def validation_error_for_field_value(field_info, field_value):
@@ -88,11 +115,15 @@ def monkeypatch_pydpf_method():
 
 
 if __name__ == "__main__":
-    if len(sys.argv) != 4:
-        print("Usage: fill_fillable_fields.py [input pdf] [field_values.json] [output pdf]")
+    argv, profile = pop_profile_arg(sys.argv)
+    flatten = "--flatten" in argv
+    argv = [arg for arg in argv if arg != "--flatten"]
+    if len(argv) != 4:
+        print("Usage: fill_fillable_fields.py [input pdf] [field_values.json] [output pdf] [--flatten] [--profile[=out.pstats]]")
         sys.exit(1)
     monkeypatch_pydpf_method()
-    input_pdf = sys.argv[1]
-    fields_json = sys.argv[2]
-    output_pdf = sys.argv[3]
-    fill_pdf_fields(input_pdf, fields_json, output_pdf)
+    input_pdf = argv[1]
+    fields_json = argv[2]
+    output_pdf = argv[3]
+    with profiling(profile):
+        fill_pdf_fields(input_pdf, fields_json, output_pdf, flatten)
@@ -1,9 +1,15 @@
-import json
+import os
 import sys
+import time
 
 from pypdf import PdfReader, PdfWriter
 from pypdf.annotations import FreeText
 
+from form_fields import load_form_fields
+from pdf_flatten import can_draw_text, compact, flatten_annotations, text_commands, write_text
+from pdf_io import open_pdf, write_pdf
+from pdf_trace import pop_profile_arg, profiling, span
+
 
 
 
@@ -30,78 +36,120 @@ def transform_from_pdf_coords(bbox, pdf_height):
     return left, pypdf_bottom, right, pypdf_top
 
 
-def fill_pdf_form(input_pdf_path, fields_json_path, output_pdf_path):
-    
-    with open(fields_json_path, "r") as f:
-        fields_data = json.load(f)
-    
-    reader = PdfReader(input_pdf_path)
-    writer = PdfWriter()
-    
-    writer.append(reader)
+def fill_pdf_form(input_pdf_path, fields_json_path, output_pdf_path, flatten=False):
+    """
+    Add each field's entry text to the PDF as a FreeText annotation. With
+    `flatten`, the text is drawn into the page content instead, existing
+    annotations are flattened too and the output is compacted. Text the
+    built-in font cannot show (outside WinAnsi, e.g. CJK) stays a FreeText
+    annotation, and those fields are listed in a warning.
+    """
+    start = time.perf_counter()
+
+    with span("load_fields"):
+        fields = load_form_fields(fields_json_path)
     
-    pdf_dimensions = {}
-    for i, page in enumerate(reader.pages):
-        mediabox = page.mediabox
-        pdf_dimensions[i + 1] = [mediabox.width, mediabox.height]
+    with span("parse"):
+        reader = PdfReader(open_pdf(input_pdf_path))
+    with span("clone"):
+        writer = PdfWriter()
+        writer.append(reader)
+    with span("index", items=len(reader.pages)):
+        pdf_dimensions = {}
+        for i, page in enumerate(reader.pages):
+            mediabox = page.mediabox
+            pdf_dimensions[i + 1] = [mediabox.width, mediabox.height]
     
     annotations = []
-    for field in fields_data["form_fields"]:
-        page_num = field["page_number"]
-
-        page_info = next(p for p in fields_data["pages"] if p["page_number"] == page_num)
-        pdf_width, pdf_height = pdf_dimensions[page_num]
-
-        if "pdf_width" in page_info:
-            transformed_entry_box = transform_from_pdf_coords(
-                field["entry_bounding_box"],
-                float(pdf_height)
-            )
-        else:
-            image_width = page_info["image_width"]
-            image_height = page_info["image_height"]
-            transformed_entry_box = transform_from_image_coords(
-                field["entry_bounding_box"],
-                image_width, image_height,
-                float(pdf_width), float(pdf_height)
-            )
+    page_text = {}
+    unflattened = []
+    with span("annotate", items=len(fields)):
+        for field in fields.fields:
+            page_num = field.page_number
+
+            page_info = fields.pages[page_num]
+            pdf_width, pdf_height = pdf_dimensions[page_num]
+
+            if page_info.uses_pdf_coords:
+                transformed_entry_box = transform_from_pdf_coords(
+                    field.entry_bounding_box,
+                    float(pdf_height)
+                )
+            else:
+                image_width = page_info.image_width
+                image_height = page_info.image_height
+                transformed_entry_box = transform_from_image_coords(
+                    field.entry_bounding_box,
+                    image_width, image_height,
+                    float(pdf_width), float(pdf_height)
+                )
         
-        if "entry_text" not in field or "text" not in field["entry_text"]:
-            continue
-        entry_text = field["entry_text"]
-        text = entry_text["text"]
-        if not text:
-            continue
+            if field.entry_text is None or "text" not in field.entry_text:
+                continue
+            entry_text = field.entry_text
+            text = entry_text["text"]
+            if not text:
+                continue
         
-        font_name = entry_text.get("font", "Arial")
-        font_size = str(entry_text.get("font_size", 14)) + "pt"
-        font_color = entry_text.get("font_color", "000000")
-
-        annotation = FreeText(
-            text=text,
-            rect=transformed_entry_box,
-            font=font_name,
-            font_size=font_size,
-            font_color=font_color,
-            border_color=None,
-            background_color=None,
-        )
-        annotations.append(annotation)
-        writer.add_annotation(page_number=page_num - 1, annotation=annotation)
-        
-    with open(output_pdf_path, "wb") as output:
-        writer.write(output)
+            if flatten and not can_draw_text(text):
+                unflattened.append(field.description or f"field {field.index}")
+            elif flatten:
+                commands = text_commands(
+                    transformed_entry_box, text, entry_text.get("font_size", 14), entry_text.get("font_color", "000000")
+                )
+                page_text.setdefault(page_num, []).append(commands)
+                annotations.append(commands)
+                continue
+
+            font_name = entry_text.get("font", "Arial")
+            font_size = str(entry_text.get("font_size", 14)) + "pt"
+            font_color = entry_text.get("font_color", "000000")
+
+            annotation = FreeText(
+                text=text,
+                rect=transformed_entry_box,
+                font=font_name,
+                font_size=font_size,
+                font_color=font_color,
+                border_color=None,
+                background_color=None,
+            )
+            annotations.append(annotation)
+            writer.add_annotation(page_number=page_num - 1, annotation=annotation)
+
+    if flatten:
+        with span("flatten", items=len(annotations)):
+            for page_num, commands in page_text.items():
+                write_text(writer, writer.pages[page_num - 1], commands)
+            flatten_annotations(writer)
+        with span("compact"):
+            compact(writer)
+
+    with span("write"):
+        write_pdf(writer, output_pdf_path)
     
     print(f"Successfully filled PDF form and saved to {output_pdf_path}")
-    print(f"Added {len(annotations)} text annotations")
+    if flatten:
+        print(f"Drew {len(annotations) - len(unflattened)} text entries into the page content")
+        if unflattened:
+            print(f"⚠️  Kept {len(unflattened)} entries as editable annotations because their text "
+                  f"is outside WinAnsi: {', '.join(unflattened)}")
+        print(f"Flattened output: {os.path.getsize(output_pdf_path) / 1024:.1f} KB "
+              f"(input {os.path.getsize(input_pdf_path) / 1024:.1f} KB) in {time.perf_counter() - start:.2f}s")
+    else:
+        print(f"Added {len(annotations)} text annotations")
 
 
 if __name__ == "__main__":
-    if len(sys.argv) != 4:
-        print("Usage: fill_pdf_form_with_annotations.py [input pdf] [fields.json] [output pdf]")
+    argv, profile = pop_profile_arg(sys.argv)
+    flatten = "--flatten" in argv
+    argv = [arg for arg in argv if arg != "--flatten"]
+    if len(argv) != 4:
+        print("Usage: fill_pdf_form_with_annotations.py [input pdf] [fields.json] [output pdf] [--flatten] [--profile[=out.pstats]]")
         sys.exit(1)
-    input_pdf = sys.argv[1]
-    fields_json = sys.argv[2]
-    output_pdf = sys.argv[3]
+    input_pdf = argv[1]
+    fields_json = argv[2]
+    output_pdf = argv[3]
     
-    fill_pdf_form(input_pdf, fields_json, output_pdf)
+    with profiling(profile):
+        fill_pdf_form(input_pdf, fields_json, output_pdf, flatten)
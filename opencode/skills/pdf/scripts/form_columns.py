@@ -0,0 +1,176 @@
+"""
+Columnar storage for extract_form_structure output.
+
+The JSON output repeats every key for every label, line and checkbox. The
+columnar format stores each table (labels, lines, checkboxes,
+row_boundaries) as one packed array per attribute, plus a table of unique
+label strings that the `text` column indexes into:
+
+    FCOL1\\n | header length (uint32) | JSON header | padding | column data
+
+The header holds the pages, the string table and each column's type code,
+offset and row count. Coordinates are float32 and pages and string indexes
+int32, in the byte order recorded in the header.
+
+load_columns() maps the file and returns memoryviews into the mapping, so
+no column is copied or parsed until it is used. With NumPy available,
+`numpy.frombuffer(view, dtype=view.format)` gives array views on the same
+memory.
+"""
+
+import array
+import json
+import mmap
+import os
+import struct
+import sys
+
+
+MAGIC = b"FCOL1\n"
+ALIGNMENT = 8
+
+# Column types per table; every other column is a float32 coordinate.
+INT_COLUMNS = {"page", "text"}
+TABLES = {
+    "labels": ["page", "text", "x0", "top", "x1", "bottom"],
+    "lines": ["page", "y", "x0", "x1"],
+    "checkboxes": ["page", "x0", "top", "x1", "bottom", "center_x", "center_y"],
+    "row_boundaries": ["page", "row_top", "row_bottom", "row_height"],
+}
+
+
+def _type_code(column):
+    return "i" if column in INT_COLUMNS else "f"
+
+
+def write_columns(structure, output_path):
+    """
+    Write a structure returned by extract_form_structure() in the columnar
+    format. Returns the number of bytes written.
+    """
+    strings = []
+    string_ids = {}
+    for label in structure["labels"]:
+        if label["text"] not in string_ids:
+            string_ids[label["text"]] = len(strings)
+            strings.append(label["text"])
+
+    columns = []
+    for table, names in TABLES.items():
+        rows = structure[table]
+        for name in names:
+            if name == "text":
+                values = [string_ids[row["text"]] for row in rows]
+            else:
+                values = [row[name] for row in rows]
+            columns.append((table, name, array.array(_type_code(name), values)))
+
+    header = {
+        "byteorder": sys.byteorder,
+        "pages": structure["pages"],
+        "strings": strings,
+        "tables": {table: {"rows": len(structure[table]), "columns": {}} for table in TABLES},
+    }
+    # Offsets are relative to the (aligned) end of the header.
+    offset = 0
+    for table, name, values in columns:
+        header["tables"][table]["columns"][name] = [values.typecode, offset]
+        offset += len(values) * values.itemsize
+        offset += -offset % ALIGNMENT
+    header_bytes = json.dumps(header, separators=(",", ":")).encode()
+    data_start = len(MAGIC) + 4 + len(header_bytes)
+    data_start += -data_start % ALIGNMENT
+
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<I", len(header_bytes)))
+            f.write(header_bytes)
+            f.write(b"\0" * (data_start - f.tell()))
+            for _, _, values in columns:
+                values.tofile(f)
+                f.write(b"\0" * (-f.tell() % ALIGNMENT))
+            size = f.tell()
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return size
+
+
+class FormColumns:
+    """
+    A loaded columnar form structure. `pages` and `strings` are plain
+    lists; `column(table, name)` returns a read-only memoryview (format
+    "i" or "f") into the mapped file.
+    """
+
+    def __init__(self, buffer, header):
+        self._buffer = buffer
+        self.pages = header["pages"]
+        self.strings = header["strings"]
+        self.tables = header["tables"]
+        self._swap = header["byteorder"] != sys.byteorder
+
+    def __len__(self):
+        return sum(table["rows"] for table in self.tables.values())
+
+    def rows(self, table):
+        return self.tables[table]["rows"]
+
+    def column(self, table, name):
+        typecode, offset = self.tables[table]["columns"][name]
+        count = self.tables[table]["rows"]
+        itemsize = array.array(typecode).itemsize
+        view = self._buffer[offset:offset + count * itemsize]
+        if self._swap:
+            # Written on a machine with the other byte order; this column has to be copied.
+            values = array.array(typecode, view.tobytes())
+            values.byteswap()
+            return memoryview(values)
+        return view.cast(typecode)
+
+    def label_text(self, index):
+        return self.strings[index]
+
+    def to_structure(self):
+        """
+        Rebuild the JSON form of the structure (lists of dicts, coordinates
+        rounded to 0.1 as extract_form_structure writes them).
+        """
+        structure = {"pages": self.pages}
+        for table, names in TABLES.items():
+            values = [self.column(table, name).tolist() for name in names]
+            rows = []
+            for row in zip(*values):
+                item = {}
+                for name, value in zip(names, row):
+                    if name == "text":
+                        value = self.strings[value]
+                    elif name != "page":
+                        value = round(value, 1)
+                    item[name] = value
+                rows.append(item)
+            structure[table] = rows
+        return structure
+
+
+def load_columns(path):
+    """Map a columnar form structure file written by write_columns()."""
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    buffer = memoryview(mapped)
+    if buffer[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not a columnar form structure file")
+    (header_length,) = struct.unpack_from("<I", buffer, len(MAGIC))
+    header_start = len(MAGIC) + 4
+    header = json.loads(bytes(buffer[header_start:header_start + header_length]))
+    data_start = header_start + header_length
+    data_start += -data_start % ALIGNMENT
+    return FormColumns(buffer[data_start:], header)
+
+
+def is_columns_path(path):
+    return str(path).endswith(".fcol")
@@ -0,0 +1,72 @@
+"""
+Shared model for fields.json, the field list used by check_bounding_boxes.py,
+fill_pdf_form_with_annotations.py and create_validation_image.py.
+
+load_form_fields() parses the file once into compact __slots__ objects and
+indexes them by page, so per-page lookups are dictionary hits instead of
+scans over every page or field.
+"""
+
+import json
+
+
+class FormPage:
+    __slots__ = ("page_number", "pdf_width", "pdf_height", "image_width", "image_height")
+
+    def __init__(self, data):
+        self.page_number = data["page_number"]
+        self.pdf_width = data.get("pdf_width")
+        self.pdf_height = data.get("pdf_height")
+        self.image_width = data.get("image_width")
+        self.image_height = data.get("image_height")
+
+    @property
+    def uses_pdf_coords(self):
+        """True if the page's boxes are in PDF points rather than image pixels."""
+        return self.pdf_width is not None
+
+
+class FormField:
+    __slots__ = ("index", "page_number", "description", "field_label", "label_bounding_box", "entry_bounding_box", "entry_text")
+
+    def __init__(self, index, data):
+        self.index = index
+        self.page_number = data["page_number"]
+        self.description = data.get("description")
+        self.field_label = data.get("field_label")
+        self.label_bounding_box = data["label_bounding_box"]
+        self.entry_bounding_box = data["entry_bounding_box"]
+        self.entry_text = data.get("entry_text")
+
+
+class FormFields:
+    """
+    Fields in file order (`fields`), pages by number (`pages`) and fields
+    grouped by page in file order (`on_page(n)`).
+    """
+
+    def __init__(self, pages, fields):
+        self.pages = {page.page_number: page for page in pages}
+        self.fields = fields
+        self.by_page = {}
+        for field in fields:
+            self.by_page.setdefault(field.page_number, []).append(field)
+
+    def __len__(self):
+        return len(self.fields)
+
+    def on_page(self, page_number):
+        return self.by_page.get(page_number, [])
+
+
+def load_form_fields(source):
+    """Load fields.json from a path or an open text stream."""
+    if hasattr(source, "read"):
+        data = json.load(source)
+    else:
+        with open(source) as f:
+            data = json.load(f)
+    return FormFields(
+        [FormPage(page) for page in data.get("pages", [])],
+        [FormField(i, field) for i, field in enumerate(data["form_fields"])],
+    )
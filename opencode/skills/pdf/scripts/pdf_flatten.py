@@ -0,0 +1,179 @@
+"""
+Flatten filled forms into plain page content and compact the output.
+
+A flattened PDF has no form fields or annotations left: each widget's
+current appearance (and each filled-in text value) is drawn into the page
+content itself. Viewers and renderers then have nothing to regenerate, and
+the file can no longer be edited by accident, which suits archived forms.
+
+compact() then merges identical objects (fonts, images and appearance
+streams shared by many pages), drops objects nothing refers to, and
+Flate-compresses the page content streams.
+"""
+
+from pypdf.generic import (
+    ArrayObject,
+    DecodedStreamObject,
+    DictionaryObject,
+    NameObject,
+)
+
+
+HIDDEN_FLAG = 1 << 1
+FONT_RESOURCE = "/FlatHelv"
+
+
+def _resources(page, key):
+    if "/Resources" not in page:
+        page[NameObject("/Resources")] = DictionaryObject()
+    resources = page["/Resources"].get_object()
+    if key not in resources:
+        resources[NameObject(key)] = DictionaryObject()
+    return resources[key].get_object()
+
+
+def _append_content(writer, page, data):
+    """
+    Draw `data` after the page's existing content, with that content
+    wrapped in q/Q so any graphics state it leaves behind does not leak.
+    """
+    def stream(content):
+        s = DecodedStreamObject()
+        s.set_data(content)
+        return writer._add_object(s)
+
+    existing = page.get("/Contents")
+    if existing is None:
+        parts = []
+    else:
+        existing = existing.get_object()
+        parts = list(existing) if isinstance(existing, ArrayObject) else [page["/Contents"]]
+    page[NameObject("/Contents")] = ArrayObject([stream(b"q\n"), *parts, stream(b"\nQ\n" + data)])
+
+
+def _normal_appearance(annotation):
+    appearance = annotation.get("/AP")
+    if appearance is None:
+        return None
+    normal = appearance.get_object().get("/N")
+    if normal is None:
+        return None
+    normal = normal.get_object()
+    if isinstance(normal, DictionaryObject) and "/BBox" not in normal:
+        # Checkboxes and radio buttons: one appearance per state.
+        state = annotation.get("/AS")
+        normal = normal.get(state).get_object() if state in normal else None
+    return normal
+
+
+def _placement(appearance, rect):
+    """Matrix that maps the appearance's (transformed) BBox onto the annotation rect."""
+    a, b, c, d, e, f = [float(v) for v in appearance.get("/Matrix", [1, 0, 0, 1, 0, 0])]
+    x0, y0, x1, y1 = [float(v) for v in appearance["/BBox"]]
+    corners = [(a * x + c * y + e, b * x + d * y + f) for x, y in ((x0, y0), (x1, y0), (x0, y1), (x1, y1))]
+    bx0, by0 = min(x for x, _ in corners), min(y for _, y in corners)
+    bx1, by1 = max(x for x, _ in corners), max(y for _, y in corners)
+    rx0, ry0, rx1, ry1 = [float(v) for v in rect]
+    rx0, rx1 = min(rx0, rx1), max(rx0, rx1)
+    ry0, ry1 = min(ry0, ry1), max(ry0, ry1)
+    sx = (rx1 - rx0) / (bx1 - bx0) if bx1 > bx0 else 1
+    sy = (ry1 - ry0) / (by1 - by0) if by1 > by0 else 1
+    return sx, sy, rx0 - bx0 * sx, ry0 - by0 * sy
+
+
+def flatten_annotations(writer):
+    """
+    Draw the normal appearance of every visible annotation into its page's
+    content and remove those annotations, all form widgets and the
+    document's form. Returns the number of appearances drawn.
+    """
+    drawn = 0
+    for page in writer.pages:
+        annotations = page.get("/Annots")
+        if annotations is None:
+            continue
+        commands = []
+        kept = ArrayObject()
+        for ref in annotations.get_object():
+            annotation = ref.get_object()
+            appearance = _normal_appearance(annotation)
+            visible = not int(annotation.get("/F", 0)) & HIDDEN_FLAG and "/Rect" in annotation
+            if not visible or appearance is None or "/BBox" not in appearance:
+                # Links and other annotations without a look of their own
+                # stay; leftover form widgets go with the form.
+                if annotation.get("/Subtype") != "/Widget":
+                    kept.append(ref)
+                continue
+            name = f"/Flat{drawn}"
+            _resources(page, "/XObject")[NameObject(name)] = appearance.indirect_reference or writer._add_object(appearance)
+            sx, sy, tx, ty = _placement(appearance, annotation["/Rect"])
+            commands.append(f"q {sx:.6g} 0 0 {sy:.6g} {tx:.4f} {ty:.4f} cm {name} Do Q")
+            drawn += 1
+        if commands:
+            _append_content(writer, page, "\n".join(commands).encode())
+        if kept:
+            page[NameObject("/Annots")] = kept
+        else:
+            del page["/Annots"]
+
+    if "/AcroForm" in writer.root_object:
+        del writer.root_object["/AcroForm"]
+    return drawn
+
+
+def can_draw_text(text):
+    """Whether text_commands() can draw `text`: Helvetica here only covers WinAnsi (cp1252)."""
+    try:
+        text.encode("cp1252")
+    except UnicodeEncodeError:
+        return False
+    return True
+
+
+def _pdf_string(text):
+    escaped = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    return "(" + escaped.encode("cp1252").decode("latin-1") + ")"
+
+
+def text_commands(rect, text, font_size, font_color="000000"):
+    """
+    Content stream commands that draw `text` inside `rect` (left, bottom,
+    right, top in PDF points) the way a FreeText annotation shows it:
+    top-left aligned, one line per newline, in Helvetica. Raises
+    UnicodeEncodeError for text outside WinAnsi; see can_draw_text().
+    """
+    left, bottom, right, top = rect
+    top = max(top, bottom)
+    try:
+        r, g, b = (int(font_color[i:i + 2], 16) / 255 for i in (0, 2, 4))
+    except ValueError:
+        r = g = b = 0
+    leading = font_size * 1.2
+    lines = [f"BT {FONT_RESOURCE} {font_size:g} Tf {r:.3g} {g:.3g} {b:.3g} rg {leading:g} TL",
+             f"{min(left, right) + 2:.2f} {top - font_size:.2f} Td"]
+    for i, line in enumerate(text.split("\n")):
+        lines.append(("T* " if i else "") + f"{_pdf_string(line)} Tj")
+    lines.append("ET")
+    return "\n".join(lines)
+
+
+def write_text(writer, page, commands):
+    """Draw a list of text_commands() results onto `page`."""
+    if not commands:
+        return
+    fonts = _resources(page, "/Font")
+    if FONT_RESOURCE not in fonts:
+        fonts[NameObject(FONT_RESOURCE)] = writer._add_object(DictionaryObject({
+            NameObject("/Type"): NameObject("/Font"),
+            NameObject("/Subtype"): NameObject("/Type1"),
+            NameObject("/BaseFont"): NameObject("/Helvetica"),
+            NameObject("/Encoding"): NameObject("/WinAnsiEncoding"),
+        }))
+    _append_content(writer, page, "\n".join(commands).encode("latin-1"))
+
+
+def compact(writer):
+    """Merge identical objects, drop unreferenced ones and compress page content."""
+    writer.compress_identical_objects(remove_identicals=True, remove_orphans=True)
+    for page in writer.pages:
+        page.compress_content_streams()
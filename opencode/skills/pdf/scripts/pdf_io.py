@@ -0,0 +1,54 @@
+"""
+Shared PDF input/output helpers for the form scripts.
+
+Input PDFs are opened through mmap instead of being read into memory.
+Given a path, pypdf copies the whole file into a buffer; a mapping is only
+paged in where the parser actually reads. That saves up to the file's size
+of peak memory when a script touches a small part of a large file (an
+8.4 MB PDF: 44.6 MB peak RSS by path, 38.7 MB mapped), and nothing once
+every page is parsed (a 0.4 MB, 100-page form: 47.0 MB either way). See
+benchmark_pdf_input.py.
+
+Output PDFs are written to a temporary file and renamed into place, so
+writing over a file that is still mapped (e.g. filling a form in place)
+never truncates pages that a reader is still using.
+"""
+
+import io
+import mmap
+import os
+
+
+def _map_file(pdf_path):
+    with open(pdf_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        # The mapping keeps its own reference to the file, so the descriptor
+        # can be closed straight away.
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def open_pdf(pdf_path):
+    """
+    Return a read-only, seekable stream over the PDF at `pdf_path` that can
+    be passed anywhere a file object is accepted (PdfReader, pdfplumber.open).
+
+    Each call maps the file anew and returns an independent cursor; the
+    mapping is released when the stream is closed or garbage collected.
+    """
+    mapped = _map_file(pdf_path)
+    if mapped is None:
+        return io.BytesIO(b"")
+    return mapped
+
+
+def write_pdf(writer, output_path):
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            writer.write(f)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
@@ -0,0 +1,120 @@
+"""
+Lightweight timing spans for the pdf form scripts.
+
+Wrap each phase of a script in `with span("parse"):`; nested spans are
+recorded under their parent's name ("index/get_fields"). Pass `items=` (or
+add to the yielded record's `items`) to count what the phase processed. Spans are cheap
+enough to leave on permanently since they only wrap whole phases, never
+individual fields.
+
+Scripts accept `--profile` to print a span summary to stderr when they
+finish, or `--profile=out.pstats` to also run cProfile and save the stats.
+"""
+
+import contextlib
+import cProfile
+import pstats
+import sys
+import time
+
+
+_spans = {}
+_stack = []
+
+
+class SpanRecord:
+    __slots__ = ("calls", "seconds", "max_seconds", "items")
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.items = 0
+
+
+@contextlib.contextmanager
+def span(name, items=0):
+    _stack.append(name)
+    path = "/".join(_stack)
+    # Register on entry so the summary lists parents before their children.
+    record = _spans.get(path)
+    if record is None:
+        record = _spans[path] = SpanRecord()
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        elapsed = time.perf_counter() - start
+        _stack.pop()
+        record.calls += 1
+        record.seconds += elapsed
+        record.items += items
+        if elapsed > record.max_seconds:
+            record.max_seconds = elapsed
+
+
+def reset_spans():
+    _spans.clear()
+    _stack.clear()
+
+
+def get_spans():
+    return {
+        path: {
+            "calls": r.calls,
+            "seconds": r.seconds,
+            "max_seconds": r.max_seconds,
+            "items": r.items,
+        }
+        for path, r in _spans.items()
+    }
+
+
+def format_span_summary():
+    lines = [f"{'span':<40} {'calls':>6} {'total':>10} {'max':>10} {'items':>8}"]
+    for path, r in _spans.items():
+        indent = "  " * path.count("/")
+        name = indent + path.rsplit("/", 1)[-1]
+        lines.append(f"{name:<40} {r.calls:>6} {r.seconds * 1000:>8.1f}ms {r.max_seconds * 1000:>8.1f}ms {r.items or '':>8}")
+    return "\n".join(lines)
+
+
+def pop_profile_arg(argv):
+    """
+    Remove `--profile` / `--profile=<file.pstats>` from `argv`. Returns the
+    remaining arguments and the profile setting: None when absent, True
+    for a span summary only, or the pstats output path.
+    """
+    remaining = []
+    profile = None
+    for arg in argv:
+        if arg == "--profile":
+            profile = True
+        elif arg.startswith("--profile="):
+            profile = arg.split("=", 1)[1] or True
+        else:
+            remaining.append(arg)
+    return remaining, profile
+
+
+@contextlib.contextmanager
+def profiling(profile):
+    if profile is None:
+        yield
+        return
+
+    reset_spans()
+    profiler = cProfile.Profile() if isinstance(profile, str) else None
+    if profiler:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler:
+            profiler.disable()
+        print("\nSpan summary:", file=sys.stderr)
+        print(format_span_summary(), file=sys.stderr)
+        if profiler:
+            profiler.dump_stats(profile)
+            print(f"\nSaved cProfile stats to {profile}; top functions by cumulative time:", file=sys.stderr)
+            pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(15)
@@ -0,0 +1,128 @@
+"""
+Per-page content hashes, so the fill-and-verify loop only re-renders pages
+that changed.
+
+A page's hash covers everything that affects how it looks: its content
+streams, resources (fonts, images, form XObjects), page boxes, rotation and
+annotations, including their appearance streams and field values. Objects
+shared between pages, such as fonts, are hashed once per document.
+
+The hashes are stored next to the rendered images in `.render_cache.json`,
+together with the render settings, so a later run can tell which page images
+are still current.
+"""
+
+import hashlib
+import json
+import os
+
+from pypdf import PdfReader
+from pypdf.generic import ArrayObject, DictionaryObject, IndirectObject, StreamObject
+
+from pdf_io import open_pdf
+
+
+MANIFEST_NAME = ".render_cache.json"
+PAGE_KEYS = ("/Contents", "/Resources", "/MediaBox", "/CropBox", "/Rotate", "/UserUnit", "/Annots")
+# Back-references that would pull in the page tree or a whole field tree.
+SKIPPED_KEYS = {"/P", "/Parent", "/Kids"}
+
+
+class _PageHasher:
+    def __init__(self):
+        self.digests = {}
+        self.in_progress = set()
+
+    def _feed(self, h, obj):
+        if isinstance(obj, IndirectObject):
+            key = (obj.idnum, obj.generation)
+            digest = self.digests.get(key)
+            if digest is None:
+                if key in self.in_progress:
+                    h.update(f"ref {key}".encode())
+                    return
+                self.in_progress.add(key)
+                sub = hashlib.sha256()
+                self._feed(sub, obj.get_object())
+                self.in_progress.discard(key)
+                digest = self.digests[key] = sub.digest()
+            h.update(digest)
+        elif isinstance(obj, DictionaryObject):
+            h.update(b"<<")
+            for key in sorted(obj):
+                if key in SKIPPED_KEYS and key != "/Parent":
+                    continue
+                h.update(key.encode())
+                if key == "/Parent":
+                    # A widget's parent field holds its value; follow it but not further up.
+                    parent = obj[key].get_object()
+                    self._feed(h, DictionaryObject({k: v for k, v in parent.items() if k not in SKIPPED_KEYS}))
+                else:
+                    self._feed(h, obj.raw_get(key))
+            if isinstance(obj, StreamObject):
+                h.update(b"stream")
+                h.update(obj._data)
+            h.update(b">>")
+        elif isinstance(obj, ArrayObject):
+            h.update(b"[")
+            for item in obj:
+                self._feed(h, item)
+            h.update(b"]")
+        else:
+            h.update(repr(obj).encode())
+            h.update(b" ")
+
+    def page_hash(self, page):
+        h = hashlib.sha256()
+        for key in PAGE_KEYS:
+            if key in page:
+                h.update(key.encode())
+                self._feed(h, page.raw_get(key))
+        return h.hexdigest()
+
+
+def page_hashes(pdf_path):
+    """Return one content hash per page, in page order."""
+    reader = PdfReader(open_pdf(pdf_path))
+    hasher = _PageHasher()
+    return [hasher.page_hash(page) for page in reader.pages]
+
+
+def load_manifest(output_dir):
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(output_dir, settings, hashes):
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"settings": settings, "pages": hashes}, f)
+    os.replace(tmp_path, path)
+
+
+def discard_manifest(output_dir):
+    """Forget cached hashes once images in `output_dir` are rewritten outside the cache."""
+    try:
+        os.unlink(os.path.join(output_dir, MANIFEST_NAME))
+    except FileNotFoundError:
+        pass
+
+
+def stale_pages(output_dir, settings, hashes, image_path):
+    """
+    Page numbers (1-based) whose image in `output_dir` is missing or was
+    rendered from different content or with different settings.
+    """
+    manifest = load_manifest(output_dir)
+    previous = manifest.get("pages", []) if manifest.get("settings") == settings else []
+    return [
+        page_number
+        for page_number, page_hash in enumerate(hashes, 1)
+        if page_number > len(previous)
+        or previous[page_number - 1] != page_hash
+        or not os.path.exists(image_path(page_number))
+    ]
@@ -0,0 +1,279 @@
+"""
+Generate synthetic PDFs for benchmarking the form scripts.
+
+Fillable PDFs have text fields, checkboxes and radio groups (optionally
+nested under parent fields, so field IDs look like `g0.g1.text_3`).
+Non-fillable PDFs have rows of text labels separated by full-width lines,
+plus small square checkboxes, which is what extract_form_structure.py
+looks for.
+
+Everything is built with pypdf so no extra dependency is needed.
+"""
+
+from pypdf import PdfWriter
+from pypdf.generic import (
+    ArrayObject,
+    DecodedStreamObject,
+    DictionaryObject,
+    FloatObject,
+    NameObject,
+    NumberObject,
+    TextStringObject,
+)
+
+
+PAGE_WIDTH = 612
+PAGE_HEIGHT = 792
+MARGIN = 36
+ROW_HEIGHT = 24
+ROWS_PER_COLUMN = (PAGE_HEIGHT - 2 * MARGIN) // ROW_HEIGHT
+
+RADIO_FLAGS = (1 << 15) | (1 << 14)
+
+
+def _name(value):
+    return NameObject(value)
+
+
+def _rect(left, bottom, right, top):
+    return ArrayObject([FloatObject(left), FloatObject(bottom), FloatObject(right), FloatObject(top)])
+
+
+def _helvetica():
+    return DictionaryObject({
+        _name("/Type"): _name("/Font"),
+        _name("/Subtype"): _name("/Type1"),
+        _name("/BaseFont"): _name("/Helvetica"),
+        _name("/Encoding"): _name("/WinAnsiEncoding"),
+    })
+
+
+def _appearance(writer, size, on_state):
+    def stream(data):
+        s = DecodedStreamObject()
+        s.update({
+            _name("/Type"): _name("/XObject"),
+            _name("/Subtype"): _name("/Form"),
+            _name("/BBox"): _rect(0, 0, size, size),
+        })
+        s.set_data(data)
+        return writer._add_object(s)
+
+    on = stream(f"0 g 2 2 {size - 4} {size - 4} re f".encode())
+    off = stream(b"")
+    return DictionaryObject({
+        _name("/N"): DictionaryObject({_name(on_state): on, _name("/Off"): off}),
+    })
+
+
+def _slot_rect(index, items_on_page, width, height=16):
+    columns = max(1, -(-items_on_page // ROWS_PER_COLUMN))
+    column_width = (PAGE_WIDTH - 2 * MARGIN) / columns
+    column, row = divmod(index, ROWS_PER_COLUMN)
+    left = MARGIN + column * column_width + column_width * 0.4
+    top = PAGE_HEIGHT - MARGIN - row * ROW_HEIGHT
+    right = left + min(width, column_width * 0.55)
+    return _rect(left, top - height, right, top)
+
+
+def _add_page(writer, content):
+    page = writer.add_blank_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+    page[_name("/Resources")] = DictionaryObject({
+        _name("/Font"): DictionaryObject({_name("/F1"): writer._add_object(_helvetica())}),
+    })
+    stream = DecodedStreamObject()
+    stream.set_data(content.encode("latin-1"))
+    page[_name("/Contents")] = writer._add_object(stream)
+    return page
+
+
+def make_fillable_pdf(
+    output_path,
+    pages=1,
+    fields_per_page=10,
+    nesting_depth=0,
+    radio_groups_per_page=0,
+    checkboxes_per_page=0,
+    radio_options=3,
+):
+    """
+    Write a fillable PDF. Each page gets `fields_per_page` text fields,
+    `checkboxes_per_page` checkboxes and `radio_groups_per_page` radio
+    groups of `radio_options` buttons. With `nesting_depth` > 0, every
+    page's fields hang below a chain of that many parent fields.
+    """
+    writer = PdfWriter()
+    helv = writer._add_object(_helvetica())
+    top_level_fields = ArrayObject()
+
+    for page_index in range(pages):
+        items_on_page = fields_per_page + checkboxes_per_page + radio_groups_per_page
+        page = _add_page(writer, "")
+        page_ref = page.indirect_reference
+        annots = ArrayObject()
+
+        parent_ref = None
+        for level in range(nesting_depth):
+            parent = DictionaryObject({
+                _name("/T"): TextStringObject(f"p{page_index + 1}_g{level}"),
+                _name("/Kids"): ArrayObject(),
+            })
+            if parent_ref is not None:
+                parent[_name("/Parent")] = parent_ref
+            ref = writer._add_object(parent)
+            if parent_ref is None:
+                top_level_fields.append(ref)
+            else:
+                parent_ref.get_object()["/Kids"].append(ref)
+            parent_ref = ref
+
+        def attach(ref):
+            if parent_ref is None:
+                top_level_fields.append(ref)
+            else:
+                ref.get_object()[_name("/Parent")] = parent_ref
+                parent_ref.get_object()["/Kids"].append(ref)
+
+        slot = 0
+        for i in range(fields_per_page):
+            field = DictionaryObject({
+                _name("/Type"): _name("/Annot"),
+                _name("/Subtype"): _name("/Widget"),
+                _name("/FT"): _name("/Tx"),
+                _name("/T"): TextStringObject(f"text_{page_index + 1}_{i}"),
+                _name("/Rect"): _slot_rect(slot, items_on_page, 200),
+                _name("/P"): page_ref,
+                _name("/DA"): TextStringObject("/Helv 10 Tf 0 g"),
+            })
+            ref = writer._add_object(field)
+            attach(ref)
+            annots.append(ref)
+            slot += 1
+
+        for i in range(checkboxes_per_page):
+            field = DictionaryObject({
+                _name("/Type"): _name("/Annot"),
+                _name("/Subtype"): _name("/Widget"),
+                _name("/FT"): _name("/Btn"),
+                _name("/T"): TextStringObject(f"check_{page_index + 1}_{i}"),
+                _name("/Rect"): _slot_rect(slot, items_on_page, 12, 12),
+                _name("/P"): page_ref,
+                _name("/V"): _name("/Off"),
+                _name("/AS"): _name("/Off"),
+                _name("/AP"): _appearance(writer, 12, "/Yes"),
+            })
+            ref = writer._add_object(field)
+            attach(ref)
+            annots.append(ref)
+            slot += 1
+
+        for i in range(radio_groups_per_page):
+            group = DictionaryObject({
+                _name("/FT"): _name("/Btn"),
+                _name("/Ff"): NumberObject(RADIO_FLAGS),
+                _name("/T"): TextStringObject(f"radio_{page_index + 1}_{i}"),
+                _name("/V"): _name("/Off"),
+                _name("/Kids"): ArrayObject(),
+            })
+            group_ref = writer._add_object(group)
+            attach(group_ref)
+            base = _slot_rect(slot, items_on_page, 12, 12)
+            for option in range(radio_options):
+                left = float(base[0]) + option * 18
+                kid = DictionaryObject({
+                    _name("/Type"): _name("/Annot"),
+                    _name("/Subtype"): _name("/Widget"),
+                    _name("/Parent"): group_ref,
+                    _name("/Rect"): _rect(left, float(base[1]), left + 12, float(base[3])),
+                    _name("/P"): page_ref,
+                    _name("/AS"): _name("/Off"),
+                    _name("/AP"): _appearance(writer, 12, f"/option{option}"),
+                })
+                kid_ref = writer._add_object(kid)
+                group["/Kids"].append(kid_ref)
+                annots.append(kid_ref)
+            slot += 1
+
+        page[_name("/Annots")] = annots
+
+    writer._root_object[_name("/AcroForm")] = writer._add_object(DictionaryObject({
+        _name("/Fields"): top_level_fields,
+        _name("/DR"): DictionaryObject({
+            _name("/Font"): DictionaryObject({_name("/Helv"): helv}),
+        }),
+        _name("/DA"): TextStringObject("/Helv 0 Tf 0 g"),
+    }))
+
+    with open(output_path, "wb") as f:
+        writer.write(f)
+
+
+def make_field_values(field_info):
+    """Build a field_values.json list that sets every field in `field_info`."""
+    values = []
+    for field in field_info:
+        value = {"field_id": field["field_id"], "page": field["page"]}
+        if field["type"] == "checkbox":
+            value["value"] = field["checked_value"]
+        elif field["type"] == "radio_group":
+            value["value"] = field["radio_options"][-1]["value"]
+        elif field["type"] == "text":
+            value["value"] = f"Value for {field['field_id']}"
+        else:
+            continue
+        values.append(value)
+    return values
+
+
+def _non_fillable_layout(rows_per_page):
+    columns = max(1, -(-rows_per_page // ROWS_PER_COLUMN))
+    column_width = (PAGE_WIDTH - 2 * MARGIN) / columns
+    for i in range(rows_per_page):
+        column, row = divmod(i, ROWS_PER_COLUMN)
+        x = MARGIN + column * column_width
+        top = MARGIN + row * ROW_HEIGHT
+        yield i, row, x, top, column_width
+
+
+def make_non_fillable_pdf(output_path, pages=1, rows_per_page=10, checkboxes_per_page=0):
+    """
+    Write a non-fillable PDF and return a matching fields.json structure (in
+    PDF coordinates) for check_bounding_boxes.py and
+    fill_pdf_form_with_annotations.py.
+    """
+    writer = PdfWriter()
+    fields = {"pages": [], "form_fields": []}
+
+    for page_index in range(pages):
+        page_number = page_index + 1
+        ops = []
+        rows_drawn = set()
+        for i, row, x, top, column_width in _non_fillable_layout(rows_per_page):
+            label = f"Label {page_number}-{i}:"
+            baseline = PAGE_HEIGHT - top - 10
+            ops.append(f"BT /F1 10 Tf {x:.1f} {baseline:.1f} Td ({label}) Tj ET")
+            if row not in rows_drawn:
+                rows_drawn.add(row)
+                y = PAGE_HEIGHT - top - 18
+                ops.append(f"{MARGIN} {y:.1f} m {PAGE_WIDTH - MARGIN} {y:.1f} l S")
+            label_right = x + column_width * 0.35
+            entry_left = label_right + 4
+            entry_right = x + column_width - 18
+            fields["form_fields"].append({
+                "page_number": page_number,
+                "description": f"Row {i} on page {page_number}",
+                "field_label": label,
+                "label_bounding_box": [x, top, label_right, top + 12],
+                "entry_bounding_box": [entry_left, top, entry_right, top + 16],
+                "entry_text": {"text": f"Value {page_number}-{i}", "font_size": 10},
+            })
+            if i < checkboxes_per_page:
+                box_x = x + column_width - 14
+                box_y = PAGE_HEIGHT - top - 12
+                ops.append(f"{box_x:.1f} {box_y:.1f} 10 10 re S")
+        _add_page(writer, "\n".join(ops))
+        fields["pages"].append({"page_number": page_number, "pdf_width": PAGE_WIDTH, "pdf_height": PAGE_HEIGHT})
+
+    with open(output_path, "wb") as f:
+        writer.write(f)
+    return fields
@@ -4,20 +4,45 @@ Skill Initializer - Creates a new skill from template
 
 Usage:
     init_skill.py <skill-name> --path <path>
+    init_skill.py --manifest <manifest.yaml|manifest.json> --path <path>
 
 Examples:
     init_skill.py my-new-skill --path skills/public
     init_skill.py my-api-helper --path skills/private
     init_skill.py custom-skill --path /custom/location
+    init_skill.py --manifest catalogue.yaml --path skills/private
+
+Manifest format (YAML or JSON). Template overrides replace the default
+content of a file (null removes it); {skill_name}, {skill_title} and
+{description} are substituted. Top-level templates apply to every skill.
+Template paths are relative to the skill directory and must stay inside it.
+
+    templates:
+      assets/example_asset.txt: null
+    skills:
+      - name: invoice-parser
+        description: Parse supplier invoices. Use when ...
+        templates:
+          references/api_reference.md: "# {skill_title} API"
+      - name: report-writer
 """
 
+import json
+import os
+import re
+import shutil
 import sys
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
 
+import yaml
+
+from quick_validate import validate_skill
+
 
 SKILL_TEMPLATE = """---
 name: {skill_name}
-description: [TODO: Complete and informative explanation of what the skill does and when to use it. Include WHEN to use this skill - specific scenarios, file types, or tasks that trigger it.]
+description: {description}
 ---
 
 # {skill_title}
@@ -102,6 +127,8 @@ Files not intended to be loaded into context, but rather used within the output
 **Any unneeded directories can be deleted.** Not every skill requires all three types of resources.
 """
 
+TODO_DESCRIPTION = "[TODO: Complete and informative explanation of what the skill does and when to use it. Include WHEN to use this skill - specific scenarios, file types, or tasks that trigger it.]"
+
 EXAMPLE_SCRIPT = '''#!/usr/bin/env python3
 """
 Example helper script for {skill_name}
@@ -222,7 +249,8 @@ def init_skill(skill_name, path):
     skill_title = title_case_skill_name(skill_name)
     skill_content = SKILL_TEMPLATE.format(
         skill_name=skill_name,
-        skill_title=skill_title
+        skill_title=skill_title,
+        description=TODO_DESCRIPTION
     )
 
     skill_md_path = skill_dir / 'SKILL.md'
@@ -270,9 +298,195 @@ def init_skill(skill_name, path):
     return skill_dir
 
 
+def _render_skill_files(skill_name, description=None, overrides=None):
+    """
+    Render the template files for a skill.
+
+    Returns:
+        Dict of relative path -> file content
+    """
+    skill_title = title_case_skill_name(skill_name)
+    # YAML accepts JSON strings, so quoting keeps colons and the like intact.
+    description_yaml = json.dumps(description) if description else TODO_DESCRIPTION
+    files = {
+        'SKILL.md': SKILL_TEMPLATE.format(
+            skill_name=skill_name, skill_title=skill_title, description=description_yaml
+        ),
+        'scripts/example.py': EXAMPLE_SCRIPT.format(skill_name=skill_name),
+        'references/api_reference.md': EXAMPLE_REFERENCE.format(skill_title=skill_title),
+        'assets/example_asset.txt': EXAMPLE_ASSET,
+    }
+    for relative_path, template in (overrides or {}).items():
+        if template is None:
+            files.pop(relative_path, None)
+            continue
+        # Plain replacement rather than str.format, so braces in code or
+        # JSON templates are left alone.
+        files[relative_path] = (
+            str(template)
+            .replace('{skill_name}', skill_name)
+            .replace('{skill_title}', skill_title)
+            .replace('{description}', description or '')
+        )
+    return files
+
+
+def _is_within(root, relative_path):
+    """True if `relative_path` names a file strictly inside `root`."""
+    root = root.resolve()
+    target = (root / relative_path).resolve()
+    return root in target.parents
+
+
+def _write_file(file_path, content):
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    file_path.write_text(content)
+    if file_path.parent.name == 'scripts' and file_path.suffix == '.py':
+        file_path.chmod(0o755)
+
+
+def load_manifest(manifest_path):
+    """Load a YAML or JSON skill manifest into (skills, default_templates)."""
+    manifest_path = Path(manifest_path)
+    text = manifest_path.read_text()
+    if manifest_path.suffix.lower() == '.json':
+        manifest = json.loads(text)
+    else:
+        manifest = yaml.safe_load(text)
+    if isinstance(manifest, list):
+        return manifest, {}
+    if not isinstance(manifest, dict) or not isinstance(manifest.get('skills'), list):
+        raise ValueError("Manifest must be a list of skills or a mapping with a 'skills' list")
+    templates = manifest.get('templates') or {}
+    if not isinstance(templates, dict):
+        raise ValueError("Manifest 'templates' must be a mapping of path -> content")
+    return manifest['skills'], templates
+
+
+def init_skills_from_manifest(manifest_path, path, workers=None):
+    """
+    Initialize every skill listed in a manifest in one process.
+
+    Each skill is written into a temporary directory and renamed into place
+    once complete, so a failure never leaves a half-written skill behind.
+    File writes for all skills run on a thread pool. Every created skill is
+    validated with quick_validate at the end.
+
+    Args:
+        manifest_path: Path to a YAML or JSON manifest
+        path: Path where the skill directories should be created
+        workers: Number of writer threads (defaults to the executor default)
+
+    Returns:
+        (results, problems): a list of (skill_name, skill_dir, valid,
+        message) for the created skills and the number of manifest entries
+        that were skipped or failed to write; None if the manifest could not
+        be used
+    """
+    try:
+        skills, default_templates = load_manifest(manifest_path)
+    except Exception as e:
+        print(f"❌ Error reading manifest: {e}")
+        return None
+
+    base_dir = Path(path).resolve()
+    base_dir.mkdir(parents=True, exist_ok=True)
+
+    plans = []
+    seen = set()
+    problems = 0
+    for number, entry in enumerate(skills, 1):
+        if isinstance(entry, str):
+            entry = {'name': entry}
+        if not isinstance(entry, dict):
+            print(f"❌ Skipping entry {number}: expected a skill name or mapping, got {entry!r}")
+            problems += 1
+            continue
+        skill_name = str(entry.get('name', ''))
+        if not re.match(r'^[a-z0-9]+(-[a-z0-9]+)*$', skill_name) or len(skill_name) > 64:
+            print(f"❌ Skipping invalid skill name: {skill_name!r}")
+            problems += 1
+            continue
+        skill_dir = base_dir / skill_name
+        if skill_name in seen:
+            print(f"❌ Skipping {skill_name}: listed more than once")
+            problems += 1
+            continue
+        if skill_dir.exists():
+            print(f"❌ Skipping {skill_name}: skill directory already exists: {skill_dir}")
+            problems += 1
+            continue
+        seen.add(skill_name)
+        templates = entry.get('templates') or {}
+        if not isinstance(templates, dict):
+            print(f"❌ Skipping {skill_name}: 'templates' must be a mapping of path -> content")
+            problems += 1
+            continue
+        overrides = dict(default_templates)
+        overrides.update(templates)
+        files = _render_skill_files(skill_name, entry.get('description'), overrides)
+        tmp_dir = base_dir / f".{skill_name}.tmp-{os.getpid()}"
+        outside = [relative_path for relative_path in files if not _is_within(tmp_dir, relative_path)]
+        if outside:
+            print(f"❌ Skipping {skill_name}: template path outside the skill directory: {outside[0]!r}")
+            problems += 1
+            continue
+        plans.append((skill_name, skill_dir, tmp_dir, files))
+
+    created = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = [
+            (skill_name, skill_dir, tmp_dir, [
+                pool.submit(_write_file, tmp_dir / relative_path, content)
+                for relative_path, content in files.items()
+            ])
+            for skill_name, skill_dir, tmp_dir, files in plans
+        ]
+        for skill_name, skill_dir, tmp_dir, futures in pending:
+            # Let every write for this skill finish first, so a queued write
+            # cannot recreate the temporary directory after it is removed.
+            wait(futures)
+            try:
+                for future in futures:
+                    future.result()
+                tmp_dir.rename(skill_dir)
+                created.append((skill_name, skill_dir))
+            except Exception as e:
+                print(f"❌ Error creating {skill_name}: {e}")
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+                problems += 1
+
+    print(f"✅ Created {len(created)} of {len(skills)} skill(s) in {base_dir}")
+    if problems:
+        print(f"❌ {problems} manifest entr{'y' if problems == 1 else 'ies'} skipped or failed")
+
+    results = []
+    for skill_name, skill_dir in created:
+        valid, message = validate_skill(skill_dir)
+        results.append((skill_name, skill_dir, valid, message))
+        if not valid:
+            print(f"⚠️  {skill_name}: {message}")
+    invalid = sum(1 for result in results if not result[2])
+    if invalid:
+        print(f"   {invalid} skill(s) need edits before they validate (e.g. fill in the TODO description)")
+    else:
+        print("✅ All created skills pass validation")
+    return results, problems
+
+
 def main():
+    if len(sys.argv) == 5 and sys.argv[1] == '--manifest' and sys.argv[3] == '--path':
+        manifest_path = sys.argv[2]
+        path = sys.argv[4]
+        print(f"🚀 Initializing skills from manifest: {manifest_path}")
+        print(f"   Location: {path}")
+        print()
+        outcome = init_skills_from_manifest(manifest_path, path)
+        sys.exit(0 if outcome is not None and not outcome[1] else 1)
+
     if len(sys.argv) < 4 or sys.argv[2] != '--path':
         print("Usage: init_skill.py <skill-name> --path <path>")
+        print("       init_skill.py --manifest <manifest.yaml|manifest.json> --path <path>")
         print("\nSkill name requirements:")
         print("  - Kebab-case identifier (e.g., 'my-data-analyzer')")
         print("  - Lowercase letters, digits, and hyphens only")
@@ -282,6 +496,7 @@ def main():
         print("  init_skill.py my-new-skill --path skills/public")
         print("  init_skill.py my-api-helper --path skills/private")
         print("  init_skill.py custom-skill --path /custom/location")
+        print("  init_skill.py --manifest catalogue.yaml --path skills/private")
         sys.exit(1)
 
     skill_name = sys.argv[1]
@@ -3,26 +3,254 @@
 Skill Packager - Creates a distributable .skill file of a skill folder
 
 Usage:
-    python utils/package_skill.py <path/to/skill-folder> [output-directory]
+    python utils/package_skill.py <path/to/skill-folder> [output-directory] [--incremental]
 
 Example:
     python utils/package_skill.py skills/public/my-skill
     python utils/package_skill.py skills/public/my-skill ./dist
+    python utils/package_skill.py skills/public/my-skill ./dist --incremental
+    python utils/package_skill.py skills/public/my-skill ./dist --deterministic
+    python utils/package_skill.py --all skills/public ./dist
+
+With --incremental, already-compressed files (images, PDFs, archives, ...)
+are stored as-is, everything else is compressed in parallel, and entries
+whose content is unchanged since the previous build are copied straight
+from the previous .skill file. A manifest of path/size/mtime/hash is kept
+next to the .skill file to detect unchanged entries.
+
+With --deterministic, entries are sorted and written with a fixed timestamp
+and normalized permissions, so the same skill contents always produce a
+byte-identical .skill file. Its SHA-256 is written to <name>.skill.sha256.
+
+With --all, every skill under the given directory is packaged
+deterministically, and each file is also written once to a
+content-addressed blob store (blobs/<sha256>) described by index.json, so
+files shared between skills are stored only once.
 """
 
+import argparse
+import hashlib
+import json
+import os
+import struct
 import sys
 import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from quick_validate import validate_skill
 
 
-def package_skill(skill_path, output_dir=None):
+# File types that are already compressed; deflating them again costs time
+# and saves next to nothing.
+STORED_SUFFIXES = {
+    '.png', '.jpg', '.jpeg', '.gif', '.webp', '.ico',
+    '.pdf', '.zip', '.gz', '.tgz', '.bz2', '.xz', '.7z', '.skill',
+    '.docx', '.xlsx', '.pptx', '.woff', '.woff2',
+    '.mp3', '.mp4', '.mov', '.ogg', '.webm',
+}
+
+MANIFEST_VERSION = 1
+
+# The earliest timestamp a zip entry can hold; used for every entry in
+# deterministic archives.
+FIXED_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+def _manifest_path(skill_filename):
+    return skill_filename.with_name(skill_filename.name + '.manifest.json')
+
+
+def _load_manifest(skill_filename):
+    """Load the previous build's manifest, or an empty one if unusable."""
+    manifest_path = _manifest_path(skill_filename)
+    if not skill_filename.exists() or not manifest_path.exists():
+        return {}
+    try:
+        manifest = json.loads(manifest_path.read_text())
+    except (OSError, ValueError):
+        return {}
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {}
+    return manifest.get('entries', {})
+
+
+def _entry_info(file_path, arcname, deterministic, date_time=None):
+    """Create the ZipInfo for a file, normalized if deterministic."""
+    if not deterministic:
+        zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+        if date_time:
+            zinfo.date_time = date_time
+        return zinfo
+    zinfo = zipfile.ZipInfo(arcname, FIXED_DATE_TIME)
+    # create_system defaults to the host OS; pin it so Windows and Unix
+    # builds match.
+    zinfo.create_system = 3
+    mode = 0o755 if file_path.stat().st_mode & 0o111 else 0o644
+    zinfo.external_attr = (0o100000 | mode) << 16
+    return zinfo
+
+
+def _build_entry(file_path, arcname, deterministic=False):
+    """Read, hash and (unless already compressed) deflate one file."""
+    data = file_path.read_bytes()
+    zinfo = _entry_info(file_path, arcname, deterministic)
+    zinfo.file_size = len(data)
+    zinfo.CRC = zlib.crc32(data)
+    if file_path.suffix.lower() in STORED_SUFFIXES:
+        zinfo.compress_type = zipfile.ZIP_STORED
+        payload = data
+    else:
+        zinfo.compress_type = zipfile.ZIP_DEFLATED
+        compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+        payload = compressor.compress(data) + compressor.flush()
+    zinfo.compress_size = len(payload)
+    return zinfo, payload, hashlib.sha256(data).hexdigest()
+
+
+def _read_raw_entry(archive_file, zinfo):
+    """Return the still-compressed bytes of an entry in an existing zip."""
+    archive_file.seek(zinfo.header_offset)
+    header = archive_file.read(30)
+    name_length, extra_length = struct.unpack('<HH', header[26:30])
+    archive_file.seek(zinfo.header_offset + 30 + name_length + extra_length)
+    return archive_file.read(zinfo.compress_size)
+
+
+def _write_raw_entry(zipf, zinfo, payload):
+    """
+    Append an already-compressed entry. zipfile has no public API for this,
+    so write the local header and payload directly and register the entry
+    so close() includes it in the central directory.
+    """
+    zinfo.flag_bits &= ~0x08
+    zinfo.header_offset = zipf.fp.tell()
+    zipf.fp.write(zinfo.FileHeader())
+    zipf.fp.write(payload)
+    zipf.filelist.append(zinfo)
+    zipf.NameToInfo[zinfo.filename] = zinfo
+    zipf.start_dir = zipf.fp.tell()
+    zipf._didModify = True
+
+
+def _reusable_entry(file_path, arcname, previous, old_infos):
+    """Return the old ZipInfo for an entry if its content has not changed."""
+    entry = previous.get(arcname)
+    old_info = old_infos.get(arcname)
+    if not entry or not old_info or old_info.CRC != entry['crc']:
+        return None
+    stat = file_path.stat()
+    if stat.st_size != entry['size']:
+        return None
+    if stat.st_mtime_ns != entry['mtime_ns']:
+        if hashlib.sha256(file_path.read_bytes()).hexdigest() != entry['sha256']:
+            return None
+    return old_info
+
+
+def _write_archive(skill_path, skill_filename, incremental=False, deterministic=False, workers=None):
+    """
+    Build the .skill file with pre-compressed entries, optionally reusing
+    unchanged entries from the previous build. Returns counts of reused,
+    deflated and stored entries, and the path/sha256 of every entry.
+    """
+    files = sorted(
+        (file_path.relative_to(skill_path.parent).as_posix(), file_path)
+        for file_path in skill_path.rglob('*')
+        if file_path.is_file()
+    )
+    previous = _load_manifest(skill_filename) if incremental else {}
+    old_infos = {}
+    if previous:
+        with zipfile.ZipFile(skill_filename) as old_archive:
+            old_infos = {info.filename: info for info in old_archive.infolist()}
+
+    reused = {}
+    to_build = []
+    for arcname, file_path in files:
+        old_info = _reusable_entry(file_path, arcname, previous, old_infos)
+        if old_info:
+            reused[arcname] = old_info
+        else:
+            to_build.append((file_path, arcname))
+
+    # zlib releases the GIL while compressing, so threads give real
+    # parallelism here.
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        built = dict(zip(
+            (arcname for _, arcname in to_build),
+            pool.map(lambda item: _build_entry(*item, deterministic), to_build),
+        ))
+
+    counts = {'reused': 0, 'deflated': 0, 'stored': 0}
+    entries = {}
+    tmp_filename = skill_filename.with_name(skill_filename.name + f'.{os.getpid()}.tmp')
+    old_file = open(skill_filename, 'rb') if reused else None
+    try:
+        with zipfile.ZipFile(tmp_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
+            for arcname, file_path in files:
+                if arcname in reused:
+                    old_info = reused[arcname]
+                    zinfo = _entry_info(file_path, arcname, deterministic, old_info.date_time)
+                    zinfo.compress_type = old_info.compress_type
+                    zinfo.CRC = old_info.CRC
+                    zinfo.file_size = old_info.file_size
+                    zinfo.compress_size = old_info.compress_size
+                    payload = _read_raw_entry(old_file, old_info)
+                    sha256 = previous[arcname]['sha256']
+                    counts['reused'] += 1
+                else:
+                    zinfo, payload, sha256 = built[arcname]
+                    counts['stored' if zinfo.compress_type == zipfile.ZIP_STORED else 'deflated'] += 1
+                _write_raw_entry(zipf, zinfo, payload)
+                stat = file_path.stat()
+                entries[arcname] = {
+                    'size': stat.st_size,
+                    'mtime_ns': stat.st_mtime_ns,
+                    'sha256': sha256,
+                    'crc': zinfo.CRC,
+                }
+        os.replace(tmp_filename, skill_filename)
+    finally:
+        if old_file:
+            old_file.close()
+        if tmp_filename.exists():
+            tmp_filename.unlink()
+
+    if incremental:
+        _manifest_path(skill_filename).write_text(
+            json.dumps({'version': MANIFEST_VERSION, 'entries': entries}, indent=2)
+        )
+    return counts, {arcname: (file_path, entries[arcname]['sha256']) for arcname, file_path in files}
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_archive_hash(skill_filename):
+    """Write <name>.skill.sha256 (sha256sum format) and return the hash."""
+    archive_hash = _file_sha256(skill_filename)
+    skill_filename.with_name(skill_filename.name + '.sha256').write_text(
+        f"{archive_hash}  {skill_filename.name}\n"
+    )
+    return archive_hash
+
+
+def package_skill(skill_path, output_dir=None, incremental=False, deterministic=False):
     """
     Package a skill folder into a .skill file.
 
     Args:
         skill_path: Path to the skill folder
         output_dir: Optional output directory for the .skill file (defaults to current directory)
+        incremental: Store already-compressed files, compress the rest in parallel,
+            and reuse entries unchanged since the previous build
+        deterministic: Write a byte-reproducible archive and its SHA-256
 
     Returns:
         Path to the created .skill file, or None if error
@@ -63,6 +291,20 @@ def package_skill(skill_path, output_dir=None):
 
     skill_filename = output_path / f"{skill_name}.skill"
 
+    if incremental or deterministic:
+        try:
+            counts, _ = _write_archive(skill_path, skill_filename, incremental, deterministic)
+        except Exception as e:
+            print(f"❌ Error creating .skill file: {e}")
+            return None
+        total = sum(counts.values())
+        print(f"  Packaged {total} files: {counts['reused']} reused, "
+              f"{counts['deflated']} compressed, {counts['stored']} stored")
+        if deterministic:
+            print(f"  SHA-256: {_write_archive_hash(skill_filename)}")
+        print(f"\n✅ Successfully packaged skill to: {skill_filename}")
+        return skill_filename
+
     # Create the .skill file (zip format)
     try:
         with zipfile.ZipFile(skill_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
@@ -82,23 +324,128 @@ def package_skill(skill_path, output_dir=None):
         return None
 
 
+def _store_blob(blob_dir, sha256, source_path):
+    """Copy a file into the blob store unless a blob with its hash exists."""
+    blob_path = blob_dir / sha256[:2] / sha256
+    if blob_path.exists():
+        return False
+    blob_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = blob_path.with_name(blob_path.name + f'.{os.getpid()}.tmp')
+    tmp_path.write_bytes(source_path.read_bytes())
+    os.replace(tmp_path, blob_path)
+    return True
+
+
+def package_skills_tree(skills_root, output_dir, incremental=False):
+    """
+    Deterministically package every skill under a directory, and store
+    every file once in a content-addressed blob store.
+
+    Args:
+        skills_root: Directory containing skill folders (searched recursively for SKILL.md)
+        output_dir: Directory for the .skill files, blobs/ and index.json
+        incremental: Reuse unchanged entries from the previous build of each skill
+
+    Returns:
+        Path to index.json, or None if any skill failed
+    """
+    skills_root = Path(skills_root).resolve()
+    output_path = Path(output_dir).resolve()
+    output_path.mkdir(parents=True, exist_ok=True)
+    blob_dir = output_path / 'blobs'
+
+    skill_dirs = sorted(skill_md.parent for skill_md in skills_root.rglob('SKILL.md'))
+    if not skill_dirs:
+        print(f"❌ Error: No SKILL.md found under {skills_root}")
+        return None
+
+    index = {'skills': {}, 'blobs': {}}
+    failed = []
+    total_bytes = 0
+    for skill_path in skill_dirs:
+        skill_name = skill_path.name
+        if skill_name in index['skills']:
+            print(f"❌ {skill_name}: duplicate skill name ({skill_path})")
+            failed.append(skill_name)
+            continue
+        valid, message = validate_skill(skill_path)
+        if not valid:
+            print(f"❌ {skill_name}: {message}")
+            failed.append(skill_name)
+            continue
+
+        skill_filename = output_path / f"{skill_name}.skill"
+        try:
+            _, entries = _write_archive(skill_path, skill_filename, incremental, deterministic=True)
+        except Exception as e:
+            print(f"❌ {skill_name}: error creating .skill file: {e}")
+            failed.append(skill_name)
+            continue
+        archive_hash = _write_archive_hash(skill_filename)
+
+        new_blobs = 0
+        files = {}
+        for arcname, (file_path, sha256) in entries.items():
+            files[arcname] = sha256
+            size = file_path.stat().st_size
+            total_bytes += size
+            index['blobs'][sha256] = size
+            new_blobs += _store_blob(blob_dir, sha256, file_path)
+        index['skills'][skill_name] = {
+            'archive': skill_filename.name,
+            'sha256': archive_hash,
+            'files': files,
+        }
+        print(f"✅ {skill_name}: {len(files)} files, {new_blobs} new blobs, sha256 {archive_hash[:12]}")
+
+    index_path = output_path / 'index.json'
+    index_path.write_text(json.dumps(index, indent=2, sort_keys=True) + '\n')
+
+    unique_bytes = sum(index['blobs'].values())
+    print(f"\n📦 Packaged {len(index['skills'])} skills; {len(index['blobs'])} unique blobs, "
+          f"{unique_bytes} of {total_bytes} bytes after dedup")
+    print(f"   Index: {index_path}")
+    if failed:
+        print(f"❌ {len(failed)} skill(s) failed: {', '.join(failed)}")
+        return None
+    return index_path
+
+
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python utils/package_skill.py <path/to/skill-folder> [output-directory]")
-        print("\nExample:")
-        print("  python utils/package_skill.py skills/public/my-skill")
-        print("  python utils/package_skill.py skills/public/my-skill ./dist")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description="Package a skill folder into a distributable .skill file",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python utils/package_skill.py skills/public/my-skill
+  python utils/package_skill.py skills/public/my-skill ./dist
+  python utils/package_skill.py skills/public/my-skill ./dist --incremental
+  python utils/package_skill.py skills/public/my-skill ./dist --deterministic
+  python utils/package_skill.py --all skills/public ./dist
+        """,
+    )
+    parser.add_argument("skill_path", help="Path to the skill folder (or skills tree with --all)")
+    parser.add_argument("output_dir", nargs="?", help="Output directory (default: current directory)")
+    parser.add_argument("--incremental", action="store_true", help="Reuse unchanged entries and compress in parallel")
+    parser.add_argument("--deterministic", action="store_true", help="Write a byte-reproducible archive and its SHA-256")
+    parser.add_argument("--all", action="store_true", help="Package every skill under skill_path into a deduplicated blob store")
+    args = parser.parse_args()
+
+    if args.all:
+        print(f"📦 Packaging all skills under: {args.skill_path}")
+        print()
+        result = package_skills_tree(args.skill_path, args.output_dir or Path.cwd(), args.incremental)
+        sys.exit(0 if result else 1)
 
-    skill_path = sys.argv[1]
-    output_dir = sys.argv[2] if len(sys.argv) > 2 else None
+    skill_path = args.skill_path
+    output_dir = args.output_dir
 
     print(f"📦 Packaging skill: {skill_path}")
     if output_dir:
         print(f"   Output directory: {output_dir}")
     print()
 
-    result = package_skill(skill_path, output_dir)
+    result = package_skill(skill_path, output_dir, incremental=args.incremental, deterministic=args.deterministic)
 
     if result:
         sys.exit(0)
@@ -1,14 +1,76 @@
 #!/usr/bin/env python3
 """
 Quick validation script for skills - minimal version
+
+Usage:
+    python quick_validate.py <skill_directory>
+    python quick_validate.py --all <skills_directory> [--cache cache.json] [-o summary.json]
+
+With --all, every SKILL.md under the directory is validated in a process
+pool and a JSON summary is printed (or written with -o). With --cache,
+results are stored keyed by a hash of each file's frontmatter, so skills
+whose frontmatter has not changed are not validated again.
 """
 
+import argparse
+import hashlib
+import json
 import sys
 import os
 import re
+import time
 import yaml
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+FRONTMATTER_PATTERN = re.compile(rb'^---\r?\n(.*?)\r?\n---', re.DOTALL)
+
+# The C loader is several times faster when libyaml is available.
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+CACHE_VERSION = 1
+
+
+def read_frontmatter(skill_md, chunk_size=4096):
+    """
+    Read only as much of SKILL.md as needed to extract its frontmatter.
+
+    Returns:
+        (frontmatter_bytes, None) on success, or (None, error_message)
+    """
+    content = b''
+    with open(skill_md, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            content += chunk
+            if len(content) >= 3 and not content.startswith(b'---'):
+                return None, "No YAML frontmatter found"
+            match = FRONTMATTER_PATTERN.match(content)
+            if match:
+                return match.group(1).replace(b'\r\n', b'\n'), None
+            if not chunk:
+                break
+    if not content.startswith(b'---'):
+        return None, "No YAML frontmatter found"
+    return None, "Invalid frontmatter format"
+
+
+def load_frontmatter(frontmatter_bytes):
+    """
+    Parse frontmatter bytes as YAML.
+
+    Returns:
+        (frontmatter_dict, None) on success, or (None, error_message)
+    """
+    try:
+        frontmatter = yaml.load(frontmatter_bytes.decode('utf-8'), Loader=YAML_LOADER)
+        if not isinstance(frontmatter, dict):
+            return None, "Frontmatter must be a YAML dictionary"
+    except (yaml.YAMLError, UnicodeDecodeError) as e:
+        return None, f"Invalid YAML in frontmatter: {e}"
+    return frontmatter, None
+
+
 def validate_skill(skill_path):
     """Basic validation of a skill"""
     skill_path = Path(skill_path)
@@ -19,24 +81,18 @@ def validate_skill(skill_path):
         return False, "SKILL.md not found"
 
     # Read and validate frontmatter
-    content = skill_md.read_text()
-    if not content.startswith('---'):
-        return False, "No YAML frontmatter found"
+    frontmatter_bytes, error = read_frontmatter(skill_md)
+    if error:
+        return False, error
+    return validate_frontmatter(frontmatter_bytes)
 
-    # Extract frontmatter
-    match = re.match(r'^---\n(.*?)\n---', content, re.DOTALL)
-    if not match:
-        return False, "Invalid frontmatter format"
-
-    frontmatter_text = match.group(1)
 
+def validate_frontmatter(frontmatter_bytes):
+    """Validate the frontmatter of a SKILL.md"""
     # Parse YAML frontmatter
-    try:
-        frontmatter = yaml.safe_load(frontmatter_text)
-        if not isinstance(frontmatter, dict):
-            return False, "Frontmatter must be a YAML dictionary"
-    except yaml.YAMLError as e:
-        return False, f"Invalid YAML in frontmatter: {e}"
+    frontmatter, error = load_frontmatter(frontmatter_bytes)
+    if error:
+        return False, error
 
     # Define allowed properties
     ALLOWED_PROPERTIES = {'name', 'description', 'license', 'allowed-tools', 'metadata', 'compatibility'}
@@ -93,11 +149,127 @@ def validate_skill(skill_path):
 
     return True, "Skill is valid!"
 
+
+def _validate_skill_md(skill_md):
+    """Validate one SKILL.md; runs in a worker process."""
+    start = time.perf_counter()
+    stat = os.stat(skill_md)
+    frontmatter_bytes, error = read_frontmatter(skill_md)
+    if error:
+        valid, message, digest = False, error, None
+    else:
+        digest = hashlib.sha256(frontmatter_bytes).hexdigest()
+        valid, message = validate_frontmatter(frontmatter_bytes)
+    return {
+        'skill': str(Path(skill_md).parent),
+        'valid': valid,
+        'message': message,
+        'frontmatter_sha256': digest,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def _cached_result(skill_md, entry):
+    """Return the cached result for a SKILL.md if its frontmatter is unchanged."""
+    if not entry:
+        return None
+    stat = os.stat(skill_md)
+    if stat.st_size == entry['size'] and stat.st_mtime_ns == entry['mtime_ns']:
+        return entry
+    if not entry['frontmatter_sha256']:
+        return None
+    frontmatter_bytes, error = read_frontmatter(skill_md)
+    if error or hashlib.sha256(frontmatter_bytes).hexdigest() != entry['frontmatter_sha256']:
+        return None
+    return dict(entry, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+
+
+def validate_skills_tree(skills_root, cache_path=None, workers=None):
+    """
+    Validate every SKILL.md under a directory in a process pool.
+
+    Args:
+        skills_root: Directory to search recursively for SKILL.md files
+        cache_path: Optional JSON cache of previous results
+        workers: Number of worker processes (defaults to the CPU count)
+
+    Returns:
+        Summary dict with pass/fail counts, timing and per-skill results
+    """
+    start = time.perf_counter()
+    skill_mds = sorted(str(p) for p in Path(skills_root).rglob('SKILL.md'))
+
+    cache = {}
+    if cache_path and Path(cache_path).exists():
+        try:
+            data = json.loads(Path(cache_path).read_text())
+            if data.get('version') == CACHE_VERSION:
+                cache = data.get('entries', {})
+        except (OSError, ValueError):
+            cache = {}
+
+    results = {}
+    pending = []
+    for skill_md in skill_mds:
+        cached = _cached_result(skill_md, cache.get(skill_md))
+        if cached:
+            results[skill_md] = dict(cached, cached=True, seconds=0.0)
+        else:
+            pending.append(skill_md)
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunksize = max(1, len(pending) // ((workers or os.cpu_count() or 1) * 4))
+            for skill_md, result in zip(pending, pool.map(_validate_skill_md, pending, chunksize=chunksize)):
+                results[skill_md] = dict(result, cached=False)
+
+    if cache_path:
+        entries = {
+            skill_md: {k: v for k, v in result.items() if k not in ('cached', 'seconds')}
+            for skill_md, result in results.items()
+        }
+        Path(cache_path).write_text(json.dumps({'version': CACHE_VERSION, 'entries': entries}, indent=2))
+
+    ordered = [results[skill_md] for skill_md in skill_mds]
+    return {
+        'total': len(ordered),
+        'passed': sum(1 for r in ordered if r['valid']),
+        'failed': sum(1 for r in ordered if not r['valid']),
+        'cached': sum(1 for r in ordered if r['cached']),
+        'seconds': time.perf_counter() - start,
+        'results': [
+            {k: r[k] for k in ('skill', 'valid', 'message', 'cached', 'seconds')}
+            for r in ordered
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate a skill, or every skill under a directory")
+    parser.add_argument("path", help="Skill directory (or skills tree with --all)")
+    parser.add_argument("--all", action="store_true", help="Validate every SKILL.md under path and print a JSON summary")
+    parser.add_argument("--cache", help="JSON cache file; skills with unchanged frontmatter are skipped (--all only)")
+    parser.add_argument("--workers", type=int, help="Worker processes (--all only, default: CPU count)")
+    parser.add_argument("-o", "--output", help="Write the JSON summary to this file instead of stdout (--all only)")
+    args = parser.parse_args()
+
+    if not args.all:
+        valid, message = validate_skill(args.path)
+        print(message)
+        sys.exit(0 if valid else 1)
+
+    summary = validate_skills_tree(args.path, cache_path=args.cache, workers=args.workers)
+    output = json.dumps(summary, indent=2)
+    if args.output:
+        Path(args.output).write_text(output)
+        print(f"{summary['passed']}/{summary['total']} skills valid "
+              f"({summary['cached']} cached) in {summary['seconds']:.2f}s; summary saved to {args.output}")
+    else:
+        print(output)
+    sys.exit(0 if summary['failed'] == 0 else 1)
+
+
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python quick_validate.py <skill_directory>")
-        sys.exit(1)
-    
-    valid, message = validate_skill(sys.argv[1])
-    print(message)
-    sys.exit(0 if valid else 1)
\ No newline at end of file
+    main()
\ No newline at end of file
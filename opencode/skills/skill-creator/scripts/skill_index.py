@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Skill Index - Precomputed metadata index with keyword search for local skills
+
+Builds a compact JSON index of every SKILL.md frontmatter under a skills
+directory (name, description, path, hash) with a BM25 inverted index, so
+"which skill handles X" can be answered without reading every SKILL.md.
+Rebuilding is incremental: only skills whose SKILL.md changed are re-read.
+`query` exits 1 when nothing matches, with or without --json.
+
+Usage:
+    skill_index.py build <skills-directory> [--index <index.json>]
+    skill_index.py query <skills-directory> <query...> [--index <index.json>] [-n 5] [--json] [--refresh]
+
+Examples:
+    skill_index.py build ~/.config/opencode/skills
+    skill_index.py query ~/.config/opencode/skills fill a pdf form
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+from quick_validate import load_frontmatter, read_frontmatter
+
+
+INDEX_VERSION = 1
+DEFAULT_INDEX_NAME = '.skill_index.json'
+
+# BM25 parameters
+K1 = 1.5
+B = 0.75
+
+# Name terms are repeated so a match on the skill name outranks a passing
+# mention in another skill's description.
+NAME_WEIGHT = 3
+
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'can', 'do', 'for', 'from',
+    'how', 'i', 'if', 'in', 'is', 'it', 'its', 'me', 'my', 'of', 'on', 'or',
+    'that', 'the', 'this', 'to', 'use', 'used', 'user', 'when', 'which', 'with',
+    'what', 'you', 'your', 'skill', 'skills',
+}
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text):
+    """Lowercase text and split it into searchable terms."""
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOPWORDS]
+
+
+def _index_skill(skill_md, frontmatter_bytes):
+    """Build the index entry for one SKILL.md."""
+    frontmatter, error = load_frontmatter(frontmatter_bytes)
+    if error:
+        return None
+    name = str(frontmatter.get('name') or Path(skill_md).parent.name)
+    description = str(frontmatter.get('description') or '')
+    terms = Counter(tokenize(name) * NAME_WEIGHT + tokenize(description))
+    return {
+        'name': name,
+        'description': description,
+        'length': sum(terms.values()),
+        'terms': dict(terms),
+    }
+
+
+def load_index(index_path):
+    """Load an index file, or return an empty index if missing or stale."""
+    try:
+        index = json.loads(Path(index_path).read_text())
+    except (OSError, ValueError):
+        return {'version': INDEX_VERSION, 'skills': {}, 'postings': {}}
+    if index.get('version') != INDEX_VERSION:
+        return {'version': INDEX_VERSION, 'skills': {}, 'postings': {}}
+    return index
+
+
+def _build_postings(skills):
+    postings = {}
+    for path, entry in skills.items():
+        for term, tf in entry['terms'].items():
+            postings.setdefault(term, []).append([path, tf])
+    return postings
+
+
+def build_index(skills_root, index_path=None):
+    """
+    Build or incrementally update the index for a skills directory.
+
+    Args:
+        skills_root: Directory to search recursively for SKILL.md files
+        index_path: Index file (defaults to .skill_index.json in skills_root)
+
+    Returns:
+        (index, counts) where counts has the number of added, updated,
+        unchanged and removed skills
+    """
+    skills_root = Path(skills_root).resolve()
+    index_path = Path(index_path) if index_path else skills_root / DEFAULT_INDEX_NAME
+    index = load_index(index_path)
+    if index.get('root') != str(skills_root):
+        index = {'version': INDEX_VERSION, 'skills': {}, 'postings': {}}
+
+    previous = index['skills']
+    skills = {}
+    counts = {'added': 0, 'updated': 0, 'unchanged': 0, 'removed': 0}
+    # Set when any entry changed, including a refreshed size/mtime, so the
+    # next build can take the stat fast path again.
+    dirty = not index_path.exists()
+
+    for skill_md in sorted(skills_root.rglob('SKILL.md')):
+        path = skill_md.parent.relative_to(skills_root).as_posix()
+        stat = skill_md.stat()
+        old = previous.get(path)
+        if old and old['size'] == stat.st_size and old['mtime_ns'] == stat.st_mtime_ns:
+            skills[path] = old
+            counts['unchanged'] += 1
+            continue
+
+        dirty = True
+        frontmatter_bytes, error = read_frontmatter(skill_md)
+        if error:
+            continue
+        digest = hashlib.sha256(frontmatter_bytes).hexdigest()
+        if old and old['hash'] == digest:
+            entry = old
+            counts['unchanged'] += 1
+        else:
+            entry = _index_skill(skill_md, frontmatter_bytes)
+            if entry is None:
+                continue
+            entry['hash'] = digest
+            counts['updated' if old else 'added'] += 1
+        entry['size'] = stat.st_size
+        entry['mtime_ns'] = stat.st_mtime_ns
+        skills[path] = entry
+
+    counts['removed'] = len(set(previous) - set(skills))
+    dirty = dirty or counts['removed'] > 0
+    index = {
+        'version': INDEX_VERSION,
+        'root': str(skills_root),
+        'skills': skills,
+        'postings': _build_postings(skills),
+    }
+    if dirty:
+        tmp_path = index_path.with_name(index_path.name + f'.{os.getpid()}.tmp')
+        tmp_path.write_text(json.dumps(index, separators=(',', ':')))
+        os.replace(tmp_path, index_path)
+    return index, counts
+
+
+def search(index, query, limit=5):
+    """
+    Rank skills against a free-text query with BM25.
+
+    Returns:
+        List of (score, path, entry) tuples, best match first
+    """
+    skills = index['skills']
+    if not skills:
+        return []
+    average_length = sum(e['length'] for e in skills.values()) / len(skills) or 1
+    scores = Counter()
+    for term in set(tokenize(query)):
+        postings = index['postings'].get(term)
+        if not postings:
+            continue
+        idf = math.log(1 + (len(skills) - len(postings) + 0.5) / (len(postings) + 0.5))
+        for path, tf in postings:
+            length = skills[path]['length']
+            scores[path] += idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * length / average_length))
+    return [(score, path, skills[path]) for path, score in scores.most_common(limit)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and search an index of local skills")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="Build or incrementally update the index")
+    build_parser.add_argument("skills_dir", type=Path, help="Directory containing skills")
+    build_parser.add_argument("--index", type=Path, help=f"Index file (default: <skills_dir>/{DEFAULT_INDEX_NAME})")
+
+    query_parser = subparsers.add_parser("query", help="Find the skills that best match a query")
+    query_parser.add_argument("skills_dir", type=Path, help="Directory containing skills")
+    query_parser.add_argument("query", nargs="+", help="What the skill should handle")
+    query_parser.add_argument("--index", type=Path, help=f"Index file (default: <skills_dir>/{DEFAULT_INDEX_NAME})")
+    query_parser.add_argument("-n", "--limit", type=int, default=5, help="Number of results (default: 5)")
+    query_parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    query_parser.add_argument("--refresh", action="store_true", help="Update the index for changed skills before searching")
+
+    args = parser.parse_args()
+    index_path = args.index or args.skills_dir / DEFAULT_INDEX_NAME
+
+    if args.command == "build":
+        start = time.perf_counter()
+        index, counts = build_index(args.skills_dir, index_path)
+        print(f"✅ Indexed {len(index['skills'])} skills in {(time.perf_counter() - start) * 1000:.1f}ms "
+              f"({counts['added']} added, {counts['updated']} updated, "
+              f"{counts['unchanged']} unchanged, {counts['removed']} removed)")
+        print(f"   Index: {index_path}")
+        return
+
+    start = time.perf_counter()
+    if args.refresh or not index_path.exists():
+        index, _ = build_index(args.skills_dir, index_path)
+    else:
+        index = load_index(index_path)
+    results = search(index, " ".join(args.query), args.limit)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if args.json:
+        print(json.dumps([
+            {
+                'name': entry['name'],
+                'path': str(Path(index['root']) / path),
+                'score': round(score, 3),
+                'description': entry['description'],
+            }
+            for score, path, entry in results
+        ], indent=2))
+        sys.exit(0 if results else 1)
+
+    if not results:
+        print(f"No matching skills ({elapsed_ms:.1f}ms)")
+        sys.exit(1)
+    for score, path, entry in results:
+        print(f"{score:6.2f}  {entry['name']}  ({Path(index['root']) / path})")
+        print(f"        {entry['description'][:160]}")
+    print(f"\n{len(results)} result(s) in {elapsed_ms:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()